@@ -1,3 +1,129 @@
-from django.test import TestCase
+import os
 
-# Create your tests here.
+from core.testing import QueryBudgetMixin, iter_read_routes, load_query_budgets
+from course.models import Answer, Category, Course, Lesson, Module, Question, Quiz
+from course.progress import mark_lesson
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.urls import reverse
+from notification.models import FanOutJob, Notification
+from rest_framework import status
+from rest_framework.test import APITestCase
+from review.models import Review
+
+User = get_user_model()
+
+URLCONFS = ("course.urls", "review.urls", "notification.urls", "user.urls")
+BUDGETS_FILE = os.path.join(os.path.dirname(__file__), "query_budgets.json")
+# Query parameters required by some routes.
+QUERY_PARAMS = {"course-search": {"q": "course"}}
+SIZES = (1, 4)
+
+
+class RouteQueryBudgetTest(QueryBudgetMixin, APITestCase):
+    """
+    Every GET route of the API stays within its budget of `query_budgets.json`,
+    and its number of queries does not grow with the number of rows.
+
+    A new route needs a budget in the file; raise a budget only when the
+    extra queries are constant and deliberate.
+    """
+
+    def setUp(self):
+        self.admin = User.objects.create_user(
+            email="admin@example.com",
+            password="strong_password_12",
+            full_name="Admin",
+            role="admin",
+        )
+        self.student = User.objects.create_user(
+            email="student@example.com",
+            password="strong_password_12",
+            full_name="Student",
+            role="student",
+        )
+        self.category = Category.objects.create(name="Test Category")
+        self.routes = [
+            route for urlconf in URLCONFS for route in iter_read_routes(urlconf)
+        ]
+        self.client.force_authenticate(user=self.admin)
+
+    def scale(self, size):
+        while Course.objects.count() < size:
+            course = Course.objects.create(
+                author=self.admin,
+                title="Test Course",
+                description="A course",
+                category=self.category,
+                level="beginner",
+            )
+            course.students.add(self.admin, self.student)
+            for user in (self.admin, self.student):
+                Review.objects.create(
+                    user=user, course=course, rating=4, title="Review", content="Ok"
+                )
+                Course.objects.apply_rating(course.id, 4)
+            for _ in range(2):
+                module = Module.objects.create(course=course, title="Test Module")
+                for _ in range(2):
+                    lesson = Lesson.objects.create(module=module, title="Test Lesson")
+                    mark_lesson(self.admin, course.id, lesson.progress_slot)
+                    quiz = Quiz.objects.create(lesson=lesson, title="Test Quiz")
+                    question = Question.objects.create(
+                        quiz=quiz, question_text="Test Question"
+                    )
+                    for correct in (True, False):
+                        Answer.objects.create(
+                            question=question, option_text="Answer", is_correct=correct
+                        )
+            Notification.objects.create(user=self.admin, message="New lesson")
+            FanOutJob.objects.create(
+                course=course, created_by=self.admin, message="New lesson"
+            )
+        # Cached responses would hide the queries.
+        cache.clear()
+
+    def request(self, route):
+        kwargs = {}
+        if route.detail:
+            kwargs["pk"] = route.model._default_manager.order_by("pk")[0].pk
+        url = reverse(route.name, kwargs=kwargs)
+
+        def get():
+            response = self.client.get(url, QUERY_PARAMS.get(route.name))
+            self.assertEqual(response.status_code, status.HTTP_200_OK, route.name)
+            if response.streaming:
+                b"".join(response.streaming_content)
+
+        return get
+
+    def test_every_route_has_a_budget(self):
+        budgets = load_query_budgets(BUDGETS_FILE)
+        names = {route.name for route in self.routes}
+
+        self.assertEqual(sorted(names - set(budgets)), [], "Routes without a budget")
+        self.assertEqual(sorted(set(budgets) - names), [], "Budgets without a route")
+
+    def test_routes_stay_within_their_budget(self):
+        budgets = load_query_budgets(BUDGETS_FILE)
+        counts = {route.name: [] for route in self.routes}
+        for size in SIZES:
+            self.scale(size)
+            for route in self.routes:
+                count, _ = self.count_queries(self.request(route))
+                counts[route.name].append(count)
+
+        for route in self.routes:
+            with self.subTest(route=route.name):
+                route_counts = counts[route.name]
+                self.assertLessEqual(
+                    max(route_counts),
+                    budgets.get(route.name, 0),
+                    f"Query budget exceeded for sizes {SIZES}: {route_counts}",
+                )
+                self.assertEqual(
+                    len(set(route_counts)),
+                    1,
+                    f"Number of queries grows with the dataset for sizes {SIZES}: "
+                    f"{route_counts}",
+                )
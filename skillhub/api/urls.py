@@ -1,8 +1,37 @@
+from api.views import CacheStatsView, DatabasePoolView, RequestMetricsView
+from course.async_views import AsyncCategoryView, AsyncCourseView
 from django.urls import include, path
+from review.async_views import AsyncReviewView
+
+# Async read-only catalogue endpoints, served by the ASGI workers.
+catalogue_patterns = [
+    path("courses/", AsyncCourseView.as_view(), name="catalogue-course-list"),
+    path(
+        "courses/<int:pk>/",
+        AsyncCourseView.as_view(),
+        name="catalogue-course-detail",
+    ),
+    path("categories/", AsyncCategoryView.as_view(), name="catalogue-category-list"),
+    path(
+        "categories/<int:pk>/",
+        AsyncCategoryView.as_view(),
+        name="catalogue-category-detail",
+    ),
+    path("reviews/", AsyncReviewView.as_view(), name="catalogue-review-list"),
+    path(
+        "reviews/<int:pk>/",
+        AsyncReviewView.as_view(),
+        name="catalogue-review-detail",
+    ),
+]
 
 urlpatterns = [
     path("users/", include("user.urls")),
     path("courses/", include("course.urls")),
     path("reviews/", include("review.urls")),
     path("notification/", include("notification.urls")),
+    path("cache-stats/", CacheStatsView.as_view(), name="cache_stats"),
+    path("metrics/", RequestMetricsView.as_view(), name="request_metrics"),
+    path("db-pool/", DatabasePoolView.as_view(), name="db_pool"),
+    path("catalogue/", include(catalogue_patterns)),
 ]
@@ -1,3 +1,72 @@
-from django.shortcuts import render
+from core.cache import get_stats
+from core.db_pool import get_pool_stats, publisher
+from core.metrics import buffer, get_metrics, reset_metrics
+from core.permissions import IsAdmin
+from django.conf import settings
+from drf_spectacular.utils import extend_schema
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import APIView
 
-# Create your views here.
+
+@extend_schema(tags=["Cache"])
+class CacheStatsView(APIView):
+    """
+    Endpoint for the response cache counters.
+
+    - GET /cache-stats/: Retrieve the number of hits, misses and invalidations.
+    """
+
+    permission_classes = [IsAdmin]
+
+    def get(self, request):
+        return Response(get_stats())
+
+
+@extend_schema(tags=["Metrics"])
+class RequestMetricsView(APIView):
+    """
+    Endpoint for the per-endpoint request metrics.
+
+    - GET /metrics/: Retrieve, for every endpoint, the number of sampled
+      requests and the mean and percentiles of their total time, database
+      time, query count, serializer time and response size.
+    - DELETE /metrics/: Reset the metrics.
+
+    Requests are sampled at `REQUEST_METRICS_SAMPLE_RATE`, and every process
+    flushes its samples every `REQUEST_METRICS_FLUSH_INTERVAL` seconds.
+    """
+
+    permission_classes = [IsAdmin]
+
+    def get(self, request):
+        buffer.flush()
+        return Response(
+            {
+                "sample_rate": settings.REQUEST_METRICS_SAMPLE_RATE,
+                "endpoints": get_metrics(),
+            }
+        )
+
+    def delete(self, request):
+        reset_metrics()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+@extend_schema(tags=["Metrics"])
+class DatabasePoolView(APIView):
+    """
+    Endpoint for the database connection pool statistics.
+
+    - GET /db-pool/: Retrieve, for every web and Celery process, the size,
+      usage, waiting requests and connection counters of its pools.
+
+    Every process publishes its statistics every `DB_POOL_STATS_INTERVAL`
+    seconds, after a request or a task.
+    """
+
+    permission_classes = [IsAdmin]
+
+    def get(self, request):
+        publisher.publish()
+        return Response({"pooled": settings.DB_POOL, "processes": get_pool_stats()})
@@ -0,0 +1,380 @@
+"""
+Latency and query counts of the main API scenarios, as diffable JSON.
+
+The benchmark creates a throwaway test database, fills it with a generated
+catalogue (see `benchmarks.datagen`) and runs every scenario against the
+WSGI application in-process: the requests go through the whole middleware
+stack, only the network is left out. Celery tasks run eagerly, so the
+lesson publish scenario includes the notification fan-out.
+
+For every scenario it reports the number of requests and errors, and the
+p50/p95/p99 and mean of the latency (ms) and of the number of SQL queries.
+Pass a previous result to `--compare` to print the changes.
+
+Usage (from the directory containing `manage.py`):
+
+    python -m benchmarks.api [--courses 50 --modules 5 --lessons 8]
+        [--students 500 --requests 100] [--output result.json]
+        [--compare baseline.json]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import time
+from contextlib import ExitStack
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "skillhub.settings")
+
+
+class WSGIClient:
+    """
+    Send requests to a WSGI application and measure them.
+
+    The query counter is installed on every database connection and the
+    response body is consumed before the clock stops.
+    """
+
+    def __init__(self, application):
+        from django.test import RequestFactory
+
+        self.application = application
+        self.factory = RequestFactory()
+
+    def request(self, method, path, data=None, token=None):
+        from django.db import connections
+
+        extra = {"HTTP_AUTHORIZATION": f"Bearer {token}"} if token else {}
+        body = json.dumps(data) if data is not None else ""
+        environ = self.factory.generic(
+            method, path, body, content_type="application/json", **extra
+        ).environ
+        status = []
+        queries = [0]
+
+        def count(execute, sql, params, many, context):
+            queries[0] += 1
+            return execute(sql, params, many, context)
+
+        def start_response(status_line, headers, exc_info=None):
+            status.append(int(status_line.split()[0]))
+
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(connections[alias].execute_wrapper(count))
+            started = time.perf_counter()
+            response = self.application(environ, start_response)
+            try:
+                for _ in response:
+                    pass
+            finally:
+                response.close()
+            elapsed = time.perf_counter() - started
+        return status[0], elapsed * 1000, queries[0]
+
+
+class Scenario:
+    """
+    A scripted sequence of requests, replayed `requests` times.
+
+    Subclasses implement `setup`, run once before the measures, and `step`,
+    which sends the `index`-th request through `self.client.request` and
+    returns its result.
+    """
+
+    name = None
+
+    def __init__(self, client, catalogue):
+        self.client = client
+        self.catalogue = catalogue
+
+    def setup(self):
+        pass
+
+    def step(self, index):
+        raise NotImplementedError
+
+
+def get_token(user_id):
+    from django.contrib.auth import get_user_model
+    from rest_framework_simplejwt.tokens import RefreshToken
+
+    user = get_user_model().objects.get(pk=user_id)
+    return str(RefreshToken.for_user(user).access_token)
+
+
+class CatalogueBrowsing(Scenario):
+    """
+    Anonymous visitors walking the catalogue: lists, filters, details, search.
+    """
+
+    name = "catalogue browsing"
+
+    def step(self, index):
+        from django.urls import reverse
+
+        catalogue = self.catalogue
+        course_id = catalogue.courses[index % len(catalogue.courses)]
+        category_id = catalogue.categories[index % len(catalogue.categories)]
+        paths = [
+            reverse("course-list"),
+            f"{reverse('course-list')}?category={category_id}",
+            f"{reverse('course-list')}?ordering=-rating_avg",
+            reverse("course-detail", args=[course_id]),
+            f"{reverse('course-search')}?q=python",
+        ]
+        return self.client.request("GET", paths[index % len(paths)])
+
+
+class ProfileLoad(Scenario):
+    """
+    Students opening their profile, with their courses and progress.
+    """
+
+    name = "profile load"
+
+    def setup(self):
+        students = self.catalogue.students[:20]
+        self.tokens = [get_token(student) for student in students]
+
+    def step(self, index):
+        from django.urls import reverse
+
+        token = self.tokens[index % len(self.tokens)]
+        return self.client.request("GET", reverse("profile"), token=token)
+
+
+class LessonPublish(Scenario):
+    """
+    Authors adding a lesson, which notifies every student of the course.
+    """
+
+    name = "lesson publish"
+
+    def setup(self):
+        from course.models import Module
+
+        self.modules = list(
+            Module.objects.filter(course__in=self.catalogue.courses)
+            .order_by("course_id", "order")
+            .distinct("course_id")
+            .values_list("id", "course__author_id")
+        )
+        self.tokens = {author: get_token(author) for author in self.catalogue.authors}
+
+    def step(self, index):
+        from django.urls import reverse
+
+        module_id, author_id = self.modules[index % len(self.modules)]
+        return self.client.request(
+            "POST",
+            reverse("lesson-list"),
+            {"module": module_id, "title": f"Lesson {index}", "content": "New"},
+            token=self.tokens[author_id],
+        )
+
+
+class LoginBurst(Scenario):
+    """
+    Students logging in one after the other, password hashing included.
+    """
+
+    name = "login burst"
+
+    def setup(self):
+        from django.contrib.auth import get_user_model
+
+        self.emails = list(
+            get_user_model()
+            .objects.filter(pk__in=self.catalogue.students)
+            .order_by("pk")
+            .values_list("email", flat=True)
+        )
+
+    def step(self, index):
+        from benchmarks.datagen import PASSWORD
+        from django.urls import reverse
+
+        email = self.emails[index % len(self.emails)]
+        return self.client.request(
+            "POST", reverse("login"), {"email": email, "password": PASSWORD}
+        )
+
+
+class ReviewWrites(Scenario):
+    """
+    Students reviewing courses, which updates the course rating summaries.
+    """
+
+    name = "review writes"
+
+    def setup(self):
+        students = self.catalogue.students[:20]
+        self.tokens = [get_token(student) for student in students]
+
+    def step(self, index):
+        from django.urls import reverse
+
+        courses = self.catalogue.courses
+        return self.client.request(
+            "POST",
+            reverse("review-list"),
+            {
+                "course_id": courses[index % len(courses)],
+                "rating": index % 5 + 1,
+                "title": "Benchmark",
+                "content": "A review written by the benchmark.",
+            },
+            token=self.tokens[index % len(self.tokens)],
+        )
+
+
+SCENARIOS = [CatalogueBrowsing, ProfileLoad, LessonPublish, LoginBurst, ReviewWrites]
+
+
+def summarize(values):
+    """
+    Return the p50/p95/p99 and mean of the measures of a scenario.
+    """
+
+    if len(values) < 2:
+        values = values * 2
+    percentiles = statistics.quantiles(values, n=100, method="inclusive")
+    return {
+        "p50": round(percentiles[49], 2),
+        "p95": round(percentiles[94], 2),
+        "p99": round(percentiles[98], 2),
+        "mean": round(statistics.fmean(values), 2),
+    }
+
+
+def run_scenario(scenario, requests, warmup):
+    """
+    Run a scenario and return its summary.
+    """
+
+    scenario.setup()
+    for index in range(warmup):
+        scenario.step(index)
+
+    latencies, queries, errors = [], [], 0
+    for index in range(warmup, warmup + requests):
+        status, latency, count = scenario.step(index)
+        errors += status >= 400
+        latencies.append(latency)
+        queries.append(count)
+    return {
+        "requests": requests,
+        "errors": errors,
+        "latency_ms": summarize(latencies),
+        "queries": summarize(queries),
+    }
+
+
+def compare(baseline, result):
+    """
+    Print the change of every measure from a previous result.
+    """
+
+    print(
+        f"{'scenario':<20} {'measure':<16} {'before':>10} {'after':>10} {'change':>8}"
+    )
+    for name, scenario in result["scenarios"].items():
+        before = baseline["scenarios"].get(name)
+        if before is None:
+            continue
+        for measure in ("latency_ms", "queries"):
+            for stat in ("p50", "p95", "p99"):
+                old, new = before[measure][stat], scenario[measure][stat]
+                change = f"{(new - old) / old:+.0%}" if old else ""
+                print(
+                    f"{name:<20} {measure + ' ' + stat:<16} {old:>10} {new:>10} "
+                    f"{change:>8}"
+                )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--courses", type=int, default=50)
+    parser.add_argument("--modules", type=int, default=5)
+    parser.add_argument("--lessons", type=int, default=8)
+    parser.add_argument("--students", type=int, default=500)
+    parser.add_argument("--enrollments", type=int, default=20)
+    parser.add_argument("--reviews", type=int, default=5)
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--scenario",
+        action="append",
+        choices=[scenario.name for scenario in SCENARIOS],
+        help="Only run this scenario (can be repeated).",
+    )
+    parser.add_argument("--output", help="Write the JSON result to this file.")
+    parser.add_argument("--compare", help="A previous JSON result to compare with.")
+    args = parser.parse_args(argv)
+
+    django.setup()
+
+    from benchmarks.datagen import generate_catalogue
+    from django.core.wsgi import get_wsgi_application
+    from django.test.utils import (
+        setup_databases,
+        setup_test_environment,
+        teardown_databases,
+        teardown_test_environment,
+    )
+
+    from skillhub.celery import app
+
+    # Allows the test server host and keeps the emails in memory.
+    setup_test_environment()
+    app.conf.task_always_eager = True
+    databases = setup_databases(verbosity=0, interactive=False, aliases={"default"})
+    try:
+        catalogue = generate_catalogue(
+            courses=args.courses,
+            modules=args.modules,
+            lessons=args.lessons,
+            students=args.students,
+            enrollments=args.enrollments,
+            reviews=args.reviews,
+            seed=args.seed,
+        )
+        client = WSGIClient(get_wsgi_application())
+        result = {
+            "parameters": {
+                name: value
+                for name, value in vars(args).items()
+                if name not in ("scenario", "output", "compare")
+            },
+            "scenarios": {},
+        }
+        for scenario_class in SCENARIOS:
+            if args.scenario and scenario_class.name not in args.scenario:
+                continue
+            scenario = scenario_class(client, catalogue)
+            result["scenarios"][scenario.name] = run_scenario(
+                scenario, args.requests, args.warmup
+            )
+    finally:
+        teardown_databases(databases, verbosity=0)
+        teardown_test_environment()
+
+    output = json.dumps(result, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(output + "\n")
+    else:
+        print(output)
+
+    if args.compare:
+        with open(args.compare) as file:
+            compare(json.load(file), result)
+
+
+if __name__ == "__main__":
+    main()
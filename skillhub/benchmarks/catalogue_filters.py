@@ -0,0 +1,192 @@
+"""
+Query plans of the course list filters and orderings as the catalogue grows.
+
+The benchmark runs against a throwaway test database. For every table size
+it fills the course table up to that size, analyzes it, and runs the first
+page of every filter combined with every ordering the course list accepts,
+with `EXPLAIN ANALYZE`. It prints the scan the planner picked and the
+execution time, and exits with status 1 if any combination falls back to a
+sequential scan.
+
+Usage (from the directory containing `manage.py`):
+
+    python -m benchmarks.catalogue_filters [--sizes 10000 100000 500000]
+"""
+
+import argparse
+import json
+import os
+import sys
+from datetime import timedelta
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "skillhub.settings")
+
+AUTHORS = 200
+CATEGORIES = 20
+PAGE_SIZE = 20
+
+# Fills the course table from `%(start)s` to `%(stop)s` with spread values:
+# creation dates over two years, ratings from 0 to 5 and up to 5000 students.
+FILL_COURSES = """
+INSERT INTO {table} (
+    author_id, title, description, category_id, level, created_at,
+    updated_at, rating_count, rating_sum, rating_avg, rating_1, rating_2,
+    rating_3, rating_4, rating_5, student_count
+)
+SELECT
+    (%(authors)s::bigint[])[1 + mod(i, %(author_count)s)],
+    'Course ' || i,
+    '',
+    (%(categories)s::bigint[])[1 + mod(i * 7, %(category_count)s)],
+    (ARRAY['beginner', 'intermediate', 'advanced'])[1 + mod(i, 3)],
+    now() - random() * interval '730 days',
+    now(),
+    0, 0, round((random() * 5)::numeric, 2), 0, 0, 0, 0, 0,
+    floor(random() * random() * 5000)
+FROM generate_series(%(start)s, %(stop)s) AS i
+"""
+
+
+# The orderings of the course list, by name.
+ORDERINGS = {
+    "latest": ["-created_at", "-id"],
+    "best rated": ["-rating_avg", "-id"],
+    "most popular": ["-student_count", "-id"],
+}
+
+
+def get_scenarios(category_id, author_id, now):
+    """
+    Return the combinations to explain, as (name, filters, ordering) tuples.
+
+    Every filter is combined with every ordering, except the combinations the
+    course list rejects (see `course.filters.get_unsupported_filters`).
+    """
+
+    from course.filters import get_unsupported_filters
+
+    filters = {
+        "all": {},
+        "category": {"category": category_id},
+        "level": {"level": "advanced"},
+        "author": {"author": author_id},
+        "min rating": {"min_rating": 4.9},
+        "created after": {"created_after": now - timedelta(days=7)},
+        "created range": {
+            "created_after": now - timedelta(days=400),
+            "created_before": now - timedelta(days=390),
+        },
+    }
+    return [
+        (f"{filter_name}, {ordering_name}", params, ordering)
+        for filter_name, params in filters.items()
+        for ordering_name, ordering in ORDERINGS.items()
+        if not get_unsupported_filters(params, ordering)
+    ]
+
+
+def get_scans(plan):
+    """
+    Return the (node type, index name) of every scan of an EXPLAIN plan.
+    """
+
+    scans = []
+    if "Scan" in plan["Node Type"]:
+        scans.append((plan["Node Type"], plan.get("Index Name", "")))
+    for child in plan.get("Plans", ()):
+        scans.extend(get_scans(child))
+    return scans
+
+
+def fill(start, stop, authors, categories):
+    from course.models import Course
+    from django.db import connection
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            FILL_COURSES.format(table=Course._meta.db_table),
+            {
+                "authors": authors,
+                "author_count": len(authors),
+                "categories": categories,
+                "category_count": len(categories),
+                "start": start,
+                "stop": stop,
+            },
+        )
+        cursor.execute(f"ANALYZE {Course._meta.db_table}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[10_000, 100_000, 500_000]
+    )
+    args = parser.parse_args(argv)
+
+    django.setup()
+
+    from course.filters import filter_courses
+    from course.models import Category, Course
+    from django.contrib.auth import get_user_model
+    from django.contrib.auth.hashers import make_password
+    from django.test.utils import setup_databases, teardown_databases
+    from django.utils import timezone
+
+    databases = setup_databases(verbosity=0, interactive=False, aliases={"default"})
+    failed = False
+    try:
+        User = get_user_model()
+        password = make_password(None)
+        authors = [
+            user.id
+            for user in User.objects.bulk_create(
+                User(
+                    email=f"author{i}@example.com",
+                    full_name=f"Author {i}",
+                    role="instructor",
+                    password=password,
+                )
+                for i in range(AUTHORS)
+            )
+        ]
+        categories = [
+            category.id
+            for category in Category.objects.bulk_create(
+                Category(name=f"Category {i}") for i in range(CATEGORIES)
+            )
+        ]
+        scenarios = get_scenarios(categories[0], authors[0], timezone.now())
+
+        print(f"{'courses':>8} {'scenario':<32} {'scan':<40} {'time':>9}")
+        count = 0
+        for size in sorted(args.sizes):
+            if size > count:
+                fill(count + 1, size, authors, categories)
+                count = size
+            for name, filters, ordering in scenarios:
+                queryset = filter_courses(Course.objects.all(), filters).order_by(
+                    *ordering
+                )
+                explained = json.loads(
+                    queryset[:PAGE_SIZE].explain(format="json", analyze=True)
+                )[0]
+                scans = get_scans(explained["Plan"])
+                seq_scan = any(node == "Seq Scan" for node, _ in scans)
+                failed |= seq_scan
+                scan = ", ".join(f"{node} {index}".strip() for node, index in scans)
+                print(
+                    f"{size:>8} {name:<32} {scan:<40} "
+                    f"{explained['Execution Time']:>7.2f}ms"
+                    + ("  <- sequential scan" if seq_scan else "")
+                )
+    finally:
+        teardown_databases(databases, verbosity=0)
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
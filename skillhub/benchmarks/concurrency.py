@@ -0,0 +1,212 @@
+"""
+Throughput and latency of the sync and async catalogue endpoints under load.
+
+Unlike `benchmarks.api`, this benchmark sends real HTTP requests to running
+servers, so that it measures how many concurrent requests the workers
+serve. Start both servers on the same database, with the same number of
+workers, e.g.:
+
+    gunicorn skillhub.wsgi:application --bind 0.0.0.0:8000 --workers 4
+    uvicorn skillhub.asgi:application --port 8001 --workers 4
+
+For every concurrency level and endpoint it keeps that many requests in
+flight for `--duration` seconds against each server, and reports the
+requests per second, the errors and the p50/p95/p99 latency (ms).
+Anonymous responses are cached by both servers: pass `--token` (an access
+token) to measure the database path instead.
+
+The load is generated by threads with keep-alive connections; at high
+concurrency run it from another machine, so that it does not compete with
+the servers for the CPU.
+
+Usage (from the directory containing `manage.py`):
+
+    python -m benchmarks.concurrency [--sync-url http://localhost:8000]
+        [--async-url http://localhost:8001] [--concurrency 1 10 50 100]
+        [--duration 10] [--token TOKEN] [--output result.json]
+"""
+
+import argparse
+import http.client
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from benchmarks.api import summarize
+
+# The path of every endpoint on the sync and on the async server.
+ENDPOINTS = {
+    "course list": ("/api/v1/courses/", "/api/v1/catalogue/courses/"),
+    "course detail": (
+        "/api/v1/courses/{course}/",
+        "/api/v1/catalogue/courses/{course}/",
+    ),
+    "category list": ("/api/v1/courses/categories/", "/api/v1/catalogue/categories/"),
+}
+TIMEOUT = 30
+
+
+class Target:
+    """
+    A server under test: its base URL and the headers of every request.
+    """
+
+    def __init__(self, name, url, token=None):
+        parts = urlsplit(url)
+        self.name = name
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.headers = {"Accept": "application/json"}
+        if token:
+            self.headers["Authorization"] = f"Bearer {token}"
+
+    def connect(self):
+        return http.client.HTTPConnection(self.host, self.port, timeout=TIMEOUT)
+
+    def get(self, connection, path):
+        """
+        Send a GET on a keep-alive connection and return its status.
+        """
+
+        connection.request("GET", path, headers=self.headers)
+        response = connection.getresponse()
+        response.read()
+        return response.status
+
+
+def _worker(target, path, deadline):
+    latencies, errors = [], 0
+    connection = target.connect()
+    try:
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            try:
+                status = target.get(connection, path)
+            except (OSError, http.client.HTTPException):
+                connection.close()
+                connection = target.connect()
+                status = None
+            latencies.append((time.perf_counter() - started) * 1000)
+            errors += status is None or status >= 400
+    finally:
+        connection.close()
+    return latencies, errors
+
+
+def run_load(target, path, concurrency, duration):
+    """
+    Keep `concurrency` requests in flight for `duration` seconds.
+
+    Returns:
+        dict: The number of requests and errors, the requests per second
+        and the latency summary.
+    """
+
+    barrier = threading.Barrier(concurrency + 1)
+
+    def work():
+        barrier.wait()
+        return _worker(target, path, deadline)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = [executor.submit(work) for _ in range(concurrency)]
+        deadline = time.perf_counter() + duration
+        barrier.wait()
+        results = [future.result() for future in futures]
+
+    latencies = [latency for result in results for latency in result[0]]
+    return {
+        "requests": len(latencies),
+        "errors": sum(result[1] for result in results),
+        "requests_per_second": round(len(latencies) / duration, 1),
+        "latency_ms": summarize(latencies or [0]),
+    }
+
+
+def find_course(target):
+    """
+    Return the ID of a course of the catalogue, for the detail endpoint.
+    """
+
+    connection = target.connect()
+    try:
+        connection.request("GET", ENDPOINTS["course list"][0], headers=target.headers)
+        results = json.loads(connection.getresponse().read())["results"]
+    finally:
+        connection.close()
+    if not results:
+        raise SystemExit("The catalogue is empty: generate a catalogue first.")
+    return results[0]["id"]
+
+
+def print_table(result):
+    print(
+        f"{'endpoint':<16} {'concurrency':>11} {'server':<6} {'req/s':>9} "
+        f"{'p50':>8} {'p95':>8} {'p99':>8} {'errors':>7}"
+    )
+    for endpoint, levels in result["endpoints"].items():
+        for concurrency, servers in levels.items():
+            for server, measure in servers.items():
+                latency = measure["latency_ms"]
+                print(
+                    f"{endpoint:<16} {concurrency:>11} {server:<6} "
+                    f"{measure['requests_per_second']:>9} {latency['p50']:>8} "
+                    f"{latency['p95']:>8} {latency['p99']:>8} {measure['errors']:>7}"
+                )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sync-url", default="http://localhost:8000")
+    parser.add_argument("--async-url", default="http://localhost:8001")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 10, 50, 100])
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--warmup", type=float, default=2)
+    parser.add_argument(
+        "--endpoint",
+        action="append",
+        choices=list(ENDPOINTS),
+        help="Only load this endpoint (can be repeated).",
+    )
+    parser.add_argument("--token", help="Access token sent with every request.")
+    parser.add_argument("--output", help="Write the JSON result to this file.")
+    args = parser.parse_args(argv)
+
+    targets = [
+        Target("sync", args.sync_url, args.token),
+        Target("async", args.async_url, args.token),
+    ]
+    course = find_course(targets[0])
+
+    result = {
+        "parameters": {
+            name: value
+            for name, value in vars(args).items()
+            if name not in ("token", "output")
+        },
+        "endpoints": {},
+    }
+    for endpoint, paths in ENDPOINTS.items():
+        if args.endpoint and endpoint not in args.endpoint:
+            continue
+        levels = result["endpoints"][endpoint] = {}
+        for concurrency in args.concurrency:
+            levels[concurrency] = {}
+            for target, path in zip(targets, paths):
+                path = path.format(course=course)
+                if args.warmup:
+                    run_load(target, path, concurrency, args.warmup)
+                levels[concurrency][target.name] = run_load(
+                    target, path, concurrency, args.duration
+                )
+
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(json.dumps(result, indent=2) + "\n")
+    print_table(result)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""
+Cost of opening database connections per request, by connection mode.
+
+The benchmark creates a throwaway test database with a generated catalogue
+(see `benchmarks.datagen`) and replays the profile load scenario of
+`benchmarks.api` in-process, once per mode:
+
+- no reuse: `CONN_MAX_AGE = 0`, every request opens a new connection.
+- persistent: `CONN_MAX_AGE = 60`, a connection is reused across requests.
+- pool: a psycopg pool, the settings used in production (`DB_POOL`).
+
+For every mode it reports the request latency (ms), the number of new
+PostgreSQL connections and the time spent getting a connection per request.
+
+Usage (from the directory containing `manage.py`):
+
+    python -m benchmarks.connections [--students 100 --requests 200]
+        [--output result.json]
+"""
+
+import argparse
+import json
+import os
+import time
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "skillhub.settings")
+
+MODES = {
+    "no reuse": {"CONN_MAX_AGE": 0, "pool": False},
+    "persistent": {"CONN_MAX_AGE": 60, "pool": False},
+    "pool": {"CONN_MAX_AGE": 0, "pool": {"min_size": 1, "max_size": 2}},
+}
+
+
+def configure(connection, mode):
+    """
+    Switch a connection to a mode, closing its connection and pool.
+    """
+
+    connection.close()
+    connection.close_pool()
+    connection.settings_dict["CONN_MAX_AGE"] = mode["CONN_MAX_AGE"]
+    connection.settings_dict["OPTIONS"]["pool"] = mode["pool"]
+
+
+class ConnectTimer:
+    """
+    Count and time the calls to `connect` of a database connection.
+
+    With a pool, `connect` takes a connection from the pool and only opens
+    a new one when the pool has none available.
+    """
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.calls = 0
+        self.seconds = 0.0
+
+    def __enter__(self):
+        connect = self.connection.connect
+
+        def timed_connect():
+            started = time.perf_counter()
+            try:
+                connect()
+            finally:
+                self.calls += 1
+                self.seconds += time.perf_counter() - started
+
+        self.connection.connect = timed_connect
+        return self
+
+    def __exit__(self, *exc_info):
+        del self.connection.connect
+
+    def new_connections(self):
+        pool = self.connection.pool
+        return pool.get_stats().get("connections_num", 0) if pool else self.calls
+
+
+def run_mode(connection, scenario, mode, requests, warmup):
+    """
+    Replay the scenario in a mode and return its summary.
+    """
+
+    from benchmarks.api import summarize
+
+    configure(connection, mode)
+    for index in range(warmup):
+        scenario.step(index)
+
+    latencies, errors = [], 0
+    with ConnectTimer(connection) as timer:
+        if connection.pool:
+            # Count the connections opened during the measures only.
+            connection.pool.pop_stats()
+        for index in range(warmup, warmup + requests):
+            status, latency, _ = scenario.step(index)
+            errors += status >= 400
+            latencies.append(latency)
+        new_connections = timer.new_connections()
+    return {
+        "requests": requests,
+        "errors": errors,
+        "latency_ms": summarize(latencies),
+        "new_connections": new_connections,
+        "connect_ms_per_request": round(timer.seconds * 1000 / requests, 3),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--courses", type=int, default=20)
+    parser.add_argument("--students", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--output", help="Write the JSON result to this file.")
+    args = parser.parse_args(argv)
+
+    django.setup()
+
+    from benchmarks.api import ProfileLoad, WSGIClient
+    from benchmarks.datagen import generate_catalogue
+    from django.core.wsgi import get_wsgi_application
+    from django.db import connection
+    from django.test.utils import (
+        setup_databases,
+        setup_test_environment,
+        teardown_databases,
+        teardown_test_environment,
+    )
+
+    # Allows the test server host and keeps the emails in memory.
+    setup_test_environment()
+    databases = setup_databases(verbosity=0, interactive=False, aliases={"default"})
+    try:
+        catalogue = generate_catalogue(
+            courses=args.courses, students=args.students, enrollments=5
+        )
+        scenario = ProfileLoad(WSGIClient(get_wsgi_application()), catalogue)
+        scenario.setup()
+        result = {"parameters": vars(args), "modes": {}}
+        for name, mode in MODES.items():
+            result["modes"][name] = run_mode(
+                connection, scenario, mode, args.requests, args.warmup
+            )
+    finally:
+        # The test database cannot be dropped while a pool holds connections.
+        configure(connection, MODES["no reuse"])
+        teardown_databases(databases, verbosity=0)
+        teardown_test_environment()
+
+    output = json.dumps(result, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""
+Deterministic catalogue generator for the benchmarks.
+
+Every object is written with `bulk_create` (the courses through
+`CourseTreeImporter`, which bulk-creates whole trees), and the same seed
+always produces the same catalogue, so two runs of a benchmark read the
+same data.
+"""
+
+import random
+
+from course.importer import CourseTreeImporter
+from course.models import Category, Course
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from review.models import Review
+
+# Password of every generated user, for the scenarios that log in.
+PASSWORD = "benchmark_password_12"
+WORDS = (
+    "python sql data web design cooking bread music guitar drawing history "
+    "physics algebra statistics marketing writing photography yoga finance "
+    "chemistry biology spanish french networks security cloud testing"
+).split()
+
+
+class Catalogue:
+    """
+    The IDs of a generated catalogue, used by the scenarios.
+    """
+
+    def __init__(self, admin, authors, students, categories, courses):
+        self.admin = admin
+        self.authors = authors
+        self.students = students
+        self.categories = categories
+        self.courses = courses
+
+
+def _sentence(rng, words):
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize()
+
+
+def _create_users(prefix, count, role, password):
+    User = get_user_model()
+    return User.objects.bulk_create(
+        User(
+            email=f"{prefix}{i}@example.com",
+            full_name=f"{prefix.capitalize()} {i}",
+            role=role,
+            password=password,
+        )
+        for i in range(count)
+    )
+
+
+def _course_tree(rng, category_id, modules, lessons):
+    return {
+        "title": _sentence(rng, 3),
+        "description": _sentence(rng, 30),
+        "category": category_id,
+        "level": rng.choice(Course.LEVEL_CHOICES)[0],
+        "modules": [
+            {
+                "title": _sentence(rng, 2),
+                "lessons": [
+                    {"title": _sentence(rng, 3), "content": _sentence(rng, 200)}
+                    for _ in range(lessons)
+                ],
+            }
+            for _ in range(modules)
+        ],
+    }
+
+
+@transaction.atomic
+def generate_catalogue(
+    courses=50,
+    modules=5,
+    lessons=8,
+    authors=10,
+    students=500,
+    enrollments=20,
+    reviews=5,
+    categories=10,
+    seed=0,
+):
+    """
+    Create a catalogue of courses with their students and reviews.
+
+    Args:
+        courses (int, optional): The number of courses.
+        modules (int, optional): The number of modules per course.
+        lessons (int, optional): The number of lessons per module.
+        authors (int, optional): The number of instructors, owning the
+            courses in turn.
+        students (int, optional): The number of students.
+        enrollments (int, optional): The number of courses each student is
+            enrolled in.
+        reviews (int, optional): The number of reviews per course.
+        categories (int, optional): The number of categories.
+        seed (int, optional): The seed of the random values.
+
+    Returns:
+        Catalogue: The IDs of the created users, categories and courses.
+    """
+
+    rng = random.Random(seed)
+    # Hashing is deliberately slow: hash the shared password once.
+    password = make_password(PASSWORD)
+
+    admin = _create_users("admin", 1, "admin", password)[0]
+    author_users = _create_users("author", authors, "instructor", password)
+    student_users = _create_users("student", students, "student", password)
+    category_ids = [
+        category.id
+        for category in Category.objects.bulk_create(
+            Category(name=f"Category {i}") for i in range(categories)
+        )
+    ]
+
+    course_ids = []
+    for index, author in enumerate(author_users):
+        trees = [
+            _course_tree(rng, rng.choice(category_ids), modules, lessons)
+            for _ in range(index, courses, authors)
+        ]
+        if trees:
+            result = CourseTreeImporter(author).run(trees)
+            course_ids.extend(result.course_ids)
+
+    Enrollment = Course.students.through
+    Enrollment.objects.bulk_create(
+        (
+            Enrollment(course_id=course_id, user_id=student.id)
+            for student in student_users
+            for course_id in rng.sample(course_ids, min(enrollments, len(course_ids)))
+        ),
+        batch_size=5000,
+    )
+    Course.objects.refresh_student_counts(course_ids)
+
+    Review.objects.bulk_create(
+        (
+            Review(
+                course_id=course_id,
+                user=rng.choice(student_users),
+                rating=rng.randint(1, 5),
+                title=_sentence(rng, 3),
+                content=_sentence(rng, 40),
+            )
+            for course_id in course_ids
+            for _ in range(reviews)
+        ),
+        batch_size=5000,
+    )
+    Course.objects.rebuild_ratings(course_ids)
+
+    return Catalogue(
+        admin=admin.id,
+        authors=[user.id for user in author_users],
+        students=[user.id for user in student_users],
+        categories=category_ids,
+        courses=course_ids,
+    )
@@ -0,0 +1,83 @@
+"""
+Startup time of the Django and Celery processes, with and without Mongo.
+
+Every scenario runs in a fresh interpreter, so the numbers include imports,
+settings and `LOGGING` configuration, and the interpreter exit (which flushes
+the logging handlers). "Mongo unavailable" points `MONGO_URI` at a closed
+port; the logs of that run end up in the spool directory of the handler.
+
+Usage (from the directory containing `manage.py`):
+
+    python -m benchmarks.startup [--runs 5] [--mongo-uri mongodb://localhost]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+UNREACHABLE_MONGO_URI = "mongodb://127.0.0.1:9/?connectTimeoutMS=500"
+
+# What a worker does before it connects to the broker: load the Celery app,
+# set Django up through the fixup and import every tasks module.
+WORKER_BOOT = """
+import logging
+from skillhub.celery import app
+app.loader.import_default_modules()
+logging.getLogger("benchmarks").info("worker ready")
+"""
+
+SCENARIOS = {
+    "manage.py check": [sys.executable, "manage.py", "check"],
+    "worker boot": [sys.executable, "-c", WORKER_BOOT],
+}
+
+
+def measure(command, env, runs):
+    """
+    Run a command `runs` times and return the wall times in seconds.
+    """
+
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run(
+            command,
+            env=env,
+            check=True,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument(
+        "--mongo-uri",
+        default=os.environ.get("MONGO_URI"),
+        help="URI of a reachable Mongo (defaults to the configured one).",
+    )
+    args = parser.parse_args(argv)
+
+    mongo = {"available": args.mongo_uri, "unavailable": UNREACHABLE_MONGO_URI}
+
+    print(f"{'scenario':<20} {'mongo':<12} {'min':>8} {'median':>8} {'max':>8}")
+    for name, command in SCENARIOS.items():
+        for availability, uri in mongo.items():
+            env = dict(os.environ)
+            if uri:
+                env["MONGO_URI"] = uri
+            timings = measure(command, env, args.runs)
+            print(
+                f"{name:<20} {availability:<12} {min(timings):>7.3f}s "
+                f"{statistics.median(timings):>7.3f}s {max(timings):>7.3f}s"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -4,3 +4,17 @@ from django.apps import AppConfig
 class CoreConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "core"
+
+    def ready(self):
+        from celery.signals import task_postrun
+        from core.db_pool import publisher
+        from core.metrics import install_query_counter, install_serializer_timer
+        from django.core.signals import request_finished
+        from django.db.backends.signals import connection_created
+
+        install_serializer_timer()
+        connection_created.connect(install_query_counter)
+        # Web processes publish their pool statistics after a request, Celery
+        # workers after a task.
+        request_finished.connect(publisher.publish)
+        task_postrun.connect(publisher.publish)
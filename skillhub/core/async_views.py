@@ -0,0 +1,188 @@
+from contextlib import nullcontext
+
+from asgiref.sync import sync_to_async
+from core.cache import (
+    aget_cached_response,
+    aget_invalidations,
+    aget_tag_versions,
+    aset_cached_response,
+    get_response_key,
+)
+from core.db_router import use_primary
+from core.query_plans import plan_queryset
+from django.http import HttpResponse
+from django.views import View
+from rest_framework import exceptions
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+from rest_framework.views import exception_handler
+
+
+class AsyncReadView(View):
+    """
+    Base class of the async read-only endpoints: a list and a retrieve route.
+
+    A GET is served in the event loop: the queryset is filtered, planned for
+    the serializer (see `plan_queryset`) and read with the async ORM, so the
+    worker keeps serving other requests while the database works. The
+    serializer then renders objects whose relations are already loaded; a
+    serializer that would query from the event loop raises
+    `SynchronousOnlyOperation` instead of silently running an N+1.
+
+    Subclasses declare the same attributes as a DRF generic view
+    (`queryset`, `serializer_class`, `permission_classes`, `filter_backends`,
+    `ordering`...), so the responses match the ones of the sync viewset.
+    With a `basename`, anonymous responses are cached like the ones of
+    `CachedResponseMixin`, and invalidated by the same tags.
+
+    The authentication classes are sync, so they only run (in a thread) for
+    requests that carry an `Authorization` header.
+    """
+
+    http_method_names = ["get", "head", "options"]
+    queryset = None
+    serializer_class = None
+    authentication_classes = api_settings.DEFAULT_AUTHENTICATION_CLASSES
+    permission_classes = api_settings.DEFAULT_PERMISSION_CLASSES
+    pagination_class = api_settings.DEFAULT_PAGINATION_CLASS
+    filter_backends = ()
+    ordering = None
+    basename = None
+    cache_list_tag = None
+    renderer = JSONRenderer()
+
+    def get_cache_tags(self, items):
+        """
+        Return the tags of the rendered items (see `CachedResponseMixin`).
+        """
+
+        return []
+
+    async def get(self, request, pk=None):
+        request = Request(
+            request, authenticators=[auth() for auth in self.authentication_classes]
+        )
+        self.request = request
+        self.action = "list" if pk is None else "retrieve"
+        self.paginator = self.pagination_class() if self.pagination_class else None
+
+        key = None
+        try:
+            if request.META.get("HTTP_AUTHORIZATION"):
+                # Authenticating loads the user from the database.
+                await sync_to_async(self.initial)(request)
+            else:
+                self.initial(request)
+
+            if self.basename and not request.user.is_authenticated:
+                key = get_response_key(self.basename, self.action, request)
+                entry = await aget_cached_response(key)
+                if entry is not None:
+                    return self.render(entry["data"])
+                # Read before building, as in `CachedResponseMixin`.
+                invalidations = await aget_invalidations()
+                versions = await aget_tag_versions(
+                    [self.cache_list_tag] if pk is None and self.cache_list_tag else []
+                )
+
+            # A cached response is built from the primary (see `use_primary`).
+            with use_primary() if key is not None else nullcontext():
+                if pk is None:
+                    data = await self.list(request)
+                else:
+                    data = await self.retrieve(request, pk)
+        except exceptions.APIException as exc:
+            return self.handle_exception(request, exc)
+
+        if key is not None:
+            if pk is not None:
+                items = [data]
+            else:
+                items = data["results"] if isinstance(data, dict) else data
+            tags = set(self.get_cache_tags(items)) - versions.keys()
+            versions.update(await aget_tag_versions(tags))
+            if await aget_invalidations() == invalidations:
+                await aset_cached_response(key, versions, data)
+        return self.render(data)
+
+    async def list(self, request):
+        queryset = self.filter_queryset(self.get_queryset())
+        if self.paginator is None:
+            return self.get_serializer([obj async for obj in queryset], many=True).data
+        page = await self.paginator.apaginate_queryset(queryset, request, view=self)
+        data = self.get_serializer(page, many=True).data
+        return self.paginator.get_paginated_response(data).data
+
+    async def retrieve(self, request, pk):
+        queryset = self.filter_queryset(self.get_queryset())
+        try:
+            obj = await queryset.aget(pk=pk)
+        except (queryset.model.DoesNotExist, ValueError):
+            raise exceptions.NotFound()
+        self.check_object_permissions(request, obj)
+        return self.get_serializer(obj).data
+
+    def get_queryset(self):
+        return plan_queryset(self.queryset.all(), self.get_serializer())
+
+    def filter_queryset(self, queryset):
+        for backend in self.filter_backends:
+            queryset = backend().filter_queryset(self.request, queryset, self)
+        return queryset
+
+    def get_serializer(self, *args, **kwargs):
+        context = {"request": self.request, "format": None, "view": self}
+        return self.serializer_class(*args, context=context, **kwargs)
+
+    def initial(self, request):
+        """
+        Authenticate the request and check the permissions, like `APIView`.
+        """
+
+        request.user
+        self.check_permissions(request)
+
+    def check_permissions(self, request):
+        for permission in [permission() for permission in self.permission_classes]:
+            if not permission.has_permission(request, self):
+                self.permission_denied(request, permission)
+
+    def check_object_permissions(self, request, obj):
+        for permission in [permission() for permission in self.permission_classes]:
+            if not permission.has_object_permission(request, self, obj):
+                self.permission_denied(request, permission)
+
+    def permission_denied(self, request, permission):
+        if request.authenticators and not request.successful_authenticator:
+            raise exceptions.NotAuthenticated()
+        raise exceptions.PermissionDenied(getattr(permission, "message", None))
+
+    def handle_exception(self, request, exc):
+        """
+        Return the error response of DRF's exception handler.
+        """
+
+        if isinstance(
+            exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)
+        ):
+            authenticators = request.authenticators
+            if authenticators:
+                exc.auth_header = authenticators[0].authenticate_header(request)
+            else:
+                exc.status_code = 403
+        response = exception_handler(exc, {"request": request, "view": self})
+        headers = {
+            header: value
+            for header, value in response.items()
+            if header != "Content-Type"
+        }
+        return self.render(response.data, response.status_code, headers)
+
+    def render(self, data, status=200, headers=None):
+        return HttpResponse(
+            self.renderer.render(data),
+            status=status,
+            headers=headers,
+            content_type="application/json",
+        )
@@ -0,0 +1,308 @@
+import hashlib
+import uuid
+
+from core.db_router import use_primary
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.cache import get_conditional_response
+from django.utils.http import parse_http_date_safe
+from rest_framework import status
+from rest_framework.response import Response
+
+KEY_PREFIX = "response-cache"
+STATS = ("hits", "misses", "invalidations")
+# Headers stored with a cached response, e.g. set by `ConditionalGetMixin`.
+VALIDATOR_HEADERS = ("ETag", "Last-Modified")
+
+
+def _tag_key(tag):
+    return f"{KEY_PREFIX}:tag:{tag}"
+
+
+def _stats_key(name):
+    return f"{KEY_PREFIX}:stats:{name}"
+
+
+def get_tag_versions(tags):
+    """
+    Return the current version of every tag, creating the missing ones.
+
+    Args:
+        tags (Iterable[str]): The tags, e.g. `course:1` or `courses`.
+
+    Returns:
+        dict: The version of each tag.
+    """
+
+    keys = {_tag_key(tag): tag for tag in tags}
+    versions = {keys[key]: version for key, version in cache.get_many(keys).items()}
+    for key, tag in keys.items():
+        if tag not in versions:
+            # Another process may create the same tag at the same time.
+            cache.add(key, uuid.uuid4().hex, None)
+            versions[tag] = cache.get(key)
+    return versions
+
+
+async def aget_tag_versions(tags):
+    """
+    Async version of `get_tag_versions`.
+    """
+
+    keys = {_tag_key(tag): tag for tag in tags}
+    found = await cache.aget_many(keys)
+    versions = {keys[key]: version for key, version in found.items()}
+    for key, tag in keys.items():
+        if tag not in versions:
+            await cache.aadd(key, uuid.uuid4().hex, None)
+            versions[tag] = await cache.aget(key)
+    return versions
+
+
+def tags_are_current(versions):
+    """
+    Return whether every tag still has the version a cache entry was built with.
+
+    Args:
+        versions (dict): The version of each tag, from `get_tag_versions`.
+    """
+
+    current = cache.get_many([_tag_key(tag) for tag in versions])
+    return all(
+        current.get(_tag_key(tag)) == version for tag, version in versions.items()
+    )
+
+
+def get_response_key(basename, action, request):
+    """
+    Return the cache key of a response, from its view and the full request path.
+    """
+
+    path = hashlib.md5(request.get_full_path().encode()).hexdigest()
+    return f"{KEY_PREFIX}:{basename}:{action}:{path}"
+
+
+def invalidate_tags(tags):
+    """
+    Give every tag a new version, so the responses tagged with it are stale.
+
+    Inside a transaction the versions change once it commits; a response
+    rebuilt earlier would still read the old rows.
+    """
+
+    tags = set(tags)
+    if not tags:
+        return
+
+    def bump():
+        # Counted first: see `get_invalidations`.
+        record("invalidations", len(tags))
+        cache.set_many({_tag_key(tag): uuid.uuid4().hex for tag in tags}, None)
+
+    transaction.on_commit(bump)
+
+
+def get_invalidations():
+    """
+    Return the number of tag versions bumped so far, by every process.
+
+    A response whose tags are only known once it is built is cached only if
+    this count did not change while it was built. The count is incremented
+    before the versions change, so an unchanged count also means that the
+    versions read after the build are older than any write it missed.
+    """
+
+    return cache.get(_stats_key("invalidations"), 0)
+
+
+async def aget_invalidations():
+    """
+    Async version of `get_invalidations`.
+    """
+
+    return await cache.aget(_stats_key("invalidations"), 0)
+
+
+def record(name, count=1):
+    """
+    Increment a response cache counter.
+    """
+
+    key = _stats_key(name)
+    try:
+        cache.incr(key, count)
+    except ValueError:
+        if not cache.add(key, count, None):
+            cache.incr(key, count)
+
+
+async def arecord(name, count=1):
+    """
+    Async version of `record`.
+    """
+
+    key = _stats_key(name)
+    try:
+        await cache.aincr(key, count)
+    except ValueError:
+        if not await cache.aadd(key, count, None):
+            await cache.aincr(key, count)
+
+
+async def aget_cached_response(key):
+    """
+    Return the cached response data of a key while all its tags are current.
+
+    The async counterpart of the lookup of `CachedResponseMixin`, for the
+    async read views: the entries have the same format and are invalidated
+    by the same tags.
+
+    Returns:
+        dict: The cache entry (`tags`, `data` and `headers`), or None.
+    """
+
+    entry = await cache.aget(key)
+    if entry is not None:
+        versions = await cache.aget_many([_tag_key(tag) for tag in entry["tags"]])
+        if all(
+            versions.get(_tag_key(tag)) == version
+            for tag, version in entry["tags"].items()
+        ):
+            await arecord("hits")
+            return entry
+    await arecord("misses")
+    return None
+
+
+async def aset_cached_response(key, versions, data, headers=None):
+    """
+    Cache response data under the versions of its tags read before building it.
+    """
+
+    await cache.aset(
+        key,
+        {"tags": versions, "data": data, "headers": headers or {}},
+        settings.RESPONSE_CACHE_TIMEOUT,
+    )
+
+
+def get_stats():
+    """
+    Return the response cache counters.
+    """
+
+    values = cache.get_many([_stats_key(name) for name in STATS])
+    return {name: values.get(_stats_key(name), 0) for name in STATS}
+
+
+class CachedResponseMixin:
+    """
+    Mixin for viewsets that caches the anonymous list and retrieve responses.
+
+    Every cache entry stores the versions of the tags it was built from:
+    `cache_list_tag` for list responses, plus the tags returned by
+    `get_cache_tags` for the rendered items. An entry is served only while
+    all its tags still have the same version, so bumping a tag with
+    `invalidate_tags` invalidates exactly the responses that contain it.
+
+    The `ETag` and `Last-Modified` headers of a cached response are stored
+    with it, so a hit also answers conditional requests without a query.
+
+    Requests of authenticated users are never cached, as their responses may
+    depend on the user. A missed response is built from the primary database,
+    never from a replica, and stored under the tag versions read before it
+    was built: a write committed in the meantime makes it unreachable.
+    Entries also expire after `RESPONSE_CACHE_TIMEOUT` seconds.
+    """
+
+    cache_list_tag = None
+
+    def get_cache_tags(self, items):
+        """
+        Return the tags of the items rendered by a response.
+
+        Args:
+            items (list): The serialized items (one item for retrieve).
+
+        Returns:
+            Iterable[str]: The tags.
+        """
+
+        return []
+
+    def list(self, request, *args, **kwargs):
+        return self.get_cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_cached_response(super().retrieve, request, *args, **kwargs)
+
+    def get_cached_response(self, build, request, *args, **kwargs):
+        if request.user.is_authenticated:
+            return build(request, *args, **kwargs)
+
+        key = get_response_key(self.basename, self.action, request)
+
+        entry = cache.get(key)
+        if entry is not None and tags_are_current(entry["tags"]):
+            record("hits")
+            return self.get_cached_hit(request, entry)
+        record("misses")
+
+        # The tags of the items are only known once built: see
+        # `get_invalidations`.
+        invalidations = get_invalidations()
+        versions = get_tag_versions(
+            [self.cache_list_tag]
+            if self.action == "list" and self.cache_list_tag
+            else []
+        )
+        # A replica lagging behind a bumped tag would cache a stale response.
+        with use_primary():
+            response = build(request, *args, **kwargs)
+        if response.status_code != status.HTTP_200_OK:
+            return response
+
+        data = response.data
+        if self.action == "retrieve":
+            items = [data]
+        elif isinstance(data, dict):
+            items = data["results"]
+        else:
+            items = data
+
+        versions.update(
+            get_tag_versions(set(self.get_cache_tags(items)) - versions.keys())
+        )
+        if get_invalidations() != invalidations:
+            return response
+        headers = {
+            header: response[header]
+            for header in VALIDATOR_HEADERS
+            if response.has_header(header)
+        }
+        cache.set(
+            key,
+            {"tags": versions, "data": data, "headers": headers},
+            settings.RESPONSE_CACHE_TIMEOUT,
+        )
+        return response
+
+    def get_cached_hit(self, request, entry):
+        """
+        Return the cached response, or a 304 if the request's validators match.
+        """
+
+        headers = entry["headers"]
+        if headers:
+            last_modified = headers.get("Last-Modified")
+            response = get_conditional_response(
+                request,
+                etag=headers.get("ETag"),
+                last_modified=last_modified and parse_http_date_safe(last_modified),
+            )
+            if response is not None:
+                for header, value in headers.items():
+                    response[header] = value
+                return response
+        return Response(entry["data"], headers=headers)
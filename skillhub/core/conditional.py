@@ -0,0 +1,81 @@
+import hashlib
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+
+class ConditionalGetMixin:
+    """
+    Mixin for viewsets that answers list and retrieve requests conditionally.
+
+    The validators are computed from the rows the response would render, in a
+    single query and without serializing anything: the primary keys of the
+    rows and the latest value of `validator_field`. A list is validated on
+    the page the paginator returns, not on the whole filtered queryset, so
+    the query stays an index range of at most a page of rows. They are sent
+    as `ETag` and `Last-Modified` headers, and a request whose
+    `If-None-Match` or `If-Modified-Since` still matches gets an empty 304
+    response.
+
+    `validator_field` must change whenever the rendered content changes, e.g.
+    `course__updated_at` for objects whose changes bump their course.
+    """
+
+    validator_field = "updated_at"
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        if self.paginator is not None:
+            # The page plus the row telling whether there is a next page.
+            page = self.paginator.get_page_queryset(queryset, request, view=self)
+            if page is not None:
+                queryset = page
+        return self.get_conditional_response(
+            queryset, super().list, request, *args, **kwargs
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        queryset = self.filter_queryset(self.get_queryset()).filter(
+            **{self.lookup_field: kwargs[lookup_url_kwarg]}
+        )
+        return self.get_conditional_response(
+            queryset, super().retrieve, request, *args, **kwargs
+        )
+
+    def get_validators(self, queryset):
+        """
+        Return the ETag and the last modification time of a queryset.
+
+        Args:
+            queryset (QuerySet): The rows of the response, at most a page.
+
+        Returns:
+            tuple: The quoted ETag and the last modification time, or
+            `(None, None)` if the queryset is empty.
+        """
+
+        rows = list(queryset.values_list("pk", self.validator_field))
+        if not rows:
+            return None, None
+
+        last_modified = max(modified for _, modified in rows)
+        pks = ",".join(str(pk) for pk, _ in rows)
+        value = f"{pks}:{last_modified.isoformat()}"
+        etag = quote_etag(hashlib.md5(value.encode()).hexdigest())
+        return etag, last_modified
+
+    def get_conditional_response(self, queryset, build, request, *args, **kwargs):
+        etag, last_modified = self.get_validators(queryset)
+        if etag is None:
+            # Nothing to validate: an empty list, or a 404 for retrieve.
+            return build(request, *args, **kwargs)
+
+        timestamp = int(last_modified.timestamp())
+        response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+        if response is None:
+            response = build(request, *args, **kwargs)
+
+        response["ETag"] = etag
+        response["Last-Modified"] = http_date(timestamp)
+        return response
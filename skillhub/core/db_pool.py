@@ -0,0 +1,118 @@
+import os
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+
+KEY_PREFIX = "db-pool"
+# Minimum lifetime in seconds of a published snapshot.
+SNAPSHOT_TIMEOUT = 60
+# Counters of `psycopg_pool.ConnectionPool.get_stats()` reported per process.
+STATS = (
+    "pool_min",
+    "pool_max",
+    "pool_size",
+    "pool_available",
+    "requests_waiting",
+    "requests_num",
+    "requests_queued",
+    "requests_wait_ms",
+    "requests_errors",
+    "connections_num",
+    "connections_ms",
+    "connections_errors",
+    "connections_lost",
+)
+
+
+def _processes_key():
+    return f"{KEY_PREFIX}:processes"
+
+
+def _process_key(process_type, pid):
+    return f"{KEY_PREFIX}:{process_type}:{pid}"
+
+
+def get_process_pool_stats():
+    """
+    Return the statistics of the connection pools of this process.
+
+    Returns:
+        dict: For every pooled database alias, the counters of its pool and
+        its `usage`, the share of the pool's maximum size in use. Empty
+        when pooling is off.
+    """
+
+    stats = {}
+    for alias in connections:
+        pool = getattr(connections[alias], "pool", None)
+        if pool is None:
+            continue
+        pool_stats = pool.get_stats()
+        values = {name: pool_stats.get(name, 0) for name in STATS}
+        in_use = values["pool_size"] - values["pool_available"]
+        values["usage"] = round(in_use / values["pool_max"], 2)
+        stats[alias] = values
+    return stats
+
+
+class PoolStatsPublisher:
+    """
+    Publishes the pool statistics of this process to the cache.
+
+    Every web and Celery process has its own pools, so an endpoint served
+    by one process cannot read the others. Each process writes a snapshot
+    at most every `DB_POOL_STATS_INTERVAL` seconds, after a request or a
+    task; a snapshot expires if its process stops publishing for three
+    intervals (and at least `SNAPSHOT_TIMEOUT` seconds).
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.published = 0
+
+    def publish(self, **kwargs):
+        interval = settings.DB_POOL_STATS_INTERVAL
+        with self.lock:
+            if time.monotonic() - self.published < interval:
+                return
+            self.published = time.monotonic()
+
+        databases = get_process_pool_stats()
+        if not databases:
+            return
+        key = _process_key(settings.PROCESS_TYPE, os.getpid())
+        cache.set(
+            key,
+            {
+                "process": settings.PROCESS_TYPE,
+                "pid": os.getpid(),
+                "databases": databases,
+            },
+            max(interval * 3, SNAPSHOT_TIMEOUT),
+        )
+        known = cache.get(_processes_key(), [])
+        if key not in known:
+            cache.set(_processes_key(), sorted({key, *known}), None)
+
+
+publisher = PoolStatsPublisher()
+
+
+def get_pool_stats():
+    """
+    Return the last published pool statistics of every live process.
+
+    Returns:
+        list: A snapshot per process, with its `process` type, `pid` and
+        the pool statistics of its `databases`.
+    """
+
+    keys = cache.get(_processes_key(), [])
+    snapshots = cache.get_many(keys)
+    if len(snapshots) < len(keys):
+        # Forget the processes whose snapshot expired.
+        cache.set(_processes_key(), sorted(snapshots), None)
+    return [snapshots[key] for key in sorted(snapshots)]
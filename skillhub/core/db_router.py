@@ -0,0 +1,240 @@
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.contrib.auth import SESSION_KEY
+from django.core.cache import cache
+from django.db import connections
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+KEY_PREFIX = "db-primary"
+PRIMARY = "default"
+
+_routing = ContextVar("db_routing", default=None)
+_force_primary = ContextVar("db_force_primary", default=False)
+
+
+def _sticky_key(user_id):
+    return f"{KEY_PREFIX}:user:{user_id}"
+
+
+def _address(alias):
+    settings_dict = connections[alias].settings_dict
+    return settings_dict["HOST"], settings_dict["PORT"], settings_dict["NAME"]
+
+
+def get_replicas():
+    """
+    Return the aliases of the replicas that are not the primary's database.
+
+    A replica with the primary's address, e.g. the test mirror of the
+    primary's test database, is read through the primary's connection,
+    which also sees its uncommitted writes.
+    """
+
+    primary = _address(PRIMARY)
+    return [alias for alias in settings.DATABASE_REPLICAS if _address(alias) != primary]
+
+
+def get_user_id(request):
+    """
+    Return the ID of the user of a request, before it is authenticated.
+
+    The ID is read from the request's access token, without a query, or
+    else from its session, e.g. in the admin.
+
+    Returns:
+        The user ID, or None for a request without a valid token or a
+        logged-in session.
+    """
+
+    authentication = JWTAuthentication()
+    header = authentication.get_header(request)
+    raw_token = header and authentication.get_raw_token(header)
+    if raw_token:
+        try:
+            token = authentication.get_validated_token(raw_token)
+        except (InvalidToken, TokenError):
+            return None
+        return token.get(jwt_settings.USER_ID_CLAIM)
+    session = getattr(request, "session", None)
+    return session.get(SESSION_KEY) if session is not None else None
+
+
+def get_view_names(request):
+    """
+    Return the dotted paths matching the view of a resolved request.
+
+    A viewset matches both its class, e.g. `course.views.CourseViewSet`,
+    and the action, e.g. `course.views.CourseViewSet.progress`.
+    """
+
+    func = request.resolver_match.func
+    view = getattr(func, "cls", None) or getattr(func, "view_class", func)
+    name = f"{view.__module__}.{view.__qualname__}"
+    names = [name]
+    action = getattr(func, "actions", {}).get(request.method.lower())
+    if action:
+        names.append(f"{name}.{action}")
+    return names
+
+
+@contextmanager
+def use_primary():
+    """
+    Read from the primary inside the block, e.g. to fill a shared cache.
+
+    A response built from a lagging replica and cached under the current
+    tag versions would be served stale until it expires.
+    """
+
+    token = _force_primary.set(True)
+    try:
+        yield
+    finally:
+        _force_primary.reset(token)
+
+
+class RequestRouting:
+    """
+    The database the reads of one request go to, decided on its first read.
+
+    Reads go to a replica, the same one for the whole request, unless the
+    request is not safe, its view is pinned to the primary by
+    `DB_REPLICA_PINNED_VIEWS`, or its user wrote in the last
+    `DB_REPLICA_STICKY_SECONDS` seconds (so they read their own writes).
+    """
+
+    def __init__(self, request):
+        self.request = request
+        self.decided = False
+        self.alias = None
+
+    def db_for_read(self):
+        if not self.decided:
+            if self.request.resolver_match is None:
+                # Not resolved yet, e.g. read by a middleware.
+                return None
+            # Reads made while choosing, e.g. of the session, use the primary.
+            self.decided = True
+            self.alias = self.choose()
+        return self.alias
+
+    def choose(self):
+        request = self.request
+        if request.method not in SAFE_METHODS:
+            return None
+        pinned = settings.DB_REPLICA_PINNED_VIEWS
+        if any(name in pinned for name in get_view_names(request)):
+            return None
+        user_id = get_user_id(request)
+        if user_id is not None and cache.get(_sticky_key(user_id)):
+            return None
+        replicas = get_replicas()
+        return random.choice(replicas) if replicas else None
+
+
+class ReplicaRouter:
+    """
+    Database router sending the reads of safe requests to the replicas.
+
+    Writes, and every query outside a request (Celery tasks, commands), go
+    to the primary. The replicas, listed in `DATABASE_REPLICAS`, mirror the
+    primary: relations between their objects are allowed and they are never
+    migrated.
+    """
+
+    def db_for_read(self, model, **hints):
+        routing = _routing.get()
+        if routing is None or _force_primary.get():
+            return PRIMARY
+        return routing.db_for_read() or PRIMARY
+
+    def db_for_write(self, model, **hints):
+        # Without this, an object read from a replica would be saved to it.
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        aliases = {PRIMARY, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in settings.DATABASE_REPLICAS:
+            return False
+        return None
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Middleware letting `ReplicaRouter` route the reads of each request.
+
+    After a successful unsafe request, it sends the reads of its user to the
+    primary for `DB_REPLICA_STICKY_SECONDS` seconds. Without replicas the
+    requests go through untouched.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if not settings.DATABASE_REPLICAS:
+            return self.get_response(request)
+
+        token = _routing.set(RequestRouting(request))
+        try:
+            response = self.get_response(request)
+        finally:
+            _routing.reset(token)
+        user_id = self.get_writer(request, response)
+        if user_id is not None:
+            cache.set(_sticky_key(user_id), True, settings.DB_REPLICA_STICKY_SECONDS)
+        return response
+
+    async def __acall__(self, request):
+        if not settings.DATABASE_REPLICAS:
+            return await self.get_response(request)
+
+        token = _routing.set(RequestRouting(request))
+        try:
+            response = await self.get_response(request)
+        finally:
+            _routing.reset(token)
+        user_id = None
+        if request.method not in SAFE_METHODS:
+            # Loading the user of a session queries the database.
+            user_id = await sync_to_async(self.get_writer)(request, response)
+        if user_id is not None:
+            await cache.aset(
+                _sticky_key(user_id), True, settings.DB_REPLICA_STICKY_SECONDS
+            )
+        return response
+
+    def get_writer(self, request, response):
+        """
+        Return the ID of the user who wrote with a request, if any.
+
+        The user is the one the request was authenticated as, by DRF or by a
+        session, else the one of its access token.
+        """
+
+        if request.method in SAFE_METHODS or response.status_code >= 400:
+            return None
+        user = getattr(request, "user", None)
+        if user is not None and user.is_authenticated:
+            return user.pk
+        return get_user_id(request)
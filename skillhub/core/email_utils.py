@@ -1,17 +1,102 @@
+import logging
+import os
+import smtplib
+
 from django.conf import settings
-from django.core.mail import send_mail
+from django.core.mail import EmailMessage, get_connection
+
+logger = logging.getLogger(__name__)
 
 
 class EmailService:
+    """
+    Service for sending emails over a persistent SMTP connection.
+
+    The connection is opened on first use and then reused for every message
+    sent by the process, so a Celery worker pays for the TCP/TLS handshake and
+    the login once instead of once per email. A connection inherited over a
+    fork is never reused: the child process opens its own.
+    """
+
     def __init__(self, from_email=settings.DEFAULT_FROM_EMAIL, fail_silently=False):
         self.from_email = from_email
         self.fail_silently = fail_silently
+        self._connection = None
+        self._pid = None
 
     def send(self, subject: str, message: str, to_email: str):
-        send_mail(
-            subject=subject,
-            message=message,
-            from_email=self.from_email,
-            recipient_list=[to_email],
-            fail_silently=self.fail_silently,
+        if not self.send_messages([self.build_message(subject, message, to_email)]):
+            if not self.fail_silently:
+                raise smtplib.SMTPException(f"Failed to send email to {to_email}")
+
+    def build_message(self, subject: str, message: str, to_email: str):
+        """
+        Build an EmailMessage from this service's sender address.
+        """
+
+        return EmailMessage(
+            subject=subject, body=message, from_email=self.from_email, to=[to_email]
         )
+
+    def send_messages(self, messages, retries=1):
+        """
+        Send a list of EmailMessages over the persistent connection.
+
+        A message that fails because the connection dropped is retried on a
+        fresh connection up to `retries` times. Any other failure skips the
+        message and is logged, so one bad recipient does not fail the batch.
+
+        Args:
+            messages (list): The EmailMessage instances to send.
+            retries (int, optional): Reconnect attempts per message.
+
+        Returns:
+            list: The messages that were delivered.
+        """
+
+        delivered = []
+        for message in messages:
+            for attempt in range(retries + 1):
+                try:
+                    if self.get_connection().send_messages([message]):
+                        delivered.append(message)
+                    break
+                except OSError as e:
+                    # SMTPException is an OSError too, but only a disconnect
+                    # means the connection is dead.
+                    if isinstance(e, smtplib.SMTPException) and not isinstance(
+                        e, smtplib.SMTPServerDisconnected
+                    ):
+                        logger.error(f"Error sending email to {message.to}: {e}")
+                        break
+
+                    logger.warning(f"SMTP connection lost, reconnecting: {e}")
+                    self.close()
+                    if attempt == retries:
+                        logger.error(f"Error sending email to {message.to}: {e}")
+        return delivered
+
+    def get_connection(self):
+        """
+        Return the open connection of the current process, opening it if needed.
+        """
+
+        if self._connection is None or self._pid != os.getpid():
+            connection = get_connection(fail_silently=False)
+            connection.open()
+            self._connection = connection
+            self._pid = os.getpid()
+        return self._connection
+
+    def close(self):
+        """
+        Close the connection of the current process.
+        """
+
+        connection, self._connection = self._connection, None
+        if connection is None or self._pid != os.getpid():
+            return
+        try:
+            connection.close()
+        except Exception as e:
+            logger.warning(f"Error closing SMTP connection: {e}")
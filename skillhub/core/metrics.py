@@ -0,0 +1,337 @@
+import random
+import threading
+import time
+from collections import defaultdict
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.serializers import BaseSerializer
+
+KEY_PREFIX = "request-metrics"
+# Recorded for every sampled request, in the order of the `Server-Timing` header.
+METRICS = ("total", "db", "queries", "serializer", "size")
+# Upper bounds of the histogram buckets, shared by the durations (ms), the
+# query counts and the response sizes (bytes). Larger values go to an
+# overflow bucket, reported with the last bound.
+BOUNDS = tuple(m * 10**e for e in range(8) for m in (1, 2, 5))
+PERCENTILES = (50, 90, 95, 99)
+
+_current = ContextVar("request_metrics", default=None)
+
+
+def _key(endpoint, metric, name):
+    # Cache keys must not contain spaces (see `get_endpoint`).
+    return f"{KEY_PREFIX}:{endpoint.replace(' ', ':')}:{metric}:{name}"
+
+
+def _endpoint_keys(endpoint):
+    names = (*range(len(BOUNDS) + 1), "sum")
+    keys = [_key(endpoint, metric, name) for metric in METRICS for name in names]
+    return keys + [_key(endpoint, "requests", "count")]
+
+
+def _endpoints_key():
+    return f"{KEY_PREFIX}:endpoints"
+
+
+def _bucket(value):
+    for index, bound in enumerate(BOUNDS):
+        if value <= bound:
+            return index
+    return len(BOUNDS)
+
+
+class RequestMetrics:
+    """
+    The measures of one request, filled in while it is processed.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db = 0.0
+        self.serializer = 0.0
+        self.in_serializer = False
+
+    def as_dict(self, size):
+        return {
+            "total": (time.perf_counter() - self.started) * 1000,
+            "db": self.db * 1000,
+            "queries": self.queries,
+            "serializer": self.serializer * 1000,
+            "size": size,
+        }
+
+
+def count_query(execute, sql, params, many, context):
+    """
+    Execute wrapper adding every query to the metrics of the current request.
+
+    The metrics are found through a context variable, which asgiref copies
+    into the threads running the ORM calls of async views.
+    """
+
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.db += time.perf_counter() - started
+        metrics.queries += 1
+
+
+def install_query_counter(sender, connection, **kwargs):
+    """
+    `connection_created` receiver installing `count_query` on a connection.
+
+    The wrapper is put first, as `execute_wrapper` blocks remove the last one.
+    """
+
+    if count_query not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, count_query)
+
+
+def _timed_data(data):
+    """
+    Wrap `BaseSerializer.data` to add its duration to the current request.
+
+    Only the outermost serializer is timed, so a serializer rendered by
+    another one is not counted twice. The time includes the queries run by
+    the serializer, e.g. for a relation that was not prefetched.
+    """
+
+    def wrapper(self):
+        metrics = _current.get()
+        if metrics is None or metrics.in_serializer:
+            return data(self)
+        metrics.in_serializer = True
+        started = time.perf_counter()
+        try:
+            return data(self)
+        finally:
+            metrics.serializer += time.perf_counter() - started
+            metrics.in_serializer = False
+
+    return wrapper
+
+
+def install_serializer_timer():
+    """
+    Time the serializers rendered by sampled requests.
+
+    DRF has no hook around rendering a serializer, so `BaseSerializer.data`
+    is wrapped once at startup. Outside a sampled request the wrapper costs
+    a context variable lookup.
+    """
+
+    if not getattr(BaseSerializer.data.fget, "timed", False):
+        wrapper = _timed_data(BaseSerializer.data.fget)
+        wrapper.timed = True
+        BaseSerializer.data = property(wrapper)
+
+
+class MetricsBuffer:
+    """
+    Histograms of the sampled requests of this process, flushed to the cache.
+
+    Every metric of every endpoint is a histogram of bucket counters plus a
+    sum and a count. The counters are added to the shared cache counters
+    with `incr`, so the workers can flush concurrently without losing
+    samples.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counters = defaultdict(int)
+        self.endpoints = set()
+        self.flushed = time.monotonic()
+
+    def add(self, endpoint, values):
+        with self.lock:
+            self.endpoints.add(endpoint)
+            self.counters[_key(endpoint, "requests", "count")] += 1
+            for metric, value in values.items():
+                self.counters[_key(endpoint, metric, _bucket(value))] += 1
+                # Cache counters are integers: sums are kept in thousandths.
+                self.counters[_key(endpoint, metric, "sum")] += round(value * 1000)
+
+    def is_due(self, interval):
+        return bool(self.counters) and time.monotonic() - self.flushed >= interval
+
+    def flush(self, interval=0):
+        """
+        Add the buffered counters to the cache if `interval` seconds passed.
+        """
+
+        with self.lock:
+            if not self.counters or time.monotonic() - self.flushed < interval:
+                return
+            counters, self.counters = self.counters, defaultdict(int)
+            endpoints, self.endpoints = self.endpoints, set()
+            self.flushed = time.monotonic()
+
+        known = cache.get(_endpoints_key(), [])
+        if not endpoints.issubset(known):
+            cache.set(_endpoints_key(), sorted(endpoints.union(known)), None)
+        for key, count in counters.items():
+            try:
+                cache.incr(key, count)
+            except ValueError:
+                if not cache.add(key, count, None):
+                    cache.incr(key, count)
+
+
+buffer = MetricsBuffer()
+
+
+def get_endpoint(request):
+    """
+    Return the name metrics are aggregated under, e.g. `GET course-list`.
+    """
+
+    match = request.resolver_match
+    return f"{request.method} {match.view_name if match else 'unresolved'}"
+
+
+def _summarize(counts, total, count):
+    summary = {"mean": round(total / 1000 / count, 2)}
+    for percentile in PERCENTILES:
+        rank = count * percentile / 100
+        seen = 0
+        for index, bucket_count in enumerate(counts):
+            seen += bucket_count
+            if seen >= rank:
+                summary[f"p{percentile}"] = BOUNDS[min(index, len(BOUNDS) - 1)]
+                break
+    return summary
+
+
+def get_metrics():
+    """
+    Return the aggregated metrics of every endpoint.
+
+    Returns:
+        dict: For each endpoint, the number of sampled `requests` and, for
+        each metric, its `mean` and percentiles. Durations are in
+        milliseconds and sizes in bytes; a percentile is the upper bound of
+        the histogram bucket it falls in.
+    """
+
+    buckets = range(len(BOUNDS) + 1)
+    endpoints = cache.get(_endpoints_key(), [])
+    values = cache.get_many(
+        [key for endpoint in endpoints for key in _endpoint_keys(endpoint)]
+    )
+
+    metrics = {}
+    for endpoint in endpoints:
+        count = values.get(_key(endpoint, "requests", "count"), 0)
+        if not count:
+            continue
+        metrics[endpoint] = {"requests": count}
+        for metric in METRICS:
+            counts = [values.get(_key(endpoint, metric, i), 0) for i in buckets]
+            total = values.get(_key(endpoint, metric, "sum"), 0)
+            metrics[endpoint][metric] = _summarize(counts, total, count)
+    return metrics
+
+
+def reset_metrics():
+    """
+    Drop the aggregated metrics of every endpoint.
+    """
+
+    endpoints = cache.get(_endpoints_key(), [])
+    cache.delete_many(
+        [key for endpoint in endpoints for key in _endpoint_keys(endpoint)]
+        + [_endpoints_key()]
+    )
+
+
+def format_server_timing(values):
+    """
+    Return the `Server-Timing` header of a request's metrics.
+    """
+
+    return ", ".join(
+        [
+            f"total;dur={values['total']:.1f}",
+            f'db;dur={values["db"]:.1f};desc="{values["queries"]} queries"',
+            f"serializer;dur={values['serializer']:.1f}",
+            f'size;desc="{values["size"]} bytes"',
+        ]
+    )
+
+
+class MetricsMiddleware:
+    """
+    Middleware measuring a sample of the requests.
+
+    For a `REQUEST_METRICS_SAMPLE_RATE` share of the requests it records the
+    total time, the number and duration of the SQL queries (on every
+    database), the time spent rendering serializers and the response size.
+    They are sent back in a `Server-Timing` header and aggregated per
+    endpoint; the aggregates are flushed to the cache every
+    `REQUEST_METRICS_FLUSH_INTERVAL` seconds and served by GET /metrics/.
+
+    With a sample rate of 0 the requests go through untouched. The size of
+    a streaming response is not known when it leaves the middleware and is
+    recorded as 0. The middleware is async-capable, so it does not move the
+    async views to a thread.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if not self.is_sampled():
+            return self.get_response(request)
+
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+
+        self.record(request, response, metrics)
+        buffer.flush(settings.REQUEST_METRICS_FLUSH_INTERVAL)
+        return response
+
+    async def __acall__(self, request):
+        if not self.is_sampled():
+            return await self.get_response(request)
+
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+
+        self.record(request, response, metrics)
+        if buffer.is_due(settings.REQUEST_METRICS_FLUSH_INTERVAL):
+            await sync_to_async(buffer.flush)()
+        return response
+
+    def is_sampled(self):
+        rate = settings.REQUEST_METRICS_SAMPLE_RATE
+        return rate > 0 and random.random() < rate
+
+    def record(self, request, response, metrics):
+        size = 0 if response.streaming else len(response.content)
+        values = metrics.as_dict(size)
+        response["Server-Timing"] = format_server_timing(values)
+        buffer.add(get_endpoint(request), values)
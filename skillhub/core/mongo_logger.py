@@ -1,29 +1,378 @@
+import glob
+import json
 import logging
+import os
+import queue
+import sys
+import threading
+import time
+import traceback
 from datetime import datetime
 
+from bson import ObjectId
+from bson.errors import InvalidId
 from django.conf import settings
 from pymongo import MongoClient
+from pymongo.errors import BulkWriteError, PyMongoError
+
+# Control messages for the writer thread, queued next to the log entries.
+_FLUSH = "flush"
+_STOP = "stop"
+# MongoDB error code of an insert whose `_id` is already stored.
+_DUPLICATE_KEY = 11000
 
 
 class MongoHandler(logging.Handler):
-    def __init__(self):
+    """
+    Logging handler that writes records to MongoDB from a background thread.
+
+    `emit` only turns the record into a document and puts it on a bounded
+    in-memory queue; a writer thread drains the queue and stores the
+    documents with `insert_many`, either once `batch_size` documents are
+    buffered or every `flush_interval` seconds.
+
+    Options (passed as keys of the handler in `LOGGING`):
+
+    - `capacity`: The maximum number of buffered documents.
+    - `batch_size`: The maximum number of documents per `insert_many`.
+    - `flush_interval`: The maximum time in seconds a document stays buffered.
+    - `overflow`: What to do when the buffer is full: `drop_newest` discards
+      the new record, `drop_oldest` discards the oldest buffered one, and
+      `block` waits up to `block_timeout` seconds for room before dropping.
+    - `spool_dir`: The directory for documents that could not be written.
+    - `retry_interval`: The time in seconds to spool instead of trying Mongo
+      again after a failed write.
+    - `server_selection_timeout`: The time in milliseconds a write waits for
+      an unreachable server.
+
+    The buffer is flushed on `flush()`, on `close()` (called by
+    `logging.shutdown` at interpreter exit) and before the process forks;
+    a forked child starts with an empty buffer and its own writer thread.
+
+    The `MongoClient` is created lazily by the writer thread, once per
+    process, so configuring logging costs nothing at startup and a client is
+    never shared across a fork. When Mongo is unreachable the batches are
+    appended to a per-process JSON lines file in `spool_dir` and replayed
+    by the first process that writes to Mongo successfully again. Every
+    document gets its `_id` when it is built, so a batch written again after
+    a partial failure only stores the documents that were missing. Spooled
+    lines that cannot be read back, e.g. cut short by a killed process, are
+    skipped and counted in `corrupt`.
+    """
+
+    OVERFLOW_POLICIES = ("drop_newest", "drop_oldest", "block")
+
+    def __init__(
+        self,
+        capacity=10000,
+        batch_size=500,
+        flush_interval=1.0,
+        overflow="drop_newest",
+        block_timeout=0.1,
+        spool_dir=None,
+        retry_interval=30.0,
+        server_selection_timeout=2000,
+    ):
         super().__init__()
-        self.client = MongoClient(settings.MONGO_URI)
-        self.db = self.client[settings.MONGO_DB_NAME]
-        self.collection = self.db["logs"]
+        if overflow not in self.OVERFLOW_POLICIES:
+            raise ValueError(
+                f"Unknown overflow policy {overflow!r}, "
+                f"expected one of {self.OVERFLOW_POLICIES}"
+            )
+
+        self.capacity = capacity
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.overflow = overflow
+        self.block_timeout = block_timeout
+        self.spool_dir = spool_dir
+        self.retry_interval = retry_interval
+        self.server_selection_timeout = server_selection_timeout
+        self.dropped = 0
+        self.corrupt = 0
+
+        self._reset()
+        os.register_at_fork(before=self.flush, after_in_child=self._reset)
+
+    def _reset(self):
+        """
+        Start with an empty buffer and no writer thread (also used after a fork).
+        """
+
+        self._queue = queue.Queue()
+        self._size = 0
+        self._size_lock = threading.Lock()
+        self._thread = None
+        self._thread_lock = threading.Lock()
+        self._pid = os.getpid()
+        self._client = None
+        self._retry_at = 0
+        # Spool files may be left over by an earlier process.
+        self._spool_pending = True
+
+    @property
+    def collection(self):
+        """
+        The logs collection of this process's client, created on first use.
+        """
+
+        if self._client is None:
+            self._client = MongoClient(
+                settings.MONGO_URI,
+                connect=False,
+                serverSelectionTimeoutMS=self.server_selection_timeout,
+            )
+        return self._client[settings.MONGO_DB_NAME]["logs"]
 
     def emit(self, record):
         try:
-            log_entry = {
-                "level": record.levelname,
-                "message": record.getMessage(),
-                "timestamp": datetime.now(),
-                "logger": record.name,
-                "module": record.module,
-                "funcName": record.funcName,
-                "line": record.lineno,
-                "path": record.pathname,
-            }
-            self.collection.insert_one(log_entry)
+            self._ensure_thread()
+            self._enqueue(self.build_document(record))
         except Exception:
             self.handleError(record)
+
+    def build_document(self, record):
+        """
+        Turn a log record into the document stored in MongoDB.
+        """
+
+        return {
+            "_id": ObjectId(),
+            "level": record.levelname,
+            "message": record.getMessage(),
+            "timestamp": datetime.fromtimestamp(record.created),
+            "logger": record.name,
+            "module": record.module,
+            "funcName": record.funcName,
+            "line": record.lineno,
+            "path": record.pathname,
+        }
+
+    def flush(self, timeout=5.0):
+        """
+        Write every buffered document and wait up to `timeout` seconds for it.
+        """
+
+        if self._thread is None or self._pid != os.getpid():
+            return
+        done = threading.Event()
+        self._queue.put((_FLUSH, done))
+        done.wait(timeout)
+
+    def close(self):
+        """
+        Flush the buffer and stop the writer thread.
+        """
+
+        thread = self._thread
+        if thread is not None and self._pid == os.getpid():
+            done = threading.Event()
+            self._queue.put((_STOP, done))
+            done.wait(5.0)
+        self._thread = None
+        super().close()
+
+    def _ensure_thread(self):
+        if self._pid != os.getpid():
+            self._reset()
+        if self._thread is not None:
+            return
+        with self._thread_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="MongoHandler", daemon=True
+                )
+                self._thread.start()
+
+    def _enqueue(self, document):
+        with self._size_lock:
+            if self._size < self.capacity:
+                self._size += 1
+                self._queue.put(document)
+                return
+
+            if self.overflow == "drop_oldest":
+                try:
+                    oldest = self._queue.get_nowait()
+                except queue.Empty:
+                    oldest = None
+                if isinstance(oldest, tuple):
+                    # Never drop a flush/stop request, requeue it instead.
+                    self._queue.put(oldest)
+                elif oldest is not None:
+                    self._queue.put(document)
+                    self.dropped += 1
+                    return
+
+        if self.overflow == "block":
+            deadline = time.monotonic() + self.block_timeout
+            while time.monotonic() < deadline:
+                time.sleep(0.001)
+                with self._size_lock:
+                    if self._size < self.capacity:
+                        self._size += 1
+                        self._queue.put(document)
+                        return
+
+        with self._size_lock:
+            self.dropped += 1
+
+    def _run(self):
+        batch = []
+        deadline = time.monotonic() + self.flush_interval
+        while True:
+            try:
+                item = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                item = None
+
+            if isinstance(item, tuple):
+                command, done = item
+                self._write(batch)
+                batch = []
+                done.set()
+                if command == _STOP:
+                    return
+            elif item is not None:
+                batch.append(item)
+                with self._size_lock:
+                    self._size -= 1
+
+            if len(batch) >= self.batch_size or time.monotonic() >= deadline:
+                self._write(batch)
+                batch = []
+                deadline = time.monotonic() + self.flush_interval
+
+    def _write(self, batch):
+        if not batch:
+            return
+        if time.monotonic() < self._retry_at:
+            self._spool(batch)
+            return
+        try:
+            self._insert(batch)
+        except PyMongoError:
+            self._retry_at = time.monotonic() + self.retry_interval
+            self._spool(batch)
+            return
+        except Exception:
+            # Logging the failure would feed it back into this handler.
+            if logging.raiseExceptions:
+                traceback.print_exc(file=sys.stderr)
+            return
+
+        if self._spool_pending:
+            self._replay()
+
+    def _insert(self, batch):
+        """
+        Insert documents, skipping the ones already stored.
+
+        With `ordered=False` every document is attempted; a failure caused
+        only by `_id`s already stored, e.g. by an earlier attempt of the
+        same batch, is a success.
+        """
+
+        try:
+            self.collection.insert_many(batch, ordered=False)
+        except BulkWriteError as error:
+            details = error.details
+            if details.get("writeConcernErrors") or any(
+                write_error.get("code") != _DUPLICATE_KEY
+                for write_error in details.get("writeErrors", ())
+            ):
+                raise
+
+    def _spool(self, batch):
+        """
+        Append documents that could not be written to this process's spool file.
+        """
+
+        if not self.spool_dir:
+            self.dropped += len(batch)
+            return
+        try:
+            os.makedirs(self.spool_dir, exist_ok=True)
+            path = os.path.join(self.spool_dir, f"{os.getpid()}.jsonl")
+            with open(path, "a", encoding="utf-8") as spool:
+                for document in batch:
+                    # The `_id` is kept, so the replay never stores it twice.
+                    document = {**document, "_id": str(document["_id"])}
+                    spool.write(json.dumps(document, default=datetime.isoformat))
+                    spool.write("\n")
+            self._spool_pending = True
+        except Exception:
+            self.dropped += len(batch)
+            if logging.raiseExceptions:
+                traceback.print_exc(file=sys.stderr)
+
+    def _replay(self):
+        """
+        Write the spooled documents of every process to Mongo.
+
+        Each spool file is claimed with an atomic rename, so concurrent
+        processes never replay the same file twice. If Mongo fails during a
+        replay, the lines not written yet are appended back to the spool
+        file, which its process may have created again in the meantime.
+        """
+
+        self._spool_pending = False
+        if not self.spool_dir:
+            return
+
+        for path in glob.glob(os.path.join(self.spool_dir, "*.jsonl")):
+            claimed = f"{path}.{os.getpid()}.replay"
+            try:
+                os.rename(path, claimed)
+            except OSError:
+                continue
+
+            # Lines written to Mongo or skipped, from the start of the file.
+            done = lines = 0
+            try:
+                with open(claimed, encoding="utf-8") as spool:
+                    batch = []
+                    for line in spool:
+                        lines += 1
+                        try:
+                            batch.append(self._load(line))
+                        except (ValueError, KeyError, InvalidId):
+                            self.corrupt += 1
+                        if len(batch) >= self.batch_size:
+                            self._insert(batch)
+                            done, batch = lines, []
+                    if batch:
+                        self._insert(batch)
+            except PyMongoError:
+                # Give the rest back and retry after the next successful write.
+                self._unclaim(claimed, path, done)
+                self._spool_pending = True
+                self._retry_at = time.monotonic() + self.retry_interval
+                return
+            os.remove(claimed)
+
+    def _load(self, line):
+        """
+        Turn a spooled line back into a document.
+        """
+
+        document = json.loads(line)
+        document["timestamp"] = datetime.fromisoformat(document["timestamp"])
+        if "_id" in document:
+            document["_id"] = ObjectId(document["_id"])
+        return document
+
+    def _unclaim(self, claimed, path, done):
+        """
+        Append the lines of a claimed spool file after the first `done` ones
+        to the spool file at `path`, and remove the claimed file.
+        """
+
+        with open(claimed, encoding="utf-8") as spool, open(
+            path, "a", encoding="utf-8"
+        ) as pending:
+            for index, line in enumerate(spool):
+                if index >= done:
+                    # A line cut short must not run into the next one.
+                    pending.write(line if line.endswith("\n") else f"{line}\n")
+        os.remove(claimed)
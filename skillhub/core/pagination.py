@@ -0,0 +1,181 @@
+import json
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import Cursor, CursorPagination
+
+
+class KeysetCursorPagination(CursorPagination):
+    """
+    Cursor pagination keyed on the full ordering of the view.
+
+    DRF's `CursorPagination` positions the cursor on the first ordering field
+    only and falls back to OFFSET for rows sharing that value. This class
+    stores the value of every ordering field in the cursor, adds the primary
+    key as a tie-breaker, and selects the page with a keyset condition, so
+    every page is an index range scan no matter how deep the client walks.
+
+    The ordering is taken from the view's `ordering` attribute (or from an
+    ordering filter backend) and must only contain non-nullable fields.
+    """
+
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    ordering = ("pk",)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset = self.get_page_queryset(queryset, request, view)
+        if queryset is None:
+            return None
+        return self.set_page(list(queryset))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """
+        Async version of `paginate_queryset`, reading the page with the async ORM.
+        """
+
+        queryset = self.get_page_queryset(queryset, request, view)
+        if queryset is None:
+            return None
+        return self.set_page([item async for item in queryset])
+
+    def get_page_queryset(self, queryset, request, view=None):
+        """
+        Return the queryset of the requested page, plus one row to detect the next.
+
+        Returns None when pagination is disabled.
+        """
+
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+
+        self.reverse = bool(self.cursor and self.cursor.reverse)
+        self.position = self._decode_position(self.cursor)
+
+        ordering = _reverse_ordering(self.ordering) if self.reverse else self.ordering
+        queryset = queryset.order_by(*ordering)
+        if self.position is not None:
+            queryset = queryset.filter(
+                _keyset_condition(queryset.model, ordering, self.position)
+            )
+        return queryset[: self.page_size + 1]
+
+    def set_page(self, results):
+        """
+        Set the page and the links from the rows read by `get_page_queryset`.
+        """
+
+        self.page = results[: self.page_size]
+        has_more = len(results) > self.page_size
+
+        if self.reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, self.position is not None
+
+        if self.page:
+            self.next_position = self._get_position_from_instance(
+                self.page[-1], self.ordering
+            )
+            self.previous_position = self._get_position_from_instance(
+                self.page[0], self.ordering
+            )
+        else:
+            self.next_position = self.previous_position = (
+                self.cursor.position if self.cursor else None
+            )
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+
+        return self.page
+
+    def get_ordering(self, request, queryset, view):
+        """
+        Return the view ordering with the primary key appended as a tie-breaker.
+        """
+
+        self.ordering = getattr(view, "ordering", None) or type(self).ordering
+        ordering = list(super().get_ordering(request, queryset, view))
+
+        if not {"pk", "-pk", "id", "-id"} & set(ordering):
+            ordering.append("-pk" if ordering[0].startswith("-") else "pk")
+        return tuple(ordering)
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return self.encode_cursor(
+            Cursor(offset=0, reverse=False, position=self.next_position)
+        )
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        return self.encode_cursor(
+            Cursor(offset=0, reverse=True, position=self.previous_position)
+        )
+
+    def _get_position_from_instance(self, instance, ordering):
+        model = type(instance)
+        return json.dumps(
+            [
+                _get_field(model, name.lstrip("-")).value_to_string(instance)
+                for name in ordering
+            ]
+        )
+
+    def _decode_position(self, cursor):
+        if cursor is None or cursor.position is None:
+            return None
+
+        try:
+            position = json.loads(cursor.position)
+        except ValueError:
+            raise NotFound(self.invalid_cursor_message)
+
+        if not isinstance(position, list) or len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return position
+
+
+def _keyset_condition(model, ordering, position):
+    """
+    Build the condition selecting the rows that follow `position` in `ordering`.
+
+    For a descending ordering (a, b, c) this is
+    `a < x OR (a = x AND b < y) OR (a = x AND b = y AND c < z)`, AND-ed with
+    `a <= x` so the database can turn the leading field into an index range
+    (ascending fields use `>` and `>=`).
+    """
+
+    condition = Q()
+    equal = Q()
+    for name, value in zip(ordering, position):
+        attr = _get_field(model, name.lstrip("-")).name
+        lookup = "lt" if name.startswith("-") else "gt"
+        condition |= equal & Q(**{f"{attr}__{lookup}": value})
+        equal &= Q(**{attr: value})
+
+    first = ordering[0]
+    first_attr = _get_field(model, first.lstrip("-")).name
+    first_lookup = "lte" if first.startswith("-") else "gte"
+    return Q(**{f"{first_attr}__{first_lookup}": position[0]}) & condition
+
+
+def _get_field(model, name):
+    if name == "pk":
+        return model._meta.pk
+    return model._meta.get_field(name)
+
+
+def _reverse_ordering(ordering):
+    return tuple(name[1:] if name.startswith("-") else "-" + name for name in ordering)
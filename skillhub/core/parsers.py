@@ -0,0 +1,79 @@
+import codecs
+import csv
+import json
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+
+
+class NDJSONParser(BaseParser):
+    """
+    Parser for newline-delimited JSON (one JSON value per line).
+
+    `parse` returns a generator: the body is read, decoded and parsed one line
+    at a time while the view consumes the values, so large uploads are never
+    held in memory as a whole.
+    """
+
+    media_type = "application/x-ndjson"
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+        return iter_ndjson(stream, encoding)
+
+
+def iter_ndjson(stream, encoding="utf-8"):
+    """
+    Yield the JSON values of a binary stream of NDJSON lines, skipping blank ones.
+
+    Raises:
+        ParseError: If a line is not valid JSON.
+    """
+
+    if stream is None:
+        return
+    for number, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line.decode(encoding))
+        except ValueError as exc:
+            raise ParseError(f"NDJSON parse error on line {number} - {exc}")
+
+
+class CSVParser(BaseParser):
+    """
+    Parser for CSV bodies.
+
+    Like `NDJSONParser`, `parse` returns a generator of the rows (lists of
+    strings), decoded and parsed while the view consumes them.
+    """
+
+    media_type = "text/csv"
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+        return iter_csv(stream, encoding)
+
+
+def iter_csv(stream, encoding="utf-8"):
+    """
+    Yield the rows of a binary CSV stream, skipping blank ones.
+
+    Raises:
+        ParseError: If the stream is not valid CSV.
+    """
+
+    if stream is None:
+        return
+    reader = csv.reader(codecs.iterdecode(stream, encoding))
+    try:
+        for row in reader:
+            if any(cell.strip() for cell in row):
+                yield row
+    except (csv.Error, UnicodeDecodeError) as exc:
+        raise ParseError(f"CSV parse error on line {reader.line_num} - {exc}")
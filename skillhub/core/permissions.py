@@ -1,3 +1,4 @@
+from core.ownership import get_owner_id
 from rest_framework import permissions
 
 
@@ -41,26 +42,7 @@ class IsAuthorOrReadOnly(permissions.BasePermission):
         if request.user.is_authenticated and request.user.role == "admin":
             return True
 
-        course_author = self.get_course_author(obj)
-
-        if not course_author:
-            return False
-
-        return bool(request.user.is_authenticated and course_author == request.user)
-
-    def get_course_author(self, obj):
-        try:
-            if hasattr(obj, "course"):
-                return obj.course.author
-            if hasattr(obj, "module"):
-                return obj.module.course.author
-            if hasattr(obj, "lesson"):
-                return obj.lesson.module.course.author
-            if hasattr(obj, "quiz"):
-                return obj.quiz.lesson.module.course.author
-            if hasattr(obj, "question"):
-                return obj.question.quiz.lesson.module.course.author
-            if hasattr(obj, "answer"):
-                return obj.answer.question.quiz.lesson.module.course.author
-        except AttributeError:
-            return None
+        return bool(
+            request.user.is_authenticated
+            and get_owner_id(obj, request) == request.user.id
+        )
@@ -0,0 +1,116 @@
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from rest_framework import serializers
+from rest_framework.relations import ManyRelatedField, RelatedField
+
+
+def plan_queryset(queryset, serializer):
+    """
+    Apply the select_related/prefetch_related/annotate calls a serializer needs.
+
+    The plan is derived from the fields the serializer will actually render:
+
+    - nested serializers over a forward relation are joined with `select_related`;
+    - nested `many=True` serializers become a `Prefetch` whose queryset is
+      planned recursively for the child serializer;
+    - related fields that need the related object (e.g. `StringRelatedField`)
+      are joined or prefetched, primary key fields are left alone;
+    - `field_annotations` declared on the serializer are added for every
+      rendered field listed there.
+
+    Args:
+        queryset (QuerySet): The base queryset of the view.
+        serializer (Serializer): The serializer (or list serializer) instance.
+
+    Returns:
+        QuerySet: The planned queryset.
+    """
+
+    if isinstance(serializer, serializers.ListSerializer):
+        serializer = serializer.child
+
+    select, prefetch, annotations = _collect(queryset.model, serializer, prefix="")
+
+    if select:
+        queryset = queryset.select_related(*select)
+    if prefetch:
+        queryset = queryset.prefetch_related(*prefetch)
+    if annotations:
+        queryset = queryset.annotate(**annotations)
+    return queryset
+
+
+def _collect(model, serializer, prefix):
+    """
+    Walk the readable fields of a serializer and collect the lookups they need.
+    """
+
+    select, prefetch, annotations = [], [], {}
+    field_annotations = getattr(serializer, "field_annotations", {})
+
+    for name, field in serializer.fields.items():
+        if field.write_only:
+            continue
+
+        if name in field_annotations and not prefix:
+            annotations.update(field_annotations[name])
+
+        if field.source == "*":
+            continue
+
+        model_field = _get_model_field(model, field.source)
+        if model_field is None or not model_field.is_relation:
+            continue
+
+        lookup = prefix + field.source
+        is_many = model_field.many_to_many or model_field.one_to_many
+
+        if isinstance(field, serializers.ListSerializer):
+            child = field.child
+            related_model = model_field.related_model
+            child_queryset = plan_queryset(related_model._default_manager.all(), child)
+            prefetch.append(Prefetch(lookup, queryset=child_queryset))
+        elif isinstance(field, serializers.BaseSerializer):
+            select.append(lookup)
+            nested = _collect(model_field.related_model, field, prefix=lookup + "__")
+            select.extend(nested[0])
+            prefetch.extend(nested[1])
+        elif isinstance(field, ManyRelatedField):
+            prefetch.append(lookup)
+        elif isinstance(field, RelatedField):
+            if field.use_pk_only_optimization():
+                continue
+            if is_many:
+                prefetch.append(lookup)
+            else:
+                select.append(lookup)
+
+    return select, prefetch, annotations
+
+
+def _get_model_field(model, source):
+    """
+    Return the model field behind a serializer source, or None for computed ones.
+    """
+
+    if "." in source:
+        return None
+    try:
+        return model._meta.get_field(source)
+    except FieldDoesNotExist:
+        return None
+
+
+class QueryPlanMixin:
+    """
+    Mixin for generic views that plans the queryset from the serializer fields.
+
+    The view keeps declaring a plain `queryset`; `get_queryset` adds the joins,
+    prefetches and annotations the serializer of the current action renders,
+    so the number of queries does not depend on the number of rows.
+    """
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        serializer = self.get_serializer_class()(context=self.get_serializer_context())
+        return plan_queryset(queryset, serializer)
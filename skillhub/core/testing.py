@@ -0,0 +1,116 @@
+import json
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, URLResolver, get_resolver
+
+
+class QueryBudgetMixin:
+    """
+    TestCase mixin for asserting that an endpoint runs in a fixed number of queries.
+
+    `assertQueryBudget` runs a callable against a small and a scaled dataset and
+    fails if the number of queries grows with the number of rows or exceeds the
+    given budget.
+    """
+
+    def count_queries(self, func):
+        """
+        Run `func` and return the number of executed queries together with its result.
+        """
+
+        with CaptureQueriesContext(connection) as ctx:
+            result = func()
+        return len(ctx.captured_queries), result
+
+    def assertQueryBudget(self, budget, func, scale, sizes=(1, 5)):
+        """
+        Assert that `func` stays within `budget` queries for every dataset size.
+
+        Args:
+            budget (int): The maximum number of queries allowed.
+            func (callable): The code under test, e.g. a test client request.
+            scale (callable): Called with a size to grow the dataset to that size.
+            sizes (tuple): The dataset sizes to run `func` against.
+        """
+
+        counts = []
+        for size in sizes:
+            scale(size)
+            count, _ = self.count_queries(func)
+            counts.append(count)
+
+        self.assertLessEqual(
+            max(counts), budget, f"Query budget exceeded for sizes {sizes}: {counts}"
+        )
+        self.assertEqual(
+            len(set(counts)),
+            1,
+            f"Number of queries grows with the dataset for sizes {sizes}: {counts}",
+        )
+
+
+class Route:
+    """
+    A named GET route: its view class, model and whether it takes a `pk`.
+    """
+
+    def __init__(self, name, view_class, detail):
+        self.name = name
+        self.view_class = view_class
+        self.detail = detail
+
+    @property
+    def model(self):
+        """
+        The model of the view's serializer, whose objects a detail route takes.
+        """
+
+        return self.view_class.serializer_class.Meta.model
+
+
+def _iter_patterns(patterns):
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            yield from _iter_patterns(pattern.url_patterns)
+        elif isinstance(pattern, URLPattern):
+            yield pattern
+
+
+def iter_read_routes(urlconf):
+    """
+    Yield the named routes of a URLconf that answer GET requests.
+
+    Format suffix variants (`.json`) and the DRF router's API root are
+    skipped, so every route is yielded once.
+
+    Args:
+        urlconf (str): The module of the URLconf, e.g. `course.urls`.
+
+    Returns:
+        Iterator[Route]: The routes, in the URLconf's order.
+    """
+
+    seen = set()
+    for pattern in _iter_patterns(get_resolver(urlconf).url_patterns):
+        view_class = getattr(pattern.callback, "cls", None)
+        groups = pattern.pattern.regex.groupindex
+        if pattern.name in seen or view_class is None or "format" in groups:
+            continue
+        actions = getattr(pattern.callback, "actions", None)
+        if actions is not None:
+            readable = "get" in actions
+        else:
+            readable = hasattr(view_class, "get")
+        if readable and pattern.name != "api-root":
+            seen.add(pattern.name)
+            yield Route(pattern.name, view_class, detail="pk" in groups)
+
+
+def load_query_budgets(path):
+    """
+    Return the per-route query budgets of a JSON file (`{"route-name": 3}`).
+    """
+
+    with open(path) as file:
+        return json.load(file)
@@ -1,3 +1,471 @@
-from django.test import TestCase
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+from contextvars import ContextVar
+from unittest.mock import MagicMock, patch
 
-# Create your tests here.
+from core.db_router import (
+    ReplicaRouter,
+    RequestRouting,
+    get_replicas,
+    use_primary,
+)
+from core.mongo_logger import MongoHandler
+from course.models import Category, Course
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connections
+from django.db.utils import ConnectionHandler
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from django.urls import resolve, reverse
+from pymongo.errors import BulkWriteError, ServerSelectionTimeoutError
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+
+class MongoHandlerTest(SimpleTestCase):
+    def setUp(self):
+        patcher = patch("core.mongo_logger.MongoClient", MagicMock())
+        self.client_class = patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.logger = logging.getLogger("core.tests.mongo")
+        self.logger.propagate = False
+        self.logger.setLevel(logging.INFO)
+
+    def make_handler(self, **kwargs):
+        handler = MongoHandler(**kwargs)
+        self.logger.addHandler(handler)
+        self.addCleanup(self.logger.removeHandler, handler)
+        self.addCleanup(handler.close)
+        return handler
+
+    def written(self, handler):
+        return [
+            document["message"]
+            for call in handler.collection.insert_many.call_args_list
+            for document in call[0][0]
+        ]
+
+    def test_records_are_written_in_batches(self):
+        handler = self.make_handler(batch_size=3, flush_interval=60)
+
+        for i in range(7):
+            self.logger.info("message %s", i)
+        handler.flush()
+
+        self.assertEqual(self.written(handler), [f"message {i}" for i in range(7)])
+        self.assertEqual(
+            [len(call[0][0]) for call in handler.collection.insert_many.call_args_list],
+            [3, 3, 1],
+        )
+
+    def test_records_are_flushed_on_interval(self):
+        handler = self.make_handler(flush_interval=0.01)
+
+        self.logger.info("message")
+        for _ in range(500):
+            if handler.collection.insert_many.called:
+                break
+            handler._thread.join(0.01)
+
+        self.assertEqual(self.written(handler), ["message"])
+
+    def test_close_flushes_buffer(self):
+        handler = self.make_handler(flush_interval=60)
+
+        self.logger.info("message")
+        handler.close()
+
+        self.assertEqual(self.written(handler), ["message"])
+
+    def test_emit_does_not_wait_for_mongo(self):
+        handler = self.make_handler(batch_size=1)
+        release = threading.Event()
+        handler.collection.insert_many.side_effect = lambda *a, **k: release.wait(5)
+
+        started = time.monotonic()
+        self.logger.info("first")
+        self.logger.info("second")
+        elapsed = time.monotonic() - started
+        release.set()
+        handler.flush()
+
+        self.assertLess(elapsed, 1)
+        self.assertEqual(self.written(handler), ["first", "second"])
+
+    def test_drop_newest_when_full(self):
+        handler = self.make_handler(capacity=2, overflow="drop_newest")
+
+        with patch.object(handler, "_ensure_thread"):
+            for i in range(5):
+                self.logger.info("message %s", i)
+
+        self.assertEqual(handler.dropped, 3)
+        self.assertEqual(
+            [handler._queue.get_nowait()["message"] for _ in range(2)],
+            ["message 0", "message 1"],
+        )
+
+    def test_drop_oldest_when_full(self):
+        handler = self.make_handler(capacity=2, overflow="drop_oldest")
+
+        with patch.object(handler, "_ensure_thread"):
+            for i in range(5):
+                self.logger.info("message %s", i)
+
+        self.assertEqual(handler.dropped, 3)
+        self.assertEqual(
+            [handler._queue.get_nowait()["message"] for _ in range(2)],
+            ["message 3", "message 4"],
+        )
+
+    def test_unknown_overflow_policy(self):
+        with self.assertRaises(ValueError):
+            MongoHandler(overflow="explode")
+
+    def test_client_is_created_lazily_once_per_process(self):
+        handler = self.make_handler()
+        self.client_class.assert_not_called()
+
+        self.logger.info("first")
+        self.logger.info("second")
+        handler.flush()
+        self.assertEqual(self.client_class.call_count, 1)
+
+        # A forked child starts without the parent's client.
+        handler._reset()
+        self.logger.info("third")
+        handler.flush()
+        self.assertEqual(self.client_class.call_count, 2)
+
+    def test_unreachable_mongo_spools_and_replays(self):
+        spool_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, spool_dir)
+        handler = self.make_handler(spool_dir=spool_dir, retry_interval=60)
+        insert_many = handler.collection.insert_many
+        insert_many.side_effect = ServerSelectionTimeoutError("down")
+
+        self.logger.info("first")
+        handler.flush()
+        self.logger.info("second")
+        handler.flush()
+
+        # The second batch is spooled without waiting for Mongo again.
+        self.assertEqual(insert_many.call_count, 1)
+        self.assertEqual(os.listdir(spool_dir), [f"{os.getpid()}.jsonl"])
+
+        insert_many.reset_mock(side_effect=True)
+        handler._retry_at = 0
+        self.logger.info("third")
+        handler.flush()
+
+        self.assertEqual(self.written(handler), ["third", "first", "second"])
+        self.assertEqual(os.listdir(spool_dir), [])
+
+    def test_already_stored_documents_are_not_spooled(self):
+        spool_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, spool_dir)
+        handler = self.make_handler(spool_dir=spool_dir)
+        handler.collection.insert_many.side_effect = BulkWriteError(
+            {"writeErrors": [{"index": 0, "code": 11000}], "writeConcernErrors": []}
+        )
+
+        self.logger.info("message")
+        handler.flush()
+
+        self.assertEqual(os.listdir(spool_dir), [])
+
+    def test_corrupt_spooled_lines_are_skipped(self):
+        spool_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, spool_dir)
+        handler = self.make_handler(spool_dir=spool_dir, batch_size=1)
+        insert_many = handler.collection.insert_many
+        insert_many.side_effect = ServerSelectionTimeoutError("down")
+        self.logger.info("first")
+        self.logger.info("second")
+        handler.flush()
+        path = os.path.join(spool_dir, f"{os.getpid()}.jsonl")
+        with open(path) as spool:
+            lines = spool.readlines()
+        with open(path, "w") as spool:
+            spool.writelines([lines[0], '{"message": "cut', "\n", lines[1]])
+
+        insert_many.reset_mock(side_effect=True)
+        handler._retry_at = 0
+        self.logger.info("third")
+        handler.flush()
+
+        self.assertEqual(self.written(handler), ["third", "first", "second"])
+        self.assertEqual(handler.corrupt, 1)
+        self.assertEqual(os.listdir(spool_dir), [])
+
+    def test_failed_replay_appends_the_rest_back(self):
+        spool_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, spool_dir)
+        handler = self.make_handler(spool_dir=spool_dir, batch_size=1)
+        insert_many = handler.collection.insert_many
+        insert_many.side_effect = ServerSelectionTimeoutError("down")
+        self.logger.info("first")
+        self.logger.info("second")
+        handler.flush()
+        path = os.path.join(spool_dir, f"{os.getpid()}.jsonl")
+        with open(path) as spool:
+            spooled = [json.loads(line)["_id"] for line in spool]
+
+        def insert(batch, ordered):
+            if batch[0]["message"] == "second":
+                # Spooled by the owner of the file while it is replayed.
+                with open(path, "a") as spool:
+                    spool.write('{"message": "newer"}\n')
+                raise ServerSelectionTimeoutError("down")
+
+        insert_many.side_effect = insert
+        handler._retry_at = 0
+        self.logger.info("third")
+        handler.flush()
+
+        with open(path) as spool:
+            lines = [json.loads(line) for line in spool]
+        self.assertEqual([line["message"] for line in lines], ["newer", "second"])
+        self.assertEqual(lines[1]["_id"], spooled[1])
+        self.assertEqual(os.listdir(spool_dir), [f"{os.getpid()}.jsonl"])
+
+
+@override_settings(REQUEST_METRICS_SAMPLE_RATE=1.0, REQUEST_METRICS_FLUSH_INTERVAL=0)
+class MetricsMiddlewareTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.admin = get_user_model().objects.create_user(
+            email="admin@example.com",
+            password="strong_password_12",
+            full_name="Admin",
+            role="admin",
+        )
+        category = Category.objects.create(name="Test Category")
+        for i in range(3):
+            Course.objects.create(
+                author=self.admin,
+                title=f"Course {i}",
+                category=category,
+                level="beginner",
+            )
+
+    def test_server_timing_header(self):
+        response = self.client.get(reverse("course-list"))
+
+        timing = dict(
+            metric.split(";", 1) for metric in response["Server-Timing"].split(", ")
+        )
+        self.assertEqual(list(timing), ["total", "db", "serializer", "size"])
+        self.assertRegex(timing["db"], r'^dur=[\d.]+;desc="\d+ queries"$')
+        self.assertGreater(float(timing["serializer"].removeprefix("dur=")), 0)
+        self.assertEqual(timing["size"], f'desc="{len(response.content)} bytes"')
+
+    @override_settings(REQUEST_METRICS_SAMPLE_RATE=0.0)
+    def test_no_header_when_sampling_is_off(self):
+        response = self.client.get(reverse("course-list"))
+        self.assertNotIn("Server-Timing", response)
+
+    def test_metrics_are_aggregated_per_endpoint(self):
+        # Authenticated requests skip the response cache: same query count.
+        self.client.force_authenticate(user=self.admin)
+        url = reverse("course-list")
+        response = self.client.get(url)
+        self.assertIn('desc="3 queries"', response["Server-Timing"])
+        for _ in range(3):
+            self.client.get(url)
+        self.client.get(reverse("course-detail", args=[0]))
+
+        response = self.client.get(reverse("request_metrics"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        endpoints = response.data["endpoints"]
+        self.assertEqual(endpoints["GET course-list"]["requests"], 4)
+        self.assertEqual(endpoints["GET course-detail"]["requests"], 1)
+        # Percentiles are the upper bound of their histogram bucket.
+        self.assertEqual(
+            endpoints["GET course-list"]["queries"],
+            {"mean": 3, "p50": 5, "p90": 5, "p95": 5, "p99": 5},
+        )
+        self.assertGreater(endpoints["GET course-list"]["size"]["mean"], 0)
+
+        response = self.client.delete(reverse("request_metrics"))
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        response = self.client.get(reverse("request_metrics"))
+        self.assertEqual(list(response.data["endpoints"]), ["DELETE request_metrics"])
+
+    def test_metrics_are_admin_only(self):
+        response = self.client.get(reverse("request_metrics"))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+@override_settings(DB_POOL_STATS_INTERVAL=0)
+@override_settings(DB_POOL_STATS_INTERVAL=0)
+class DatabasePoolTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.admin = get_user_model().objects.create_user(
+            email="admin@example.com",
+            password="strong_password_12",
+            full_name="Admin",
+            role="admin",
+        )
+        self.client.force_authenticate(user=self.admin)
+
+    def use_connections(self, pool):
+        """
+        Publish the pools of a database alias of the test's own, whatever
+        the pooling of the test connection.
+
+        The pools are shared by the connections of an alias, so the test
+        database is configured under another alias than "default".
+        """
+
+        settings_dict = {
+            **connections["default"].settings_dict,
+            "CONN_MAX_AGE": 0,
+            "OPTIONS": {"pool": pool},
+        }
+        handler = ConnectionHandler({"default": {}, "pool_test": settings_dict})
+        self.addCleanup(handler["pool_test"].close_pool)
+        patcher = patch("core.db_pool.connections", handler)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        return handler["pool_test"]
+
+    def test_no_stats_without_a_pool(self):
+        self.use_connections(pool=False)
+        response = self.client.get(reverse("db_pool"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["processes"], [])
+
+    def test_pool_stats_are_published(self):
+        connection = self.use_connections(pool={"min_size": 1, "max_size": 4})
+        connection.pool.open(wait=True)
+
+        with connection.pool.connection():
+            response = self.client.get(reverse("db_pool"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        [process] = response.data["processes"]
+        self.assertEqual(process["process"], "web")
+        self.assertEqual(process["pid"], os.getpid())
+        stats = process["databases"]["pool_test"]
+        self.assertEqual(stats["pool_max"], 4)
+        self.assertEqual(stats["pool_available"], stats["pool_size"] - 1)
+        self.assertEqual(stats["usage"], 0.25)
+
+    def test_pool_stats_are_admin_only(self):
+        self.client.force_authenticate(user=None)
+        response = self.client.get(reverse("db_pool"))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+@override_settings(
+    DATABASE_REPLICAS=["replica_1", "replica_2"],
+    DB_REPLICA_PINNED_VIEWS=[],
+    DB_REPLICA_STICKY_SECONDS=10,
+)
+class ReplicaRouterTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.admin = get_user_model().objects.create_user(
+            email="admin@example.com",
+            password="strong_password_12",
+            full_name="Admin",
+            role="admin",
+        )
+        self.token = str(AccessToken.for_user(self.admin))
+        self.router = ReplicaRouter()
+        # The aliases are not configured: only the routing is tested.
+        patcher = patch(
+            "core.db_router.get_replicas", return_value=["replica_1", "replica_2"]
+        )
+        self.get_replicas = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def route(self, method, url, token=None, session=None):
+        """
+        Return the database the reads of a request go to.
+        """
+
+        headers = {"HTTP_AUTHORIZATION": f"Bearer {token}"} if token else {}
+        request = RequestFactory().generic(method, url, **headers)
+        request.resolver_match = resolve(url)
+        if session is not None:
+            request.session = session
+        with patch("core.db_router._routing", ContextVar("routing")) as routing:
+            routing.set(RequestRouting(request))
+            first = self.router.db_for_read(Course)
+            self.assertEqual(self.router.db_for_read(Course), first)
+            return first
+
+    def test_safe_requests_read_from_a_replica(self):
+        self.assertIn(
+            self.route("GET", reverse("course-list")), ["replica_1", "replica_2"]
+        )
+        self.assertEqual(self.route("POST", reverse("course-list")), "default")
+        self.assertEqual(self.router.db_for_write(Course), "default")
+
+    def test_reads_outside_a_request_use_the_primary(self):
+        self.assertEqual(self.router.db_for_read(Course), "default")
+
+    def test_pinned_views_use_the_primary(self):
+        url = reverse("course-list")
+        with override_settings(DB_REPLICA_PINNED_VIEWS=["course.views.CourseViewSet"]):
+            self.assertEqual(self.route("GET", url), "default")
+        with override_settings(
+            DB_REPLICA_PINNED_VIEWS=["course.views.CourseViewSet.retrieve"]
+        ):
+            self.assertNotEqual(self.route("GET", url), "default")
+            detail = reverse("course-detail", args=[1])
+            self.assertEqual(self.route("GET", detail), "default")
+
+    def test_users_read_their_writes(self):
+        url = reverse("category-list")
+        self.assertNotEqual(self.route("GET", url, self.token), "default")
+
+        response = self.client.post(
+            url, {"name": "New"}, HTTP_AUTHORIZATION=f"Bearer {self.token}"
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        self.assertEqual(self.route("GET", url, self.token), "default")
+        self.assertNotEqual(self.route("GET", url), "default")
+
+    def test_session_users_read_their_writes(self):
+        url = reverse("category-list")
+        self.admin.is_superuser = self.admin.is_staff = True
+        self.admin.save()
+        self.client.force_login(self.admin)
+        self.assertNotEqual(
+            self.route("GET", url, session=self.client.session), "default"
+        )
+
+        response = self.client.post(
+            reverse("admin:course_category_add"), {"name": "New"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_302_FOUND)
+        self.assertTrue(Category.objects.filter(name="New").exists())
+
+        self.assertEqual(self.route("GET", url, session=self.client.session), "default")
+        self.assertNotEqual(self.route("GET", url), "default")
+
+    def test_use_primary(self):
+        with use_primary():
+            self.assertEqual(self.route("GET", reverse("course-list")), "default")
+
+    def test_replica_with_the_primary_address_is_not_used(self):
+        self.get_replicas.side_effect = get_replicas
+        with override_settings(DATABASE_REPLICAS=["default"]):
+            self.assertEqual(self.route("GET", reverse("course-list")), "default")
+
+    def test_replicas_are_not_migrated(self):
+        self.assertFalse(self.router.allow_migrate("replica_1", "course"))
+        self.assertIsNone(self.router.allow_migrate("default", "course"))
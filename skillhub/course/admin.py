@@ -1,7 +1,22 @@
-from course.models import Category, Course, Lesson, Module
+from course.models import SEARCH_CONFIG, Category, Course, Lesson, Module
 from django.contrib import admin
-from django.db.models import Avg
-from review.models import Review
+from django.contrib.postgres.search import SearchQuery
+
+
+class FullTextSearchMixin:
+    """
+    Admin mixin that searches the model's `search_vector` (a GIN index lookup)
+    instead of running `icontains` scans over `search_fields`.
+
+    `search_fields` only documents the searched fields and enables the
+    search box.
+    """
+
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term.strip():
+            return queryset, False
+        query = SearchQuery(search_term, config=SEARCH_CONFIG, search_type="websearch")
+        return queryset.filter(search_vector=query), False
 
 
 @admin.register(Category)
@@ -18,14 +33,14 @@ class CategoryAdmin(admin.ModelAdmin):
 
 
 @admin.register(Course)
-class CourseAdmin(admin.ModelAdmin):
+class CourseAdmin(FullTextSearchMixin, admin.ModelAdmin):
     """
     Custom admin class for managing courses.
 
     Display the course's title, author, average rating, category, level,
     created_at, and updated_at.
     Filter by category, level, created_at, and updated_at.
-    Search by title, description, and author's username.
+    Full-text search by title and description.
     Order by created_at in descending order.
     Exclude the author field from the form.
     """
@@ -40,19 +55,18 @@ class CourseAdmin(admin.ModelAdmin):
         "updated_at",
     )
     list_filter = ("category", "level", "created_at", "updated_at")
-    search_fields = ("title", "description", "author__username")
+    search_fields = ("title", "description")
     ordering = ("-created_at",)
     exclude = ("author",)
+    list_select_related = ("author", "category")
 
+    @admin.display(ordering="rating_avg")
     def avg_rate(self, obj):
         """
-        Aggregate the average rating for the course.
+        Return the average rating for the course from its rating summary.
         """
 
-        avg = Review.objects.filter(course=obj).aggregate(avg_rating=Avg("rating"))[
-            "avg_rating"
-        ]
-        return round(avg, 1) if avg else 0
+        return round(obj.rating_avg, 1) if obj.rating_avg else 0
 
     def save_model(self, request, obj, form, change):
         """
@@ -80,15 +94,15 @@ class ModuleAdmin(admin.ModelAdmin):
 
 
 @admin.register(Lesson)
-class LessonAdmin(admin.ModelAdmin):
+class LessonAdmin(FullTextSearchMixin, admin.ModelAdmin):
     """
     Custom admin class for managing lessons.
 
     Display the lesson's title, module, and order.
     Filter by module and order.
-    Search by title and module's title.
+    Full-text search by title and content.
     """
 
     list_display = ("title", "module", "order")
     list_filter = ("module", "order")
-    search_fields = ("title", "module__title")
+    search_fields = ("title", "content")
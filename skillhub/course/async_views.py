@@ -0,0 +1,51 @@
+from core.async_views import AsyncReadView
+from core.ownership import OwnedFilterBackend
+from core.permissions import IsAdminOrReadOnly, IsAuthorOrReadOnly
+from course.cache import course_tag
+from course.filters import CourseFilterBackend
+from course.models import Category, Course
+from course.serializers import CategorySerializer, CourseSerializer
+from rest_framework.filters import OrderingFilter
+
+
+class AsyncCourseView(AsyncReadView):
+    """
+    Async read-only endpoint for the course catalogue.
+
+    - GET /catalogue/courses/: The course list, with the filters and the
+      orderings of GET /courses/.
+    - GET /catalogue/courses/{id}/: A specific course by ID.
+
+    The responses are the ones of `CourseViewSet`, without the `ETag` and
+    `Last-Modified` validators.
+    """
+
+    queryset = Course.objects.all()
+    serializer_class = CourseSerializer
+    permission_classes = [IsAuthorOrReadOnly]
+    filter_backends = [OwnedFilterBackend, CourseFilterBackend, OrderingFilter]
+    ordering = ("-created_at", "-id")
+    ordering_fields = ["created_at", "student_count", "rating_avg"]
+    basename = "catalogue-course"
+    cache_list_tag = "courses"
+
+    def get_cache_tags(self, items):
+        return [course_tag(item["id"]) for item in items]
+
+
+class AsyncCategoryView(AsyncReadView):
+    """
+    Async read-only endpoint for the course categories.
+
+    - GET /catalogue/categories/: The category list.
+    - GET /catalogue/categories/{id}/: A specific category by ID.
+    """
+
+    queryset = Category.objects.all()
+    serializer_class = CategorySerializer
+    permission_classes = [IsAdminOrReadOnly]
+    basename = "catalogue-category"
+    cache_list_tag = "categories"
+
+    def get_cache_tags(self, items):
+        return ["categories"]
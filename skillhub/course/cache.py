@@ -0,0 +1,43 @@
+from core.cache import invalidate_tags
+
+# Lookup from each course content model to the ID of its course.
+COURSE_LOOKUPS = {
+    "course.module": "course_id",
+    "course.lesson": "module__course_id",
+    "course.quiz": "lesson__module__course_id",
+    "course.question": "quiz__lesson__module__course_id",
+    "course.answer": "question__quiz__lesson__module__course_id",
+}
+
+
+def course_tag(course_id):
+    """
+    Return the response cache tag of a course.
+    """
+
+    return f"course:{course_id}"
+
+
+def get_course_ids(model, pks):
+    """
+    Return the IDs of the courses the given objects belong to, in one query.
+    """
+
+    lookup = COURSE_LOOKUPS[model._meta.label_lower]
+    return set(model._default_manager.filter(pk__in=pks).values_list(lookup, flat=True))
+
+
+def invalidate_courses(course_ids, list_tag=None):
+    """
+    Invalidate the cached responses containing the given courses.
+
+    Args:
+        course_ids (Iterable[int]): The IDs of the changed courses.
+        list_tag (str, optional): The list tag of the changed model, for
+            changes that may add, remove or reorder items of its lists.
+    """
+
+    tags = {course_tag(course_id) for course_id in course_ids if course_id}
+    if list_tag:
+        tags.add(list_tag)
+    invalidate_tags(tags)
@@ -0,0 +1,77 @@
+from course.cache import invalidate_courses
+from course.models import Course
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from user.cache import invalidate_profiles
+
+
+def get_user_ids(emails):
+    """
+    Return the IDs of the users with the given emails in one query.
+
+    Returns:
+        tuple: The user IDs by email, and the emails without a user.
+    """
+
+    emails = list(dict.fromkeys(emails))
+    user_ids = dict(
+        get_user_model().objects.filter(email__in=emails).values_list("email", "id")
+    )
+    return user_ids, [email for email in emails if email not in user_ids]
+
+
+def change_enrollments(course_id, user_ids, enroll=True, batch_size=None):
+    """
+    Enroll (or unenroll) many students in a course.
+
+    The course row is locked first, so that the students already enrolled
+    can be read before inserting the others with `bulk_create`; the
+    enrollments are removed with a single DELETE. `student_count` is moved
+    by the number of inserted or deleted rows in the same transaction.
+
+    `m2m_changed` is not sent, so the cached course responses and profiles
+    are invalidated here.
+
+    Args:
+        course_id (int): The ID of the course.
+        user_ids (Iterable[int]): The IDs of the students.
+        enroll (bool, optional): False to unenroll the students.
+        batch_size (int, optional): The number of rows per INSERT.
+
+    Returns:
+        tuple: The number of changed enrollments and the new `student_count`.
+    """
+
+    user_ids = list(user_ids)
+    batch_size = batch_size or settings.COURSE_ENROLL_BATCH_SIZE
+    Enrollment = Course.students.through
+    courses = Course.objects.filter(pk=course_id)
+
+    with transaction.atomic():
+        before = (
+            courses.select_for_update().values_list("student_count", flat=True).get()
+        )
+        enrollments = Enrollment.objects.filter(
+            course_id=course_id, user_id__in=user_ids
+        )
+        if enroll:
+            enrolled = set(enrollments.values_list("user_id", flat=True))
+            created = Enrollment.objects.bulk_create(
+                [
+                    Enrollment(course_id=course_id, user_id=pk)
+                    for pk in dict.fromkeys(user_ids)
+                    if pk not in enrolled
+                ],
+                batch_size=batch_size,
+            )
+            changed = len(created)
+        else:
+            changed, _ = enrollments.delete()
+
+        if changed:
+            Course.objects.add_students([course_id], changed if enroll else -changed)
+            invalidate_courses([course_id], "courses")
+
+    invalidate_profiles(user_ids)
+    return changed, before + changed if enroll else before - changed
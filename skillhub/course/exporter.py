@@ -0,0 +1,57 @@
+import json
+
+from core.query_plans import plan_queryset
+from course.models import Course
+from course.serializers import CourseExportSerializer
+from django.conf import settings
+from django.utils.text import compress_sequence
+from rest_framework.utils.encoders import JSONEncoder
+
+
+def export_queryset(course_ids=None, after=None):
+    """
+    Return the courses to export, in ID order, with their whole tree prefetched.
+
+    Args:
+        course_ids (list, optional): Limit the export to these courses.
+        after (int, optional): The checkpoint: only export courses with a
+            greater ID, e.g. the last ID of an interrupted export.
+
+    Returns:
+        QuerySet: The planned queryset.
+    """
+
+    queryset = Course.objects.order_by("pk")
+    if course_ids is not None:
+        queryset = queryset.filter(pk__in=course_ids)
+    if after is not None:
+        queryset = queryset.filter(pk__gt=after)
+    return plan_queryset(queryset, CourseExportSerializer())
+
+
+def iter_export(queryset, chunk_size=None, compress=False):
+    """
+    Yield the courses of a queryset as NDJSON lines, one course tree per line.
+
+    The courses are read with a server-side cursor, `chunk_size` at a time,
+    and the prefetches run once per chunk, so memory does not grow with the
+    size of the catalogue.
+
+    Args:
+        queryset (QuerySet): The courses, see `export_queryset`.
+        chunk_size (int, optional): The number of courses per chunk.
+        compress (bool, optional): Yield a gzip stream instead.
+
+    Yields:
+        bytes: The encoded lines (or gzip chunks).
+    """
+
+    chunk_size = chunk_size or settings.COURSE_EXPORT_CHUNK_SIZE
+    lines = (
+        json.dumps(
+            CourseExportSerializer(course).data, cls=JSONEncoder, ensure_ascii=False
+        ).encode()
+        + b"\n"
+        for course in queryset.iterator(chunk_size=chunk_size)
+    )
+    return compress_sequence(lines) if compress else lines
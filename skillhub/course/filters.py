@@ -0,0 +1,90 @@
+from course.serializers import CourseFilterParamsSerializer
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend, OrderingFilter
+
+# Lookup used by each parameter of `CourseFilterParamsSerializer`. Every
+# filter is the first column of an index of `Course.Meta.indexes`.
+FILTER_LOOKUPS = {
+    "category": "category_id",
+    "level": "level",
+    "author": "author_id",
+    "min_rating": "rating_avg__gte",
+    "created_after": "created_at__gte",
+    "created_before": "created_at__lte",
+}
+
+# Field the list must be ordered by (either way) with each range filter: the
+# range is only an index range of the index leading with that field. Any
+# ordering can be combined with the equality filters.
+RANGE_FILTER_ORDERINGS = {
+    "min_rating": "rating_avg",
+    "created_after": "created_at",
+    "created_before": "created_at",
+}
+
+# OpenAPI schema of each parameter, for the API documentation.
+PARAMETER_SCHEMAS = {
+    "category": {"type": "integer"},
+    "level": {"type": "string"},
+    "author": {"type": "integer"},
+    "min_rating": {"type": "number"},
+    "created_after": {"type": "string", "format": "date-time"},
+    "created_before": {"type": "string", "format": "date-time"},
+}
+
+
+def filter_courses(queryset, params):
+    """
+    Filter courses by the validated parameters of `CourseFilterParamsSerializer`.
+    """
+
+    return queryset.filter(
+        **{FILTER_LOOKUPS[name]: value for name, value in params.items()}
+    )
+
+
+def get_unsupported_filters(params, ordering):
+    """
+    Return the range filters that no index serves with an ordering.
+
+    Args:
+        params (dict): The validated filter parameters.
+        ordering (Sequence[str]): The ordering of the list, e.g.
+            `["-rating_avg", "-id"]`.
+
+    Returns:
+        dict: The error message of each unsupported filter.
+    """
+
+    field = ordering[0].lstrip("-") if ordering else None
+    return {
+        name: f"Only supported when ordering by {required}."
+        for name, required in RANGE_FILTER_ORDERINGS.items()
+        if name in params and required != field
+    }
+
+
+class CourseFilterBackend(BaseFilterBackend):
+    """
+    Filter backend for the course list: `?category=`, `?level=`, `?author=`,
+    `?min_rating=`, `?created_after=` and `?created_before=`.
+
+    Invalid values are rejected with a 400 instead of being ignored, and so
+    are the range filters combined with another ordering than their own (see
+    `RANGE_FILTER_ORDERINGS`), which no index serves.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        params = CourseFilterParamsSerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        ordering = OrderingFilter().get_ordering(request, queryset, view)
+        errors = get_unsupported_filters(params.validated_data, ordering)
+        if errors:
+            raise ValidationError(errors)
+        return filter_courses(queryset, params.validated_data)
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {"name": name, "required": False, "in": "query", "schema": schema}
+            for name, schema in PARAMETER_SCHEMAS.items()
+        ]
@@ -0,0 +1,177 @@
+import uuid
+
+from course.models import Question, QuizAttempt, QuizResponse
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+KEY_PREFIX = "quiz-answer-key"
+
+
+def _version_key(quiz_id):
+    return f"{KEY_PREFIX}:{quiz_id}:version"
+
+
+def get_answer_key_version(quiz_id):
+    """
+    Return the current version of the answer key of a quiz, creating it if missing.
+    """
+
+    key = _version_key(quiz_id)
+    version = cache.get(key)
+    if version is None:
+        # Another process may create the same version at the same time.
+        cache.add(key, uuid.uuid4().hex, None)
+        version = cache.get(key)
+    return version
+
+
+def answer_key_cache_key(quiz_id, version):
+    """
+    Return the cache key of a version of the answer key of a quiz.
+    """
+
+    return f"{KEY_PREFIX}:{quiz_id}:{version}"
+
+
+def build_answer_key(quiz_id):
+    """
+    Build the answer key of a quiz with one query.
+
+    Returns:
+        dict: For each question ID, a pair of frozensets: the IDs of its
+        correct answers and the IDs of all its answers.
+    """
+
+    rows = Question.objects.filter(quiz_id=quiz_id).values_list(
+        "id", "options__id", "options__is_correct"
+    )
+    options = {}
+    correct = {}
+    for question_id, answer_id, is_correct in rows:
+        options.setdefault(question_id, set())
+        correct.setdefault(question_id, set())
+        if answer_id is not None:
+            options[question_id].add(answer_id)
+            if is_correct:
+                correct[question_id].add(answer_id)
+    return {
+        question_id: (frozenset(correct[question_id]), frozenset(answer_ids))
+        for question_id, answer_ids in options.items()
+    }
+
+
+def get_answer_key(quiz_id):
+    """
+    Return the answer key of a quiz, building and caching it on a miss.
+
+    The key is cached under the version of the quiz's answer key read before
+    building it. `invalidate_answer_keys` gives the quiz a new version
+    whenever a question or an answer changes, so a key built while a change
+    was being committed is stored under a version no one reads any more.
+    Grading a submission normally costs no query at all.
+    """
+
+    key = answer_key_cache_key(quiz_id, get_answer_key_version(quiz_id))
+    answer_key = cache.get(key)
+    if answer_key is None:
+        answer_key = build_answer_key(quiz_id)
+        cache.add(key, answer_key, settings.QUIZ_ANSWER_KEY_TIMEOUT)
+    return answer_key
+
+
+def invalidate_answer_keys(quiz_ids):
+    """
+    Give the answer keys of the given quizzes a new version once the
+    transaction commits, so their cached keys are never read again.
+    """
+
+    keys = [_version_key(quiz_id) for quiz_id in set(quiz_ids) if quiz_id]
+    if keys:
+        transaction.on_commit(
+            lambda: cache.set_many({key: uuid.uuid4().hex for key in keys}, None)
+        )
+
+
+def grade(answer_key, responses):
+    """
+    Grade the responses of an attempt against an answer key.
+
+    A question is answered correctly when exactly its correct answers are
+    selected; an unanswered question, or one without any correct answer,
+    counts as wrong.
+
+    Args:
+        answer_key (dict): The answer key returned by `get_answer_key`.
+        responses (dict): The selected answer IDs of each question ID.
+
+    Returns:
+        dict: Whether each question of the answer key was answered correctly.
+    """
+
+    return {
+        question_id: bool(correct)
+        and responses.get(question_id, frozenset()) == correct
+        for question_id, (correct, _) in answer_key.items()
+    }
+
+
+def validate_responses(answer_key, responses):
+    """
+    Return the errors of responses that do not match the answer key.
+
+    Args:
+        answer_key (dict): The answer key returned by `get_answer_key`.
+        responses (dict): The selected answer IDs of each question ID.
+
+    Returns:
+        list: The error messages, empty if the responses are valid.
+    """
+
+    errors = []
+    for question_id, answer_ids in responses.items():
+        if question_id not in answer_key:
+            errors.append(f"Question {question_id} does not belong to this quiz.")
+        elif not answer_ids <= answer_key[question_id][1]:
+            errors.append(f"Invalid answers for question {question_id}.")
+    return errors
+
+
+def create_attempt(quiz_id, user, responses, answer_key=None):
+    """
+    Grade the responses and store them as a new attempt of the quiz.
+
+    Args:
+        quiz_id (int): The ID of the submitted quiz.
+        user (User): The user submitting the quiz.
+        responses (dict): The selected answer IDs of each question ID, already
+            checked with `validate_responses`.
+        answer_key (dict, optional): The quiz's answer key, if already loaded.
+
+    Returns:
+        QuizAttempt: The attempt, with the grading results in `results`.
+    """
+
+    if answer_key is None:
+        answer_key = get_answer_key(quiz_id)
+    results = grade(answer_key, responses)
+
+    with transaction.atomic():
+        attempt = QuizAttempt.objects.create(
+            quiz_id=quiz_id,
+            user=user,
+            score=sum(results.values()),
+            total=len(answer_key),
+        )
+        QuizResponse.objects.bulk_create(
+            QuizResponse(
+                attempt=attempt,
+                question_id=question_id,
+                answer_id=answer_id,
+                is_correct=results[question_id],
+            )
+            for question_id, answer_ids in responses.items()
+            for answer_id in answer_ids
+        )
+    attempt.results = results
+    return attempt
@@ -0,0 +1,198 @@
+from collections import Counter
+
+from core.cache import invalidate_tags
+from course.models import Answer, Category, Course, Lesson, Module, Question, Quiz
+from course.serializers import CourseTreeSerializer
+from django.conf import settings
+from django.db import transaction
+
+
+class CourseTreeImporter:
+    """
+    Import whole course trees (see `CourseTreeSerializer`) for an author.
+
+    The trees are consumed one by one, so they can come from a streaming
+    parser. Each tree is validated on its own and the valid ones are written
+    in batches of `batch_size` trees: one `bulk_create` per level (courses,
+    modules, lessons, quizzes, questions, answers) and batch. Everything runs
+    in one transaction, which is rolled back if any tree is invalid; after
+    the first error the remaining trees are only validated, so every error
+    of the input is reported at once.
+
+    Usage:
+        result = CourseTreeImporter(user).run(trees)
+        if result.errors:
+            ...
+    """
+
+    def __init__(self, author, batch_size=None):
+        self.author = author
+        self.batch_size = batch_size or settings.COURSE_IMPORT_BATCH_SIZE
+
+    def run(self, trees):
+        """
+        Validate and write the course trees.
+
+        Args:
+            trees (Iterable[dict]): The course trees.
+
+        Returns:
+            ImportResult: The created objects counts and IDs, or the errors.
+        """
+
+        result = ImportResult()
+        with transaction.atomic():
+            batch = []
+            for index, tree in enumerate(trees):
+                serializer = CourseTreeSerializer(data=tree)
+                if not serializer.is_valid():
+                    result.errors.append({"index": index, "errors": serializer.errors})
+                    continue
+                batch.append((index, serializer.validated_data))
+                if len(batch) >= self.batch_size:
+                    self._write(batch, result)
+                    batch = []
+            self._write(batch, result)
+
+            if result.errors:
+                transaction.set_rollback(True)
+                result.counts.clear()
+                result.course_ids.clear()
+            else:
+                invalidate_tags(["courses", "modules", "lessons"])
+        return result
+
+    def _write(self, batch, result):
+        category_ids = {data["category_id"] for _, data in batch}
+        existing = set(
+            Category.objects.filter(pk__in=category_ids).values_list("pk", flat=True)
+        )
+        valid = []
+        for index, data in batch:
+            if data["category_id"] in existing:
+                valid.append((index, data))
+            else:
+                result.errors.append(
+                    {
+                        "index": index,
+                        "errors": {"category": ["Category does not exist."]},
+                    }
+                )
+        if result.errors or not valid:
+            return
+
+        courses = self._create(
+            "courses",
+            Course,
+            [(None, [data for _, data in valid])],
+            lambda parent, position, data: Course(
+                author=self.author,
+                title=data["title"],
+                description=data["description"],
+                category_id=data["category_id"],
+                level=data["level"],
+            ),
+            result,
+        )
+        result.course_ids.extend(course.pk for course, _ in courses)
+
+        modules = self._create(
+            "modules",
+            Module,
+            [(course, data["modules"]) for course, data in courses],
+            lambda course, position, data: Module(
+                course=course,
+                order=position,
+                title=data["title"],
+                description=data["description"],
+            ),
+            result,
+        )
+        # Number the lessons of each new course for its progress bitmaps.
+        slots = Counter()
+
+        def build_lesson(module, position, data):
+            slots[module.course_id] += 1
+            return Lesson(
+                module=module,
+                order=position,
+                progress_slot=slots[module.course_id],
+                title=data["title"],
+                content=data["content"],
+                video_url=data["video_url"],
+            )
+
+        lessons = self._create(
+            "lessons",
+            Lesson,
+            [(module, data["lessons"]) for module, data in modules],
+            build_lesson,
+            result,
+        )
+        quizzes = self._create(
+            "quizzes",
+            Quiz,
+            [(lesson, [data["quiz"]]) for lesson, data in lessons if data["quiz"]],
+            lambda lesson, position, data: Quiz(lesson=lesson, title=data["title"]),
+            result,
+        )
+        questions = self._create(
+            "questions",
+            Question,
+            [(quiz, data["questions"]) for quiz, data in quizzes],
+            lambda quiz, position, data: Question(
+                quiz=quiz, question_text=data["question_text"]
+            ),
+            result,
+        )
+        self._create(
+            "answers",
+            Answer,
+            [(question, data["options"]) for question, data in questions],
+            lambda question, position, data: Answer(
+                question=question,
+                option_text=data["option_text"],
+                is_correct=data["is_correct"],
+            ),
+            result,
+        )
+
+    def _create(self, name, model, children, build, result):
+        """
+        Build and bulk create one level of the trees.
+
+        Args:
+            name (str): The name of the level in `result.counts`.
+            model (Model): The model of the level.
+            children (list): `(parent, [child data, ...])` pairs.
+            build (callable): Builds an object from its parent, its 1-based
+                position under the parent and its data.
+            result (ImportResult): The result to count the objects in.
+
+        Returns:
+            list: `(object, data)` pairs, used to build the next level.
+        """
+
+        pairs = [
+            (build(parent, position, data), data)
+            for parent, items in children
+            for position, data in enumerate(items, 1)
+        ]
+        model.objects.bulk_create([obj for obj, _ in pairs])
+        result.counts[name] += len(pairs)
+        return pairs
+
+
+class ImportResult:
+    """
+    The outcome of a course import.
+
+    - `counts`: The number of created objects per model.
+    - `course_ids`: The IDs of the created courses.
+    - `errors`: `{"index": ..., "errors": ...}` for every invalid tree.
+    """
+
+    def __init__(self):
+        self.counts = Counter()
+        self.course_ids = []
+        self.errors = []
@@ -0,0 +1,45 @@
+import sys
+
+from course.exporter import export_queryset, iter_export
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    """
+    Export course trees (with quizzes and reviews) as NDJSON.
+
+    Usage:
+        python manage.py export_courses [--course ID ...] [--after ID]
+            [--gzip] [--output PATH]
+
+    An interrupted export is resumed with `--after` and the `id` of the last
+    exported line.
+    """
+
+    help = "Stream course trees as NDJSON, one course per line."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--course",
+            dest="course_ids",
+            type=int,
+            nargs="+",
+            help="Only export the given course IDs.",
+        )
+        parser.add_argument(
+            "--after", type=int, help="Only export courses with a greater ID."
+        )
+        parser.add_argument("--gzip", action="store_true", help="Compress the output.")
+        parser.add_argument("--output", help="The file to write (default: stdout).")
+
+    def handle(self, *args, **options):
+        queryset = export_queryset(options["course_ids"], after=options["after"])
+        chunks = iter_export(queryset, compress=options["gzip"])
+
+        if options["output"]:
+            with open(options["output"], "wb") as output:
+                output.writelines(chunks)
+            self.stderr.write(self.style.SUCCESS(f"Exported to {options['output']}"))
+        else:
+            sys.stdout.buffer.writelines(chunks)
+            sys.stdout.buffer.flush()
@@ -0,0 +1,60 @@
+import json
+
+from core.parsers import iter_ndjson
+from course.importer import CourseTreeImporter
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.exceptions import ParseError
+
+
+class Command(BaseCommand):
+    """
+    Import course trees from a JSON or NDJSON file.
+
+    Usage:
+        python manage.py import_courses PATH --author EMAIL [--format ndjson]
+
+    The format defaults to NDJSON for `.ndjson`/`.jsonl` files and to JSON
+    otherwise. NDJSON files are read one line at a time.
+    """
+
+    help = "Import whole course trees (modules, lessons, quizzes) in one transaction."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="The JSON or NDJSON file to import.")
+        parser.add_argument(
+            "--author", required=True, help="The email of the courses' author."
+        )
+        parser.add_argument("--format", choices=["json", "ndjson"])
+
+    def handle(self, *args, **options):
+        try:
+            author = get_user_model().objects.get(email=options["author"])
+        except get_user_model().DoesNotExist:
+            raise CommandError(f"User {options['author']} does not exist")
+
+        path = options["path"]
+        file_format = options["format"] or (
+            "ndjson" if path.endswith((".ndjson", ".jsonl")) else "json"
+        )
+
+        with open(path, "rb") as file:
+            try:
+                if file_format == "ndjson":
+                    trees = iter_ndjson(file)
+                else:
+                    trees = json.load(file)
+                    if isinstance(trees, dict):
+                        trees = [trees]
+                result = CourseTreeImporter(author).run(trees)
+            except (ParseError, ValueError) as e:
+                raise CommandError(f"Invalid {file_format} file: {e}")
+
+        if result.errors:
+            self.stderr.write(json.dumps(result.errors, indent=2))
+            raise CommandError(
+                f"{len(result.errors)} invalid courses, nothing imported"
+            )
+
+        created = ", ".join(f"{count} {name}" for name, count in result.counts.items())
+        self.stdout.write(self.style.SUCCESS(f"Imported {created or 'nothing'}"))
@@ -0,0 +1,26 @@
+from course.models import Course
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    """
+    Recompute the denormalized rating summary of courses from their reviews.
+
+    Usage:
+        python manage.py rebuild_course_ratings [--course ID ...]
+    """
+
+    help = "Rebuild the rating summary (count, sum, histogram, average) of courses."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--course",
+            dest="course_ids",
+            type=int,
+            nargs="+",
+            help="Only rebuild the given course IDs.",
+        )
+
+    def handle(self, *args, **options):
+        updated = Course.objects.rebuild_ratings(options["course_ids"])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt ratings for {updated} courses"))
@@ -0,0 +1,85 @@
+# Generated by Django 5.2.3 on 2026-10-18 19:25
+
+from django.db import migrations, models
+from django.db.models import Avg, Count, Q, Sum
+
+
+def backfill_rating_summary(apps, schema_editor):
+    Course = apps.get_model("course", "Course")
+    Review = apps.get_model("review", "Review")
+
+    summaries = (
+        Review.objects.order_by()
+        .values("course")
+        .annotate(
+            count=Count("id"),
+            total=Sum("rating"),
+            avg=Avg("rating"),
+            **{
+                f"rating_{rating}": Count("id", filter=Q(rating=rating))
+                for rating in range(1, 6)
+            },
+        )
+    )
+    for summary in summaries.iterator():
+        Course.objects.filter(pk=summary["course"]).update(
+            rating_count=summary["count"],
+            rating_sum=summary["total"],
+            rating_avg=summary["avg"],
+            **{
+                f"rating_{rating}": summary[f"rating_{rating}"]
+                for rating in range(1, 6)
+            },
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("course", "0002_question_answer_quiz_question_quiz"),
+        ("review", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="course",
+            name="rating_1",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="course",
+            name="rating_2",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="course",
+            name="rating_3",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="course",
+            name="rating_4",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="course",
+            name="rating_5",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="course",
+            name="rating_avg",
+            field=models.FloatField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="course",
+            name="rating_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="course",
+            name="rating_sum",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_rating_summary, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.3 on 2026-10-18 19:28
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("course", "0003_course_rating_summary"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="course",
+            index=models.Index(
+                fields=["-created_at", "-id"], name="course_created_id_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="lesson",
+            index=models.Index(fields=["order", "id"], name="lesson_order_id_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="module",
+            index=models.Index(fields=["order", "id"], name="module_order_id_idx"),
+        ),
+    ]
@@ -0,0 +1,60 @@
+# Generated by Django 5.2.3 on 2026-10-18 19:56
+
+import django.db.models.constraints
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def renumber(model, parent_field):
+    """
+    Give the children of every parent with duplicate positions the positions
+    1..n, keeping their current order.
+    """
+
+    parents = (
+        model.objects.order_by()
+        .values(parent_field, "order")
+        .annotate(count=Count("id"))
+        .filter(count__gt=1)
+        .values_list(parent_field, flat=True)
+        .distinct()
+    )
+    for parent_id in list(parents):
+        children = list(
+            model.objects.filter(**{parent_field: parent_id}).order_by("order", "id")
+        )
+        for position, child in enumerate(children, 1):
+            child.order = position
+        model.objects.bulk_update(children, ["order"])
+
+
+def renumber_duplicate_orders(apps, schema_editor):
+    renumber(apps.get_model("course", "Module"), "course")
+    renumber(apps.get_model("course", "Lesson"), "module")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("course", "0004_course_course_created_id_idx_and_more"),
+    ]
+
+    operations = [
+        migrations.RunPython(renumber_duplicate_orders, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="lesson",
+            constraint=models.UniqueConstraint(
+                deferrable=django.db.models.constraints.Deferrable["IMMEDIATE"],
+                fields=("module", "order"),
+                name="lesson_module_order_uniq",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="module",
+            constraint=models.UniqueConstraint(
+                deferrable=django.db.models.constraints.Deferrable["IMMEDIATE"],
+                fields=("course", "order"),
+                name="module_course_order_uniq",
+            ),
+        ),
+    ]
@@ -0,0 +1,81 @@
+# Generated by Django 5.2.3 on 2026-10-18 20:17
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def allocate_progress_slots(apps, schema_editor):
+    """
+    Give the lessons of every course the progress slots 1..n.
+    """
+
+    Lesson = apps.get_model("course", "Lesson")
+    lessons = list(
+        Lesson.objects.select_related("module").order_by(
+            "module__course", "module__order", "order", "id"
+        )
+    )
+    slots = {}
+    for lesson in lessons:
+        course_id = lesson.module.course_id
+        slots[course_id] = lesson.progress_slot = slots.get(course_id, 0) + 1
+    Lesson.objects.bulk_update(lessons, ["progress_slot"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("course", "0006_quiz_attempt"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="lesson",
+            name="progress_slot",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(allocate_progress_slots, migrations.RunPython.noop),
+        migrations.CreateModel(
+            name="CourseProgress",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("completed", models.BinaryField(default=bytes)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "course",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="progress",
+                        to="course.course",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="course_progress",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Course Progress",
+                "verbose_name_plural": "Course Progress",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("course", "user"), name="progress_course_user_uniq"
+                    )
+                ],
+            },
+        ),
+    ]
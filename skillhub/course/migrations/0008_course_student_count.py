@@ -0,0 +1,41 @@
+# Generated by Django 5.2.3 on 2026-10-18 20:26
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_students(apps, schema_editor):
+    Course = apps.get_model("course", "Course")
+    students = (
+        Course.students.through.objects.filter(course=OuterRef("pk"))
+        .order_by()
+        .values("course")
+        .annotate(count=Count("id"))
+        .values("count")
+    )
+    Course.objects.update(student_count=Coalesce(Subquery(students), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("course", "0007_course_progress"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="course",
+            name="student_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(count_students, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="course",
+            index=models.Index(
+                fields=["-student_count", "-id"], name="course_students_id_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,75 @@
+# Generated by Django 5.2.3 on 2026-10-18 20:38
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("course", "0009_search_vector"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="course",
+            name="author",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="created_courses",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="course",
+            name="category",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                to="course.category",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="course",
+            index=models.Index(
+                fields=["-rating_avg", "-id"], name="course_rating_id_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="course",
+            index=models.Index(
+                fields=["category", "-created_at", "-id"],
+                name="course_category_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="course",
+            index=models.Index(
+                fields=["category", "-student_count", "-id"],
+                name="course_category_students_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="course",
+            index=models.Index(
+                fields=["category", "-rating_avg", "-id"],
+                name="course_category_rating_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="course",
+            index=models.Index(
+                fields=["level", "-created_at", "-id"], name="course_level_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="course",
+            index=models.Index(
+                fields=["author", "-created_at", "-id"],
+                name="course_author_created_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.3 on 2026-10-18 22:09
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("course", "0010_course_filter_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="course",
+            index=models.Index(
+                fields=["level", "-student_count", "-id"],
+                name="course_level_students_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="course",
+            index=models.Index(
+                fields=["level", "-rating_avg", "-id"], name="course_level_rating_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="course",
+            index=models.Index(
+                fields=["author", "-student_count", "-id"],
+                name="course_author_students_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="course",
+            index=models.Index(
+                fields=["author", "-rating_avg", "-id"], name="course_author_rating_idx"
+            ),
+        ),
+    ]
@@ -1,5 +1,34 @@
+from course.ordering import next_order
+from django.apps import apps
 from django.conf import settings
-from django.db import models
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
+from django.db import models, transaction
+from django.db.models import (
+    Avg,
+    Count,
+    Deferrable,
+    F,
+    FloatField,
+    OuterRef,
+    Subquery,
+    Sum,
+    Value,
+)
+from django.db.models.functions import Cast, Coalesce, Now, NullIf
+
+# The text search configuration of the `search_vector` columns.
+SEARCH_CONFIG = "english"
+
+
+def search_vector(title, text):
+    """
+    Return the weighted search vector expression of a title and a text field.
+    """
+
+    return SearchVector(title, weight="A", config=SEARCH_CONFIG) + SearchVector(
+        text, weight="B", config=SEARCH_CONFIG
+    )
 
 
 class Category(models.Model):
@@ -21,6 +50,165 @@ class Category(models.Model):
         return self.name
 
 
+class CourseManager(models.Manager):
+    """
+    Custom manager for the Course model with methods for maintaining the
+    denormalized rating summary and the `updated_at` timestamp.
+
+    `search_vector` is deferred: it is only read by search queries.
+    """
+
+    def get_queryset(self):
+        return super().get_queryset().defer("search_vector")
+
+    def touch(self, course_ids):
+        """
+        Set `updated_at` of the given courses to now in one UPDATE.
+
+        Used when content rendered inside a course changes, so validators
+        computed from `updated_at` (see `core.conditional`) change with it.
+
+        Args:
+            course_ids (Iterable[int]): The IDs of the changed courses.
+
+        Returns:
+            int: The number of updated courses.
+        """
+        return self.filter(pk__in=list(course_ids)).update(updated_at=Now())
+
+    def lock(self, course_ids):
+        """
+        Lock the given courses with `SELECT ... FOR UPDATE`, in ID order.
+
+        Must be called inside a transaction. Locking in a fixed order keeps two
+        transactions locking overlapping courses from deadlocking.
+
+        Args:
+            course_ids (Iterable[int]): The IDs of the courses.
+        """
+        list(
+            self.select_for_update()
+            .filter(pk__in=list(course_ids))
+            .order_by("pk")
+            .values_list("pk", flat=True)
+        )
+
+    def add_students(self, course_ids, delta):
+        """
+        Add `delta` (negative to remove) to `student_count` of the given
+        courses in one UPDATE, and bump their `updated_at`.
+
+        Called in the transaction of an enrollment change, with the courses
+        locked and `delta` the number of enrollments it really changed, so
+        the counter never needs a recount of the enrollments.
+
+        Args:
+            course_ids (Iterable[int]): The IDs of the courses.
+            delta (int): The change of each course's number of students.
+
+        Returns:
+            int: The number of updated courses.
+        """
+        return self.filter(pk__in=list(course_ids)).update(
+            updated_at=Now(), student_count=F("student_count") + delta
+        )
+
+    def refresh_student_counts(self, course_ids):
+        """
+        Recount `student_count` of the given courses from the enrollments.
+
+        Only for backfills and repairs: the enrollment changes keep the
+        counters up to date with `add_students`. The courses are locked
+        first, so the count is read by a statement started after every
+        concurrent enrollment change of the courses has committed.
+        `updated_at` is bumped, as `student_count` is rendered with the course.
+
+        Args:
+            course_ids (Iterable[int]): The IDs of the courses.
+
+        Returns:
+            int: The number of updated courses.
+        """
+        course_ids = sorted(set(course_ids))
+        if not course_ids:
+            return 0
+
+        students = (
+            self.model.students.through.objects.filter(course=OuterRef("pk"))
+            .order_by()
+            .values("course")
+            .annotate(count=Count("id"))
+            .values("count")
+        )
+        with transaction.atomic():
+            self.lock(course_ids)
+            return self.filter(pk__in=course_ids).update(
+                updated_at=Now(), student_count=Coalesce(Subquery(students), 0)
+            )
+
+    def apply_rating(self, course_id, rating, delta=1):
+        """
+        Add (`delta=1`) or remove (`delta=-1`) a single review rating from the
+        course's rating summary in one atomic UPDATE.
+
+        Args:
+            course_id (int): The ID of the reviewed course.
+            rating (int): The rating of the review (1-5).
+            delta (int, optional): 1 to add the rating, -1 to remove it.
+
+        Returns:
+            int: The number of updated courses.
+        """
+        count = F("rating_count") + delta
+        total = F("rating_sum") + rating * delta
+        return self.filter(pk=course_id).update(
+            updated_at=Now(),
+            rating_count=count,
+            rating_sum=total,
+            rating_avg=Coalesce(
+                Cast(total, FloatField()) / NullIf(count, 0), Value(0.0)
+            ),
+            **{f"rating_{rating}": F(f"rating_{rating}") + delta},
+        )
+
+    def rebuild_ratings(self, course_ids=None):
+        """
+        Recompute the rating summary from the reviews table in one UPDATE.
+
+        Args:
+            course_ids (list, optional): Limit the rebuild to these courses.
+
+        Returns:
+            int: The number of updated courses.
+        """
+        Review = apps.get_model("review", "Review")
+
+        def aggregate(expression, default=Value(0), **filters):
+            reviews = (
+                Review.objects.filter(course=OuterRef("pk"), **filters)
+                .order_by()
+                .values("course")
+                .annotate(value=expression)
+                .values("value")
+            )
+            return Coalesce(Subquery(reviews), default)
+
+        queryset = self.all()
+        if course_ids is not None:
+            queryset = queryset.filter(pk__in=course_ids)
+
+        return queryset.update(
+            updated_at=Now(),
+            rating_count=aggregate(Count("id")),
+            rating_sum=aggregate(Sum("rating")),
+            rating_avg=aggregate(Avg("rating"), default=Value(0.0)),
+            **{
+                f"rating_{rating}": aggregate(Count("id"), rating=rating)
+                for rating in range(1, 6)
+            },
+        )
+
+
 class Course(models.Model):
     """
     Course model for skillhub.
@@ -32,6 +220,19 @@ class Course(models.Model):
     - `level`: The level of the course (beginner, intermediate, advanced).
     - `students`: The list of students enrolled in the course.
     - `created_at`: The date when the course was created.
+    - `rating_count`: The number of reviews of the course.
+    - `rating_sum`: The sum of all review ratings of the course.
+    - `rating_avg`: The average review rating of the course.
+    - `rating_1` ... `rating_5`: The number of reviews per rating.
+    - `student_count`: The number of enrolled students.
+    - `search_vector`: The full-text search vector of the title (weight A)
+      and the description (weight B), generated by the database.
+
+    The rating fields are maintained by `Course.objects.apply_rating` on every
+    review write and can be rebuilt with `manage.py rebuild_course_ratings`.
+    `student_count` is moved by `Course.objects.add_students` in the
+    transaction of every enrollment change, and can be recounted with
+    `Course.objects.refresh_student_counts`.
     """
 
     LEVEL_CHOICES = [
@@ -40,15 +241,18 @@ class Course(models.Model):
         ("advanced", "Advanced"),
     ]
 
+    # Indexed as the first column of `course_author_created_idx`.
     author = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
         related_name="created_courses",
+        db_index=False,
     )
 
     title = models.CharField(max_length=255)
     description = models.TextField(blank=True)
-    category = models.ForeignKey(Category, on_delete=models.CASCADE)
+    # Indexed as the first column of the `course_category_*_idx` indexes.
+    category = models.ForeignKey(Category, on_delete=models.CASCADE, db_index=False)
     level = models.CharField(max_length=20, choices=LEVEL_CHOICES)
     students = models.ManyToManyField(
         settings.AUTH_USER_MODEL,
@@ -59,14 +263,112 @@ class Course(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    rating_count = models.PositiveIntegerField(default=0, editable=False)
+    rating_sum = models.PositiveIntegerField(default=0, editable=False)
+    rating_avg = models.FloatField(default=0, editable=False)
+    rating_1 = models.PositiveIntegerField(default=0, editable=False)
+    rating_2 = models.PositiveIntegerField(default=0, editable=False)
+    rating_3 = models.PositiveIntegerField(default=0, editable=False)
+    rating_4 = models.PositiveIntegerField(default=0, editable=False)
+    rating_5 = models.PositiveIntegerField(default=0, editable=False)
+    student_count = models.PositiveIntegerField(default=0, editable=False)
+
+    search_vector = models.GeneratedField(
+        expression=search_vector("title", "description"),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
+
+    objects = CourseManager()
+
+    RATING_FIELDS = (
+        "rating_count",
+        "rating_sum",
+        "rating_avg",
+        "rating_1",
+        "rating_2",
+        "rating_3",
+        "rating_4",
+        "rating_5",
+    )
+    # Fields only changed through `Course.objects` updates.
+    COUNTER_FIELDS = RATING_FIELDS + ("student_count",)
+
     class Meta:
         ordering = ["-created_at"]
         verbose_name = "Course"
         verbose_name_plural = "Courses"
+        # One index per supported filter and ordering of the catalogue (see
+        # `course.filters`), so every page is an index range scan.
+        indexes = [
+            models.Index(fields=["-created_at", "-id"], name="course_created_id_idx"),
+            models.Index(
+                fields=["-student_count", "-id"], name="course_students_id_idx"
+            ),
+            models.Index(fields=["-rating_avg", "-id"], name="course_rating_id_idx"),
+            models.Index(
+                fields=["category", "-created_at", "-id"],
+                name="course_category_created_idx",
+            ),
+            models.Index(
+                fields=["category", "-student_count", "-id"],
+                name="course_category_students_idx",
+            ),
+            models.Index(
+                fields=["category", "-rating_avg", "-id"],
+                name="course_category_rating_idx",
+            ),
+            models.Index(
+                fields=["level", "-created_at", "-id"], name="course_level_created_idx"
+            ),
+            models.Index(
+                fields=["level", "-student_count", "-id"],
+                name="course_level_students_idx",
+            ),
+            models.Index(
+                fields=["level", "-rating_avg", "-id"], name="course_level_rating_idx"
+            ),
+            models.Index(
+                fields=["author", "-created_at", "-id"],
+                name="course_author_created_idx",
+            ),
+            models.Index(
+                fields=["author", "-student_count", "-id"],
+                name="course_author_students_idx",
+            ),
+            models.Index(
+                fields=["author", "-rating_avg", "-id"],
+                name="course_author_rating_idx",
+            ),
+            GinIndex(fields=["search_vector"], name="course_search_idx"),
+        ]
 
     def __str__(self):
         return self.title
 
+    def save(self, *args, **kwargs):
+        """
+        Override the save method to never write back stale counters.
+
+        The rating summary and `student_count` are only changed through
+        `Course.objects` updates, so saving an existing course leaves them out
+        of the UPDATE.
+        """
+
+        if (
+            not self._state.adding
+            and kwargs.get("update_fields") is None
+            and not kwargs.get("force_insert")
+        ):
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key
+                and not field.generated
+                and field.name not in self.COUNTER_FIELDS
+            ]
+        super().save(*args, **kwargs)
+
 
 class Module(models.Model):
     """
@@ -88,21 +390,46 @@ class Module(models.Model):
         ordering = ["order"]
         verbose_name = "Module"
         verbose_name_plural = "Modules"
+        indexes = [
+            models.Index(fields=["order", "id"], name="module_order_id_idx"),
+        ]
+        constraints = [
+            # Checked at the end of each statement, so a reorder can swap positions.
+            models.UniqueConstraint(
+                fields=["course", "order"],
+                name="module_course_order_uniq",
+                deferrable=Deferrable.IMMEDIATE,
+            ),
+        ]
 
     def __str__(self):
         return f"{self.title} (Course: {self.course.title})"
 
     def save(self, *args, **kwargs):
         """
-        Override the save method to set the order based on the previous module's order.
+        Override the save method to put a new module after the course's last one.
+
+        An update runs in a transaction too: moving the module to another
+        course reallocates the progress slots of its lessons (see
+        `course.signals.move_module_progress`).
         """
 
-        if self._state.adding and self.order == 0:
-            last_order = (
-                Module.objects.filter(course=self.course).order_by("-order").first()
-            )
-            self.order = last_order.order + 1 if last_order else 1
-        super().save(*args, **kwargs)
+        with transaction.atomic():
+            if self._state.adding and self.order == 0:
+                self.order = next_order(
+                    Course.objects.filter(pk=self.course_id), Module.objects, "course"
+                )
+            super().save(*args, **kwargs)
+
+
+class LessonManager(models.Manager):
+    """
+    Manager for the Lesson model that defers `search_vector`, which is only
+    read by search queries.
+    """
+
+    def get_queryset(self):
+        return super().get_queryset().defer("search_vector")
 
 
 class Lesson(models.Model):
@@ -115,6 +442,11 @@ class Lesson(models.Model):
     - `video_url`: The URL of the video for the lesson.
     - `pdf_file`: The PDF file for the lesson.
     - `order`: The order of the lesson in the module.
+    - `progress_slot`: The bit of the lesson in its course's progress bitmaps
+      (see `CourseProgress`). Allocated once per course and never reused
+      while the lesson exists, so reordering lessons keeps progress intact.
+    - `search_vector`: The full-text search vector of the title (weight A)
+      and the content (weight B), generated by the database.
     """
 
     module = models.ForeignKey(Module, on_delete=models.CASCADE, related_name="lessons")
@@ -123,26 +455,58 @@ class Lesson(models.Model):
     video_url = models.URLField(blank=True, null=True)
     pdf_file = models.FileField(upload_to="lesson/pdfs/", blank=True, null=True)
     order = models.PositiveIntegerField(default=0)
+    progress_slot = models.PositiveIntegerField(default=0, editable=False)
+
+    search_vector = models.GeneratedField(
+        expression=search_vector("title", "content"),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
+
+    objects = LessonManager()
 
     class Meta:
         ordering = ["order"]
         verbose_name = "Lesson"
         verbose_name_plural = "Lessons"
+        indexes = [
+            models.Index(fields=["order", "id"], name="lesson_order_id_idx"),
+            GinIndex(fields=["search_vector"], name="lesson_search_idx"),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["module", "order"],
+                name="lesson_module_order_uniq",
+                deferrable=Deferrable.IMMEDIATE,
+            ),
+        ]
 
     def __str__(self):
         return f"{self.title} (Module: {self.module.title}) (Course: {self.module.course.title})"
 
     def save(self, *args, **kwargs):
         """
-        Override the save method to set the order based on the previous lesson's order.
+        Override the save method to put a new lesson after the module's last one
+        and give it the next progress slot of its course.
+
+        An update runs in a transaction too: moving the lesson to another
+        course's module reallocates its progress slot (see
+        `course.signals.move_lesson_progress`).
         """
 
-        if self._state.adding and self.order == 0:
-            last_order = (
-                Lesson.objects.filter(module=self.module).order_by("-order").first()
-            )
-            self.order = last_order.order + 1 if last_order else 1
-        super().save(*args, **kwargs)
+        with transaction.atomic():
+            if self._state.adding and self.order == 0:
+                self.order = next_order(
+                    Module.objects.filter(pk=self.module_id), Lesson.objects, "module"
+                )
+            if self._state.adding and self.progress_slot == 0:
+                self.progress_slot = next_order(
+                    Course.objects.filter(modules=self.module_id),
+                    Lesson.objects,
+                    "module__course",
+                    field="progress_slot",
+                )
+            super().save(*args, **kwargs)
 
 
 class Quiz(models.Model):
@@ -204,3 +568,108 @@ class Answer(models.Model):
 
     def __str__(self):
         return f"{self.option_text[:30]} (Correct: {self.is_correct})"
+
+
+class CourseProgress(models.Model):
+    """
+    The lessons of a course a student has completed.
+
+    - `user`: The student.
+    - `course`: The course.
+    - `completed`: A bitmap with bit `progress_slot` set for every completed
+      lesson: bit `n` is bit `n % 8` (least significant first) of byte
+      `n // 8`, the numbering of PostgreSQL's `get_bit`/`set_bit`.
+    - `updated_at`: The date when the progress last changed.
+
+    One small row per student and course, instead of one row per completed
+    lesson, so the progress of a whole course is read with a single scan.
+    See `course.progress` for reading and writing the bitmaps.
+    """
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="course_progress",
+    )
+    course = models.ForeignKey(
+        Course, on_delete=models.CASCADE, related_name="progress"
+    )
+    completed = models.BinaryField(default=bytes)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Course Progress"
+        verbose_name_plural = "Course Progress"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["course", "user"], name="progress_course_user_uniq"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.user} - {self.course.title}"
+
+
+class QuizAttempt(models.Model):
+    """
+    A user's graded submission of a quiz.
+
+    - `quiz`: The submitted quiz.
+    - `user`: The user who submitted the quiz.
+    - `score`: The number of correctly answered questions.
+    - `total`: The number of questions of the quiz when it was graded.
+    - `created_at`: The date when the quiz was submitted.
+    """
+
+    quiz = models.ForeignKey(Quiz, on_delete=models.CASCADE, related_name="attempts")
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="quiz_attempts",
+    )
+    score = models.PositiveIntegerField(default=0)
+    total = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        verbose_name = "Quiz Attempt"
+        verbose_name_plural = "Quiz Attempts"
+        indexes = [
+            models.Index(
+                fields=["user", "quiz", "-created_at"], name="attempt_user_quiz_idx"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.user} - {self.quiz.title} ({self.score}/{self.total})"
+
+
+class QuizResponse(models.Model):
+    """
+    An answer option selected in a quiz attempt.
+
+    - `attempt`: The attempt the response belongs to.
+    - `question`: The answered question.
+    - `answer`: The selected answer option.
+    - `is_correct`: Whether the question was answered correctly as a whole.
+    """
+
+    attempt = models.ForeignKey(
+        QuizAttempt, on_delete=models.CASCADE, related_name="responses"
+    )
+    question = models.ForeignKey(Question, on_delete=models.CASCADE)
+    answer = models.ForeignKey(Answer, on_delete=models.CASCADE)
+    is_correct = models.BooleanField(default=False)
+
+    class Meta:
+        verbose_name = "Quiz Response"
+        verbose_name_plural = "Quiz Responses"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["attempt", "answer"], name="response_attempt_answer_uniq"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.attempt_id}: {self.answer.option_text[:30]}"
@@ -0,0 +1,69 @@
+from django.db.models import (
+    Case,
+    F,
+    OuterRef,
+    PositiveIntegerField,
+    Subquery,
+    Value,
+    When,
+)
+
+
+def next_order(parent_queryset, children, parent_field, field="order"):
+    """
+    Lock a parent row and return the position after its last child.
+
+    The parent row is locked with `SELECT ... FOR UPDATE` in the same query
+    that reads the last position (a backward scan of the `(parent, order)`
+    unique index), so concurrent inserts under the same parent are
+    serialized and never get the same position. Must be called inside a
+    transaction that also inserts the child.
+
+    Args:
+        parent_queryset (QuerySet): The parent filtered to a single row.
+        children (QuerySet): All objects of the child model.
+        parent_field (str): The lookup from the child to the parent.
+        field (str, optional): The position field of the child.
+
+    Returns:
+        int: The next free position.
+    """
+
+    last = (
+        children.filter(**{parent_field: OuterRef("pk")})
+        .order_by(f"-{field}")
+        .values(field)[:1]
+    )
+    last_order = (
+        parent_queryset.select_for_update()
+        .annotate(last_order=Subquery(last))
+        .values_list("last_order", flat=True)
+        .get()
+    )
+    return (last_order or 0) + 1
+
+
+def reorder(queryset, ids):
+    """
+    Set the positions of a parent's children to the order of `ids` in one UPDATE.
+
+    The `(parent, order)` unique constraints are checked at the end of the
+    statement, so positions can be swapped freely. A child missing from
+    `ids` keeps its position; call it with the parent locked, like
+    `next_order`, so that no child is inserted after `ids` was validated.
+
+    Args:
+        queryset (QuerySet): The children of one parent.
+        ids (list): The IDs of all the children in their new order.
+
+    Returns:
+        int: The number of updated children.
+    """
+
+    return queryset.update(
+        order=Case(
+            *(When(pk=pk, then=Value(i)) for i, pk in enumerate(ids, 1)),
+            default=F("order"),
+            output_field=PositiveIntegerField(),
+        )
+    )
@@ -0,0 +1,183 @@
+from course.models import Course, CourseProgress, Lesson
+from django.db import transaction
+from django.db.models import BinaryField, Count, F, Func, Value
+from django.db.models.functions import Length
+
+
+def to_int(bitmap):
+    """
+    Return a progress bitmap as an int, with bit `n` for the slot `n`.
+    """
+
+    return int.from_bytes(bitmap or b"", "little")
+
+
+def to_bitmap(bits):
+    """
+    Return the bitmap of an int built by `to_int`.
+    """
+
+    return bits.to_bytes((bits.bit_length() + 7) // 8, "little")
+
+
+def get_percent(completed, total):
+    """
+    Return the completion percentage, rounded to one decimal.
+    """
+
+    return round(100 * completed / total, 1) if total else 0
+
+
+def mark_lesson(user, course_id, slot, completed=True):
+    """
+    Mark a lesson as completed (or not completed) by a student.
+
+    The student's progress row is created if needed and locked while its
+    bitmap is rewritten, so concurrent marks never lose each other's bits.
+
+    Args:
+        user (User): The student.
+        course_id (int): The ID of the lesson's course.
+        slot (int): The `progress_slot` of the lesson.
+        completed (bool, optional): Whether the lesson is completed.
+
+    Returns:
+        int: The number of completed lessons of the course.
+    """
+
+    with transaction.atomic():
+        progress, _ = CourseProgress.objects.select_for_update().get_or_create(
+            user=user, course_id=course_id
+        )
+        bits = to_int(progress.completed)
+        marked = bits | 1 << slot if completed else bits & ~(1 << slot)
+        if marked != bits:
+            progress.completed = to_bitmap(marked)
+            progress.save(update_fields=["completed", "updated_at"])
+    return marked.bit_count()
+
+
+def clear_slot(queryset, slot):
+    """
+    Clear the bit of a deleted lesson in every progress row of its course.
+
+    Runs as a single UPDATE with PostgreSQL's `set_bit`, skipping the rows
+    whose bitmap is too short to have the bit set. Slots are allocated after
+    the last existing one, so a new lesson may reuse this slot.
+
+    Args:
+        queryset (QuerySet): The progress rows of the lesson's course.
+        slot (int): The `progress_slot` of the lesson.
+
+    Returns:
+        int: The number of updated rows.
+    """
+
+    return (
+        queryset.alias(size=Length("completed"))
+        .filter(size__gt=slot // 8)
+        .update(
+            completed=Func(
+                F("completed"),
+                Value(slot),
+                Value(0),
+                function="set_bit",
+                output_field=BinaryField(),
+            )
+        )
+    )
+
+
+def get_progress(user, course_ids):
+    """
+    Return a student's progress in the given courses with two queries.
+
+    Args:
+        user (User): The student.
+        course_ids (Iterable[int]): The IDs of the courses.
+
+    Returns:
+        dict: For each course ID, the number of `completed_lessons`, the
+        number of `total_lessons` and the completion `percent`.
+    """
+
+    course_ids = list(course_ids)
+    if not course_ids:
+        return {}
+    totals = dict(
+        Lesson.objects.filter(module__course__in=course_ids)
+        .order_by()
+        .values("module__course")
+        .annotate(total=Count("id"))
+        .values_list("module__course", "total")
+    )
+    completed = dict(
+        CourseProgress.objects.filter(user=user, course__in=course_ids).values_list(
+            "course_id", "completed"
+        )
+    )
+    progress = {}
+    for course_id in course_ids:
+        done = to_int(completed.get(course_id)).bit_count()
+        total = totals.get(course_id, 0)
+        progress[course_id] = {
+            "completed_lessons": done,
+            "total_lessons": total,
+            "percent": get_percent(done, total),
+        }
+    return progress
+
+
+def get_course_report(course, chunk_size=2000):
+    """
+    Return the progress of every student of a course in one scan.
+
+    The progress rows are streamed with a server-side cursor and only their
+    bitmaps are read, so the memory use does not grow with the students.
+
+    Args:
+        course (Course): The course.
+        chunk_size (int, optional): The number of rows per cursor fetch.
+
+    Returns:
+        dict: The number of enrolled `students`, of students who `started`
+        and `finished` the course, their `average_percent`, and the
+        number of students who completed each lesson.
+    """
+
+    lessons = list(
+        Lesson.objects.filter(module__course=course)
+        .order_by("module__order", "order")
+        .values_list("id", "title", "progress_slot")
+    )
+    students = Course.students.through.objects.filter(course=course).count()
+    counts = dict.fromkeys((slot for _, _, slot in lessons), 0)
+
+    started = finished = 0
+    total_done = 0
+    rows = CourseProgress.objects.filter(
+        course=course, user__enrolled_courses=course
+    ).values_list("completed", flat=True)
+    for bitmap in rows.iterator(chunk_size=chunk_size):
+        bits = to_int(bitmap)
+        if not bits:
+            continue
+        started += 1
+        done = bits.bit_count()
+        total_done += done
+        if done == len(lessons):
+            finished += 1
+        for slot in counts:
+            if bits >> slot & 1:
+                counts[slot] += 1
+
+    return {
+        "students": students,
+        "started": started,
+        "finished": finished,
+        "average_percent": get_percent(total_done, len(lessons) * students),
+        "lessons": [
+            {"lesson": lesson_id, "title": title, "completed": counts[slot]}
+            for lesson_id, title, slot in lessons
+        ],
+    }
@@ -0,0 +1,108 @@
+from course.models import SEARCH_CONFIG, Course, Lesson
+from django.contrib.postgres.search import SearchHeadline, SearchQuery, SearchRank
+from django.db.models import F
+from django.utils.html import escape
+
+# Highlight delimiters that cannot occur in text, replaced by <mark> tags once
+# the snippet is HTML-escaped.
+START_SEL = "\x02"
+STOP_SEL = "\x03"
+
+HEADLINE_OPTIONS = {
+    "config": SEARCH_CONFIG,
+    "start_sel": START_SEL,
+    "stop_sel": STOP_SEL,
+    "max_fragments": 2,
+    "max_words": 30,
+    "min_words": 10,
+}
+
+
+def search(queryset, query, text_field, limit, fields):
+    """
+    Return the best matches of a query, ranked, with a highlighted snippet.
+
+    The matches are found through the GIN index on `search_vector` and the
+    top `limit` are picked by rank in a subquery; `ts_headline`, which
+    re-parses the whole text, then only runs for those rows.
+
+    Args:
+        queryset (QuerySet): The courses or lessons to search.
+        query (SearchQuery): The search query.
+        text_field (str): The field the snippet is taken from.
+        limit (int): The maximum number of results.
+        fields (list): The fields of each result.
+
+    Returns:
+        list: A dict per result with `fields`, `rank` and `snippet`, an
+        HTML-escaped excerpt with the matches wrapped in `<mark>` tags.
+    """
+
+    rank = SearchRank(F("search_vector"), query)
+    top = (
+        queryset.filter(search_vector=query)
+        .annotate(rank=rank)
+        .order_by("-rank", "pk")
+        .values("pk")[:limit]
+    )
+    results = list(
+        queryset.model._default_manager.filter(pk__in=top)
+        .annotate(
+            rank=rank, snippet=SearchHeadline(text_field, query, **HEADLINE_OPTIONS)
+        )
+        .order_by("-rank", "pk")
+        .values(*fields, "rank", "snippet")
+    )
+    for result in results:
+        result["snippet"] = (
+            escape(result["snippet"])
+            .replace(START_SEL, "<mark>")
+            .replace(STOP_SEL, "</mark>")
+        )
+    return results
+
+
+def search_catalogue(text, category=None, level=None, limit=20):
+    """
+    Search the courses and the lessons of the catalogue.
+
+    The text is parsed with `websearch_to_tsquery`: words are AND-ed,
+    `"quoted phrases"`, `or` and `-excluded` words are supported.
+
+    Args:
+        text (str): The search text.
+        category (int, optional): Only search the courses of this category.
+        level (str, optional): Only search the courses of this level.
+        limit (int, optional): The maximum number of courses and of lessons.
+
+    Returns:
+        dict: The matching `courses` and `lessons`, best first.
+    """
+
+    query = SearchQuery(text, config=SEARCH_CONFIG, search_type="websearch")
+
+    courses = Course.objects.all()
+    lessons = Lesson.objects.all()
+    if category is not None:
+        courses = courses.filter(category=category)
+        lessons = lessons.filter(module__course__category=category)
+    if level is not None:
+        courses = courses.filter(level=level)
+        lessons = lessons.filter(module__course__level=level)
+
+    return {
+        "courses": search(
+            courses,
+            query,
+            "description",
+            limit,
+            ["id", "title", "category", "level"],
+        ),
+        "lessons": search(
+            lessons,
+            query,
+            "content",
+            limit,
+            ["id", "title", "module", "module__course", "module__course__title"],
+        ),
+    }
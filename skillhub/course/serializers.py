@@ -1,7 +1,17 @@
-from course.models import Answer, Category, Course, Lesson, Module, Question, Quiz
-from django.db.models import Avg
+from course.models import (
+    Answer,
+    Category,
+    Course,
+    Lesson,
+    Module,
+    Question,
+    Quiz,
+    QuizAttempt,
+)
 from rest_framework import serializers
-from review.models import Review
+
+# Roles allowed to see which answers are correct.
+GRADERS = ("instructor", "admin")
 
 
 class CategorySerializer(serializers.ModelSerializer):
@@ -21,7 +31,7 @@ class LessonSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Lesson
-        fields = "__all__"
+        exclude = ["search_vector"]
 
 
 class ModuleSerializer(serializers.ModelSerializer):
@@ -50,6 +60,7 @@ class CourseSerializer(serializers.ModelSerializer):
     - `created_at`: The date when the course was created.
     - `updated_at`: The date when the course was last updated.
     - `avg_rate`: The average rating of the course.
+    - `student_count`: The number of enrolled students.
     """
 
     modules = ModuleSerializer(many=True, read_only=True)
@@ -70,18 +81,22 @@ class CourseSerializer(serializers.ModelSerializer):
             "created_at",
             "updated_at",
             "avg_rate",
+            "student_count",
+        ]
+        read_only_fields = [
+            "author",
+            "students",
+            "created_at",
+            "updated_at",
+            "student_count",
         ]
-        read_only_fields = ["author", "students", "created_at", "updated_at"]
 
     def get_avg_rate(self, obj):
         """
-        Aggregate the average rating for the course.
+        Return the average rating for the course from its rating summary.
         """
 
-        avg = Review.objects.filter(course=obj).aggregate(avg_rating=Avg("rating"))[
-            "avg_rating"
-        ]
-        return round(avg, 1) if avg else 0
+        return round(obj.rating_avg, 1) if obj.rating_avg else 0
 
 
 class AnswerSerializer(serializers.ModelSerializer):
@@ -89,7 +104,8 @@ class AnswerSerializer(serializers.ModelSerializer):
     Answer serializer for quiz questions.
 
     - `text`: The text of the answer.
-    - `is_correct`: Indicates whether the answer is correct.
+    - `is_correct`: Indicates whether the answer is correct. Only instructors
+      and admins see it; students get their results by submitting the quiz.
     """
 
     question = serializers.PrimaryKeyRelatedField(queryset=Question.objects.all())
@@ -100,6 +116,14 @@ class AnswerSerializer(serializers.ModelSerializer):
         model = Answer
         fields = ["question", "option_text", "is_correct"]
 
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        request = self.context.get("request")
+        user = getattr(request, "user", None)
+        if not (user and user.is_authenticated and user.role in GRADERS):
+            del data["is_correct"]
+        return data
+
 
 class QuestionSerializer(serializers.ModelSerializer):
     """
@@ -134,3 +158,351 @@ class QuizSerializer(serializers.ModelSerializer):
     class Meta:
         model = Quiz
         fields = ["lesson", "title", "questions"]
+
+
+class CourseSummarySerializer(serializers.ModelSerializer):
+    """
+    Course serializer for course lists that do not need the module tree.
+
+    - `id`: The ID of the course.
+    - `title`: The title of the course.
+    - `author`: The author of the course.
+    - `category`: The category of the course.
+    - `level`: The level of the course.
+    - `avg_rate`: The average rating of the course.
+    - `student_count`: The number of enrolled students.
+    """
+
+    author = serializers.StringRelatedField(read_only=True)
+    avg_rate = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Course
+        fields = [
+            "id",
+            "title",
+            "author",
+            "category",
+            "level",
+            "avg_rate",
+            "student_count",
+        ]
+        read_only_fields = fields
+
+    def get_avg_rate(self, obj):
+        """
+        Return the average rating for the course from its rating summary.
+        """
+
+        return round(obj.rating_avg, 1) if obj.rating_avg else 0
+
+
+class ReorderSerializer(serializers.Serializer):
+    """
+    Serializer for reordering the modules of a course or the lessons of a module.
+
+    - `ids`: The IDs of all the modules (lessons) in their new order.
+    """
+
+    ids = serializers.ListField(child=serializers.IntegerField(), allow_empty=False)
+
+    def validate_ids(self, value):
+        """
+        Check that the IDs are exactly the IDs of the children being reordered.
+        """
+
+        if len(set(value)) != len(value):
+            raise serializers.ValidationError("Duplicate IDs are not allowed.")
+
+        children = self.context["children"]
+        if set(value) != set(children.values_list("pk", flat=True)):
+            raise serializers.ValidationError("The IDs must list every child once.")
+        return value
+
+
+class QuizResponseInputSerializer(serializers.Serializer):
+    """
+    The answers selected for one question of a quiz submission.
+
+    - `question`: The ID of the question.
+    - `answers`: The IDs of the selected answers.
+    """
+
+    question = serializers.IntegerField()
+    answers = serializers.ListField(child=serializers.IntegerField(), allow_empty=True)
+
+
+class QuizSubmissionSerializer(serializers.Serializer):
+    """
+    Serializer for submitting a quiz.
+
+    - `responses`: The selected answers, at most one entry per question.
+    """
+
+    responses = QuizResponseInputSerializer(many=True)
+
+    def validate_responses(self, value):
+        """
+        Return the selected answer IDs as a frozenset per question ID.
+        """
+
+        responses = {}
+        for response in value:
+            if response["question"] in responses:
+                raise serializers.ValidationError(
+                    f"Question {response['question']} is answered twice."
+                )
+            responses[response["question"]] = frozenset(response["answers"])
+        return responses
+
+
+class QuizAttemptSerializer(serializers.ModelSerializer):
+    """
+    Serializer for a graded quiz attempt.
+
+    - `id`: The ID of the attempt.
+    - `quiz`: The ID of the quiz.
+    - `score`: The number of correctly answered questions.
+    - `total`: The number of questions.
+    - `results`: Whether each question was answered correctly.
+    - `created_at`: The date when the quiz was submitted.
+    """
+
+    results = serializers.SerializerMethodField()
+
+    class Meta:
+        model = QuizAttempt
+        fields = ["id", "quiz", "score", "total", "results", "created_at"]
+        read_only_fields = fields
+
+    def get_results(self, obj):
+        """
+        Return the grading results set by the view, in question order.
+        """
+
+        results = getattr(obj, "results", {})
+        return [
+            {"question": question_id, "correct": correct}
+            for question_id, correct in sorted(results.items())
+        ]
+
+
+class EnrollmentSerializer(serializers.Serializer):
+    """
+    Serializer for the current user's enrollment in a course.
+
+    - `enrolled`: Whether the user is now enrolled.
+    - `student_count`: The number of enrolled students.
+    """
+
+    enrolled = serializers.BooleanField()
+    student_count = serializers.IntegerField()
+
+
+class BulkEnrollmentSerializer(serializers.Serializer):
+    """
+    Serializer for enrolling (or unenrolling) a cohort of students.
+
+    - `emails`: The email addresses of the students.
+    """
+
+    emails = serializers.ListField(child=serializers.EmailField(), allow_empty=False)
+
+
+class SearchParamsSerializer(serializers.Serializer):
+    """
+    Query parameters of the catalogue search.
+
+    - `q`: The search text (words, `"phrases"`, `or`, `-excluded`).
+    - `category`: Only search the courses of this category.
+    - `level`: Only search the courses of this level.
+    - `limit`: The maximum number of courses and of lessons.
+    """
+
+    q = serializers.CharField(max_length=200)
+    category = serializers.IntegerField(required=False)
+    level = serializers.ChoiceField(choices=Course.LEVEL_CHOICES, required=False)
+    limit = serializers.IntegerField(min_value=1, max_value=50, default=20)
+
+
+class CourseFilterParamsSerializer(serializers.Serializer):
+    """
+    Query parameters filtering the course list.
+
+    - `category`: Only list the courses of this category.
+    - `level`: Only list the courses of this level.
+    - `author`: Only list the courses of this author.
+    - `min_rating`: Only list the courses rated at least this much.
+    - `created_after`, `created_before`: Only list the courses created in
+      this range (ISO 8601 dates or datetimes, inclusive).
+    """
+
+    category = serializers.IntegerField(required=False)
+    level = serializers.ChoiceField(choices=Course.LEVEL_CHOICES, required=False)
+    author = serializers.IntegerField(required=False)
+    min_rating = serializers.FloatField(min_value=0, max_value=5, required=False)
+    created_after = serializers.DateTimeField(required=False)
+    created_before = serializers.DateTimeField(required=False)
+
+    def validate(self, attrs):
+        after = attrs.get("created_after")
+        before = attrs.get("created_before")
+        if after and before and after > before:
+            raise serializers.ValidationError(
+                {"created_before": "Must not be before created_after."}
+            )
+        return attrs
+
+
+class CourseSearchResultSerializer(serializers.Serializer):
+    """
+    A course matching a search.
+
+    - `rank`: The relevance of the course, higher is better.
+    - `snippet`: An HTML excerpt of the description with `<mark>`-ed matches.
+    """
+
+    id = serializers.IntegerField()
+    title = serializers.CharField()
+    category = serializers.IntegerField()
+    level = serializers.CharField()
+    rank = serializers.FloatField()
+    snippet = serializers.CharField()
+
+
+class LessonSearchResultSerializer(serializers.Serializer):
+    """
+    A lesson matching a search.
+
+    - `rank`: The relevance of the lesson, higher is better.
+    - `snippet`: An HTML excerpt of the content with `<mark>`-ed matches.
+    """
+
+    id = serializers.IntegerField()
+    title = serializers.CharField()
+    module = serializers.IntegerField()
+    course = serializers.IntegerField(source="module__course")
+    course_title = serializers.CharField(source="module__course__title")
+    rank = serializers.FloatField()
+    snippet = serializers.CharField()
+
+
+class SearchResultsSerializer(serializers.Serializer):
+    """
+    Serializer for the results of a catalogue search.
+    """
+
+    courses = CourseSearchResultSerializer(many=True)
+    lessons = LessonSearchResultSerializer(many=True)
+
+
+class CourseProgressSerializer(serializers.Serializer):
+    """
+    Serializer for a student's progress in a course (see `course.progress`).
+
+    - `course`: The ID of the course.
+    - `completed_lessons`: The number of lessons the student completed.
+    - `total_lessons`: The number of lessons of the course.
+    - `percent`: The completion percentage.
+    """
+
+    course = serializers.IntegerField()
+    completed_lessons = serializers.IntegerField()
+    total_lessons = serializers.IntegerField()
+    percent = serializers.FloatField()
+
+
+class AnswerTreeSerializer(serializers.Serializer):
+    """
+    Answer node of a course tree (see `CourseTreeSerializer`).
+    """
+
+    option_text = serializers.CharField(max_length=255)
+    is_correct = serializers.BooleanField(default=False)
+
+
+class QuestionTreeSerializer(serializers.Serializer):
+    """
+    Question node of a course tree (see `CourseTreeSerializer`).
+    """
+
+    question_text = serializers.CharField()
+    answers = AnswerTreeSerializer(many=True, source="options", default=list)
+
+
+class QuizTreeSerializer(serializers.Serializer):
+    """
+    Quiz node of a course tree (see `CourseTreeSerializer`).
+    """
+
+    title = serializers.CharField(max_length=255)
+    questions = QuestionTreeSerializer(many=True, default=list)
+
+
+class LessonTreeSerializer(serializers.Serializer):
+    """
+    Lesson node of a course tree (see `CourseTreeSerializer`).
+    """
+
+    title = serializers.CharField(max_length=255)
+    content = serializers.CharField(allow_blank=True, default="")
+    video_url = serializers.URLField(allow_null=True, default=None)
+    quiz = QuizTreeSerializer(allow_null=True, default=None)
+
+
+class ModuleTreeSerializer(serializers.Serializer):
+    """
+    Module node of a course tree (see `CourseTreeSerializer`).
+    """
+
+    title = serializers.CharField(max_length=255)
+    description = serializers.CharField(allow_blank=True, default="")
+    lessons = LessonTreeSerializer(many=True, default=list)
+
+
+class CourseTreeSerializer(serializers.Serializer):
+    """
+    Serializer for a whole course tree, used to import and export courses.
+
+    - `title`: The title of the course.
+    - `description`: The description of the course.
+    - `category`: The ID of the category of the course.
+    - `level`: The level of the course.
+    - `modules`: The modules, each with its `lessons`; a lesson may have a
+      `quiz` with `questions`, each with its `answers`.
+
+    Modules and lessons are listed in their order. The serializer does not
+    query the database, the importer checks the categories in bulk.
+    """
+
+    title = serializers.CharField(max_length=255)
+    description = serializers.CharField(allow_blank=True, default="")
+    category = serializers.IntegerField(source="category_id")
+    level = serializers.ChoiceField(choices=Course.LEVEL_CHOICES)
+    modules = ModuleTreeSerializer(many=True, default=list)
+
+
+class ReviewTreeSerializer(serializers.Serializer):
+    """
+    Review node of an exported course tree (see `CourseExportSerializer`).
+    """
+
+    user = serializers.IntegerField(source="user_id")
+    rating = serializers.IntegerField()
+    title = serializers.CharField()
+    content = serializers.CharField()
+    created_at = serializers.DateField()
+
+
+class CourseExportSerializer(CourseTreeSerializer):
+    """
+    Serializer for exporting a course tree.
+
+    Same fields as `CourseTreeSerializer` plus the `id` and `author` of the
+    course and its `reviews`; the importer ignores the extra fields, so an
+    export can be imported again.
+    """
+
+    id = serializers.IntegerField()
+    author = serializers.IntegerField(source="author_id")
+    reviews = ReviewTreeSerializer(many=True)
@@ -0,0 +1,314 @@
+from core.cache import invalidate_tags
+from course.cache import get_course_ids, invalidate_courses
+from course.grading import invalidate_answer_keys
+from course.models import (
+    Answer,
+    Category,
+    Course,
+    CourseProgress,
+    Lesson,
+    Module,
+    Question,
+    Quiz,
+)
+from course.ordering import next_order
+from course.progress import clear_slot
+from django.db.models.functions import Now
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+from django.dispatch import receiver
+
+# The list tag of each model whose list responses are cached.
+LIST_TAGS = {Course: "courses", Module: "modules", Lesson: "lessons"}
+
+# Fields of each listed model that decide which lists an object is in, or its
+# position. Any other change only invalidates the object's `course:<id>` tag,
+# which every cached list showing the object carries.
+LIST_FIELDS = {
+    Course: ("category_id", "level", "author_id"),
+    Module: ("course_id", "order"),
+    Lesson: ("module_id", "order"),
+}
+
+
+def remember_list_fields(sender, instance, raw=False, **kwargs):
+    """
+    Remember the list fields of an object about to be updated.
+    """
+
+    if raw or instance._state.adding:
+        return
+    instance._list_fields = (
+        sender._default_manager.filter(pk=instance.pk)
+        .values_list(*LIST_FIELDS[sender])
+        .first()
+    )
+
+
+for model in LIST_FIELDS:
+    pre_save.connect(remember_list_fields, sender=model)
+
+
+def get_list_tag(sender, instance, created=True, **kwargs):
+    """
+    Return the list tag to bump after a change of an object, if any.
+
+    The lists change when an object is created or deleted (the delete
+    signals have no `created` argument), or when a save changes one of
+    its `LIST_FIELDS`.
+    """
+
+    if sender not in LIST_TAGS:
+        return None
+    if created:
+        return LIST_TAGS[sender]
+    previous = instance.__dict__.pop("_list_fields", None)
+    current = tuple(getattr(instance, name) for name in LIST_FIELDS[sender])
+    return LIST_TAGS[sender] if previous != current else None
+
+
+@receiver([post_save, post_delete], sender=Category)
+def invalidate_categories(sender, **kwargs):
+    invalidate_tags(["categories"])
+
+
+@receiver([post_save, post_delete], sender=Course)
+def invalidate_course(sender, instance, **kwargs):
+    invalidate_courses([instance.pk], get_list_tag(sender, instance, **kwargs))
+
+
+@receiver(m2m_changed, sender=Course.students.through)
+def update_student_count(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Move `student_count` of the courses by the enrollments that changed.
+
+    `instance` is the user when the relation is changed from
+    `user.enrolled_courses`, and the course when it is changed from
+    `course.students`.
+
+    Before a change, the courses are locked and the enrollments it really
+    changes are read through the `(course, user)` unique index: the `pk_set`
+    of a remove lists the requested objects, enrolled or not. After it, the
+    counters are moved by that many, without recounting the enrollments.
+    """
+
+    if pk_set is not None and not pk_set:
+        return
+    if action.startswith("pre_"):
+        if reverse:
+            enrollments = sender.objects.filter(user=instance.pk)
+            if pk_set is not None:
+                enrollments = enrollments.filter(course__in=pk_set)
+            Course.objects.lock(
+                pk_set
+                if pk_set is not None
+                else enrollments.values_list("course", flat=True)
+            )
+            enrolled = set(enrollments.values_list("course", flat=True))
+        elif action == "pre_clear":
+            Course.objects.lock([instance.pk])
+            return
+        else:
+            Course.objects.lock([instance.pk])
+            enrolled = set(
+                sender.objects.filter(course=instance.pk, user__in=pk_set).values_list(
+                    "user", flat=True
+                )
+            )
+        instance._enrollment_changes = (
+            pk_set - enrolled if action == "pre_add" else enrolled
+        )
+        return
+
+    if not reverse and action == "post_clear":
+        Course.objects.filter(pk=instance.pk).update(updated_at=Now(), student_count=0)
+        invalidate_courses([instance.pk], LIST_TAGS[Course])
+        return
+
+    changed = instance.__dict__.pop("_enrollment_changes", None)
+    if not changed:
+        return
+    delta = 1 if action == "post_add" else -1
+    if reverse:
+        course_ids = changed
+        Course.objects.add_students(course_ids, delta)
+    else:
+        course_ids = [instance.pk]
+        Course.objects.add_students(course_ids, delta * len(changed))
+    invalidate_courses(course_ids, LIST_TAGS[Course])
+
+
+@receiver([post_save, post_delete], sender=Module)
+def invalidate_module(sender, instance, **kwargs):
+    """
+    Invalidate the course of a module and bump its `updated_at`.
+    """
+
+    Course.objects.touch([instance.course_id])
+    invalidate_courses([instance.course_id], get_list_tag(sender, instance, **kwargs))
+
+
+def invalidate_content(sender, instance, **kwargs):
+    """
+    Invalidate the course of a lesson, quiz, question or answer.
+
+    The course is looked up while the row still exists: after a save, or
+    before a delete. Lessons are rendered inside the course, so a lesson
+    change also bumps the course's `updated_at`.
+    """
+
+    course_ids = get_course_ids(sender, [instance.pk])
+    if sender is Lesson:
+        Course.objects.touch(course_ids)
+    invalidate_courses(course_ids, get_list_tag(sender, instance, **kwargs))
+
+
+for model in (Lesson, Quiz, Question, Answer):
+    post_save.connect(invalidate_content, sender=model)
+    pre_delete.connect(invalidate_content, sender=model)
+
+
+@receiver(pre_save, sender=Question)
+@receiver(pre_save, sender=Answer)
+def remember_answer_key_quiz(sender, instance, raw=False, **kwargs):
+    """
+    Remember the parent and the quiz of a question or answer about to be updated.
+
+    The question of an answer, and the quiz of a question, can be changed
+    through the API: the answer key of the quiz it leaves is dropped too.
+    """
+
+    if raw or instance._state.adding:
+        return
+    if sender is Question:
+        fields = ("quiz_id",)
+    else:
+        fields = ("question_id", "question__quiz_id")
+    instance._previous_quiz = (
+        sender._default_manager.filter(pk=instance.pk).values_list(*fields).first()
+    )
+
+
+@receiver([post_save, pre_delete], sender=Question)
+def invalidate_question_answer_key(sender, instance, **kwargs):
+    previous = instance.__dict__.pop("_previous_quiz", None)
+    invalidate_answer_keys([instance.quiz_id, *(previous or ())])
+
+
+@receiver([post_save, pre_delete], sender=Answer)
+def invalidate_answer_answer_key(sender, instance, **kwargs):
+    """
+    Invalidate the answer key of the quiz an answer belongs to.
+
+    Looked up while the question still exists, like `invalidate_content`,
+    unless the answer was saved under the question it already had.
+    """
+
+    previous = instance.__dict__.pop("_previous_quiz", None)
+    if previous is not None and previous[0] == instance.question_id:
+        invalidate_answer_keys([previous[1]])
+        return
+
+    quiz_ids = Question.objects.filter(pk=instance.question_id).values_list(
+        "quiz_id", flat=True
+    )
+    invalidate_answer_keys([*quiz_ids, *(previous or ())[1:]])
+
+
+def move_progress_slots(lesson_slots, from_course_id, to_course_id):
+    """
+    Give lessons moved to another course the next progress slots of that course.
+
+    The new course is locked while the slots are allocated, like for a new
+    lesson, and the lessons' bits are cleared from the progress of the
+    former course's students: the progress does not carry over, and the
+    former course may reuse the slots. The former course is invalidated, as
+    it no longer renders the lessons.
+
+    Args:
+        lesson_slots (dict): The current `progress_slot` of each lesson ID.
+        from_course_id (int): The ID of the course the lessons leave.
+        to_course_id (int): The ID of the course the lessons move to.
+
+    Returns:
+        dict: The new `progress_slot` of each lesson ID.
+    """
+
+    former = CourseProgress.objects.filter(course=from_course_id)
+    for slot in lesson_slots.values():
+        clear_slot(former, slot)
+    first = next_order(
+        Course.objects.filter(pk=to_course_id),
+        Lesson.objects,
+        "module__course",
+        field="progress_slot",
+    )
+    Course.objects.touch([from_course_id])
+    invalidate_courses([from_course_id], LIST_TAGS[Lesson])
+    return {pk: first + i for i, pk in enumerate(sorted(lesson_slots))}
+
+
+@receiver(pre_save, sender=Lesson)
+def move_lesson_progress(sender, instance, raw=False, **kwargs):
+    """
+    Reallocate the progress slot of a lesson moved to another course's module.
+
+    Runs in the transaction of `Lesson.save`.
+    """
+
+    if raw or instance._state.adding:
+        return
+    previous = (
+        Lesson.objects.filter(pk=instance.pk)
+        .values_list("module_id", "module__course", "progress_slot")
+        .first()
+    )
+    if previous is None or previous[0] == instance.module_id:
+        return
+    course_id = Module.objects.values_list("course", flat=True).get(
+        pk=instance.module_id
+    )
+    if course_id != previous[1]:
+        slots = move_progress_slots({instance.pk: previous[2]}, previous[1], course_id)
+        instance.progress_slot = slots[instance.pk]
+
+
+@receiver(pre_save, sender=Module)
+def move_module_progress(sender, instance, raw=False, **kwargs):
+    """
+    Reallocate the progress slots of the lessons of a module moved to
+    another course.
+
+    Runs in the transaction of `Module.save`.
+    """
+
+    if raw or instance._state.adding:
+        return
+    course_id = (
+        Module.objects.filter(pk=instance.pk).values_list("course", flat=True).first()
+    )
+    if course_id is None or course_id == instance.course_id:
+        return
+    lessons = instance.lessons.all()
+    slots = move_progress_slots(
+        dict(lessons.values_list("pk", "progress_slot")), course_id, instance.course_id
+    )
+    for pk, slot in slots.items():
+        lessons.filter(pk=pk).update(progress_slot=slot)
+
+
+@receiver(pre_delete, sender=Lesson)
+def clear_lesson_progress(sender, instance, **kwargs):
+    """
+    Clear a deleted lesson's bit from the progress of its course's students.
+    """
+
+    clear_slot(
+        CourseProgress.objects.filter(course__modules=instance.module_id),
+        instance.progress_slot,
+    )
@@ -0,0 +1,105 @@
+from course.models import Category, Course, Lesson, Module
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+User = get_user_model()
+
+
+class AsyncCatalogueTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.author = User.objects.create_user(
+            email="author@example.com",
+            password="strong_password_12",
+            full_name="Author",
+            role="instructor",
+        )
+        self.programming = Category.objects.create(name="Programming")
+        self.cooking = Category.objects.create(name="Cooking")
+        self.python = Course.objects.create(
+            author=self.author, title="Python", category=self.programming
+        )
+        module = Module.objects.create(course=self.python, title="Basics")
+        Lesson.objects.create(module=module, title="Variables")
+        self.baking = Course.objects.create(
+            author=self.author,
+            title="Baking",
+            category=self.cooking,
+            level="advanced",
+        )
+
+    def test_list_matches_the_sync_endpoint(self):
+        response = self.client.get(reverse("catalogue-course-list"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        cache.clear()
+        expected = self.client.get(reverse("course-list")).json()
+        self.assertEqual(response.json(), expected)
+
+    def test_detail_matches_the_sync_endpoint(self):
+        url = reverse("catalogue-course-detail", args=[self.python.id])
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        expected = self.client.get(reverse("course-detail", args=[self.python.id]))
+        self.assertEqual(response.json(), expected.json())
+        self.assertEqual(
+            response.json()["modules"][0]["lessons"][0]["title"], "Variables"
+        )
+
+    def test_filters_and_ordering(self):
+        url = reverse("catalogue-course-list")
+
+        response = self.client.get(url, {"category": self.cooking.id})
+        self.assertEqual(
+            [course["title"] for course in response.json()["results"]], ["Baking"]
+        )
+        response = self.client.get(url, {"ordering": "created_at"})
+        self.assertEqual(
+            [course["title"] for course in response.json()["results"]],
+            ["Python", "Baking"],
+        )
+        response = self.client.get(url, {"min_rating": "high"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("min_rating", response.json())
+
+    def test_missing_course(self):
+        url = reverse("catalogue-course-detail", args=[self.baking.id + 100])
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_anonymous_responses_are_cached_and_invalidated(self):
+        url = reverse("catalogue-course-detail", args=[self.python.id])
+        self.client.get(url)
+
+        with self.assertNumQueries(0):
+            response = self.client.get(url)
+        self.assertEqual(response.json()["title"], "Python")
+
+        self.client.force_authenticate(user=self.author)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(
+                reverse("course-detail", args=[self.python.id]), {"title": "Python 3"}
+            )
+        self.client.force_authenticate(user=None)
+        self.assertEqual(self.client.get(url).json()["title"], "Python 3")
+
+    def test_categories(self):
+        response = self.client.get(reverse("catalogue-category-list"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            sorted(category["name"] for category in response.json()["results"]),
+            ["Cooking", "Programming"],
+        )
+        url = reverse("catalogue-category-detail", args=[self.cooking.id])
+        self.assertEqual(self.client.get(url).json()["name"], "Cooking")
+
+    def test_writes_are_not_allowed(self):
+        response = self.client.post(reverse("catalogue-category-list"), {"name": "X"})
+
+        self.assertEqual(response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
@@ -0,0 +1,181 @@
+from unittest.mock import patch
+
+from core.cache import get_stats
+from course.models import Answer, Category, Course, Lesson, Module, Question, Quiz
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import mixins, status
+from rest_framework.test import APITestCase
+from review.models import Review
+
+User = get_user_model()
+
+
+class CatalogueResponseCacheTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            email="test@example.com",
+            password="strong_password_12",
+            full_name="Test User",
+            role="instructor",
+        )
+        self.category = Category.objects.create(name="Test Category")
+        self.course = self.create_course("Course")
+        self.other_course = self.create_course("Other Course")
+
+    def create_course(self, title):
+        course = Course.objects.create(
+            author=self.user, title=title, category=self.category, level="beginner"
+        )
+        module = Module.objects.create(course=course, title="Module")
+        lesson = Lesson.objects.create(module=module, title="Lesson")
+        quiz = Quiz.objects.create(lesson=lesson, title="Quiz")
+        question = Question.objects.create(quiz=quiz, question_text="Question")
+        Answer.objects.create(question=question, option_text="Answer")
+        return course
+
+    def get(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response
+
+    def test_anonymous_responses_are_cached(self):
+        url = reverse("course-detail", args=[self.course.id])
+        self.get(url)
+
+        with self.assertNumQueries(0):
+            response = self.get(url)
+        self.assertEqual(response.data["title"], "Course")
+        self.assertEqual(get_stats()["hits"], 1)
+        self.assertEqual(get_stats()["misses"], 1)
+
+        with self.assertNumQueries(0):
+            cached = self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(cached.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_authenticated_responses_are_not_cached(self):
+        self.client.force_authenticate(user=self.user)
+        self.get(reverse("course-list"))
+        self.get(reverse("course-list"))
+
+        self.assertEqual(get_stats()["hits"], 0)
+
+    def test_change_invalidates_only_its_course(self):
+        url = reverse("course-detail", args=[self.course.id])
+        other_url = reverse("course-detail", args=[self.other_course.id])
+        list_url = reverse("course-list")
+        for cached in (url, other_url, list_url):
+            self.get(cached)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Answer.objects.filter(
+                question__quiz__lesson__module__course=self.course
+            ).get().save()
+
+        hits = get_stats()["hits"]
+        self.get(other_url)
+        self.assertEqual(get_stats()["hits"], hits + 1)
+        self.get(url)
+        self.get(list_url)
+        self.assertEqual(get_stats()["hits"], hits + 1)
+
+    def test_new_lesson_is_listed(self):
+        url = reverse("lesson-list")
+        self.assertEqual(len(self.get(url).data["results"]), 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Lesson.objects.create(module=self.course.modules.get(), title="New Lesson")
+        self.assertEqual(len(self.get(url).data["results"]), 3)
+
+    def test_only_list_changes_invalidate_other_lists(self):
+        category = Category.objects.create(name="Other Category")
+        url = reverse("course-list") + f"?category={category.id}"
+        self.assertEqual(len(self.get(url).data["results"]), 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.course.title = "Renamed Course"
+            self.course.save()
+        hits = get_stats()["hits"]
+        self.get(url)
+        self.assertEqual(get_stats()["hits"], hits + 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.course.category = category
+            self.course.save()
+        self.assertEqual(len(self.get(url).data["results"]), 1)
+
+    def test_review_invalidates_course(self):
+        url = reverse("course-detail", args=[self.course.id])
+        self.assertEqual(self.get(url).data["avg_rate"], 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Review.objects.create(
+                user=self.user,
+                course=self.course,
+                rating=5,
+                title="Title",
+                content="Text",
+            )
+            Course.objects.apply_rating(self.course.id, 5)
+        self.assertEqual(self.get(url).data["avg_rate"], 5)
+
+    def test_deleted_module_is_not_served(self):
+        url = reverse("module-list")
+        self.assertEqual(len(self.get(url).data["results"]), 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.other_course.delete()
+        self.assertEqual(len(self.get(url).data["results"]), 1)
+
+    def build_during_a_change(self, mixin, action, change):
+        """
+        Return a patch of a DRF action committing `change` after building.
+        """
+
+        build = getattr(mixin, action)
+
+        def build_then_change(view, *args, **kwargs):
+            response = build(view, *args, **kwargs)
+            with self.captureOnCommitCallbacks(execute=True):
+                change()
+            return response
+
+        return patch.object(mixin, action, build_then_change)
+
+    def test_change_during_a_retrieve_is_not_cached_stale(self):
+        url = reverse("course-detail", args=[self.course.id])
+
+        def rename():
+            self.course.title = "Renamed Course"
+            self.course.save()
+
+        with self.build_during_a_change(mixins.RetrieveModelMixin, "retrieve", rename):
+            self.assertEqual(self.get(url).data["title"], "Course")
+        self.assertEqual(self.get(url).data["title"], "Renamed Course")
+
+    def test_change_during_a_list_is_not_cached_stale(self):
+        url = reverse("course-list")
+
+        def create():
+            self.create_course("New Course")
+
+        with self.build_during_a_change(mixins.ListModelMixin, "list", create):
+            self.assertEqual(len(self.get(url).data["results"]), 2)
+        self.assertEqual(len(self.get(url).data["results"]), 3)
+
+    def test_stats_are_admin_only(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(reverse("cache_stats"))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        admin = User.objects.create_user(
+            email="admin@example.com",
+            password="strong_password_12",
+            full_name="Admin",
+            role="admin",
+        )
+        self.client.force_authenticate(user=admin)
+        response = self.get(reverse("cache_stats"))
+        self.assertEqual(set(response.data), {"hits", "misses", "invalidations"})
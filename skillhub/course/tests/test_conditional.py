@@ -0,0 +1,113 @@
+from course.models import Category, Course, Lesson, Module
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+User = get_user_model()
+
+
+class ConditionalGetTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="test@example.com",
+            password="strong_password_12",
+            full_name="Test User",
+            role="instructor",
+        )
+        self.category = Category.objects.create(name="Test Category")
+        self.course = Course.objects.create(
+            author=self.user, title="Course", category=self.category, level="beginner"
+        )
+        self.module = Module.objects.create(course=self.course, title="Module")
+        self.lesson = Lesson.objects.create(module=self.module, title="Lesson")
+        self.client.force_authenticate(user=self.user)
+
+    def assertNotModified(self, url, response):
+        # Only the validators are computed, the body is not serialized.
+        with self.assertNumQueries(1):
+            cached = self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(cached.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(cached["ETag"], response["ETag"])
+
+    def assertModified(self, url, response):
+        fresh = self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(fresh.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(fresh["ETag"], response["ETag"])
+        return fresh
+
+    def test_course_detail(self):
+        url = reverse("course-detail", args=[self.course.id])
+        response = self.client.get(url)
+        self.assertIn("Last-Modified", response)
+        self.assertNotModified(url, response)
+
+        response = self.client.get(
+            url, HTTP_IF_MODIFIED_SINCE=response["Last-Modified"]
+        )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_lesson_edit_changes_course_validators(self):
+        urls = [
+            reverse("course-list"),
+            reverse("course-detail", args=[self.course.id]),
+            reverse("module-list"),
+            reverse("lesson-detail", args=[self.lesson.id]),
+        ]
+        responses = [self.client.get(url) for url in urls]
+
+        response = self.client.patch(
+            reverse("lesson-detail", args=[self.lesson.id]),
+            {"title": "Changed"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        for url, response in zip(urls, responses):
+            self.assertModified(url, response)
+
+    def test_module_delete_changes_list_validators(self):
+        Module.objects.create(course=self.course, title="Other Module")
+        url = reverse("module-list")
+        response = self.client.get(url)
+
+        self.module.delete()
+        fresh = self.assertModified(url, response)
+        self.assertEqual(len(fresh.data["results"]), 1)
+
+    def test_rating_changes_course_validators(self):
+        url = reverse("course-detail", args=[self.course.id])
+        response = self.client.get(url)
+
+        Course.objects.apply_rating(self.course.id, 5)
+        self.assertEqual(self.assertModified(url, response).data["avg_rate"], 5)
+
+    def test_missing_course(self):
+        response = self.client.get(reverse("course-detail", args=[0]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_list_validators_cover_the_page(self):
+        courses = [
+            Course.objects.create(
+                author=self.user,
+                title=f"Course {i}",
+                category=self.category,
+                level="beginner",
+            )
+            for i in range(3)
+        ]
+        url = reverse("course-list") + "?page_size=2"
+        response = self.client.get(url)
+        self.assertEqual(len(response.data["results"]), 2)
+
+        # The oldest course is neither on the page nor the row after it.
+        self.course.title = "Changed"
+        self.course.save()
+        with CaptureQueriesContext(connection) as queries:
+            self.assertNotModified(url, response)
+        self.assertIn("LIMIT 3", queries[0]["sql"])
+
+        courses[-1].delete()
+        self.assertModified(url, response)
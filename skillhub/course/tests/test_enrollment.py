@@ -0,0 +1,177 @@
+from core.testing import QueryBudgetMixin
+from course.models import Category, Course
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+User = get_user_model()
+
+
+class EnrollmentTest(QueryBudgetMixin, APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.author = User.objects.create_user(
+            email="author@example.com",
+            password="strong_password_12",
+            full_name="Author",
+            role="instructor",
+        )
+        self.students = [
+            User.objects.create_user(
+                email=f"student{i}@example.com",
+                password="strong_password_12",
+                full_name=f"Student {i}",
+                role="student",
+            )
+            for i in range(3)
+        ]
+        self.category = Category.objects.create(name="Test Category")
+        self.course = self.create_course("Course")
+
+    def create_course(self, title):
+        return Course.objects.create(
+            author=self.author, title=title, category=self.category, level="beginner"
+        )
+
+    def get_student_count(self, course=None):
+        course = course or self.course
+        return Course.objects.values_list("student_count", flat=True).get(pk=course.pk)
+
+    def test_enroll_and_unenroll(self):
+        url = reverse("course-enroll", args=[self.course.id])
+        self.client.force_authenticate(user=self.students[0])
+
+        response = self.client.post(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {"enrolled": True, "student_count": 1})
+        response = self.client.post(url)
+        self.assertEqual(response.data["student_count"], 1)
+        self.assertIn(self.students[0], self.course.students.all())
+
+        response = self.client.delete(url)
+        self.assertEqual(response.data, {"enrolled": False, "student_count": 0})
+
+    def test_enroll_requires_authentication(self):
+        response = self.client.post(reverse("course-enroll", args=[self.course.id]))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_student_count_follows_every_enrollment_change(self):
+        other = self.create_course("Other")
+        self.course.students.add(*self.students)
+        self.assertEqual(self.get_student_count(), 3)
+
+        self.students[0].enrolled_courses.add(other)
+        self.students[1].enrolled_courses.add(other)
+        self.assertEqual(self.get_student_count(other), 2)
+
+        self.students[0].enrolled_courses.clear()
+        self.assertEqual(self.get_student_count(), 2)
+        self.assertEqual(self.get_student_count(other), 1)
+
+        self.course.students.clear()
+        self.assertEqual(self.get_student_count(), 0)
+
+    def test_student_count_is_not_recounted(self):
+        self.course.students.add(self.students[0])
+        url = reverse("course-enroll", args=[self.course.id])
+        self.client.force_authenticate(user=self.students[1])
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(url)
+        self.assertEqual(response.data["student_count"], 2)
+        self.assertFalse(any("COUNT(" in query["sql"] for query in queries))
+
+        # Removing a student who is not enrolled changes nothing.
+        self.course.students.remove(self.students[2])
+        self.students[2].enrolled_courses.remove(self.course)
+        self.assertEqual(self.get_student_count(), 2)
+
+    def test_saving_a_stale_course_keeps_the_student_count(self):
+        course = Course.objects.get(pk=self.course.pk)
+        self.course.students.add(self.students[0])
+
+        course.title = "Renamed"
+        course.save()
+        self.assertEqual(self.get_student_count(), 1)
+
+    def test_bulk_enroll(self):
+        self.course.students.add(self.students[0])
+        self.client.force_authenticate(user=self.author)
+        url = reverse("course-enroll-bulk", args=[self.course.id])
+
+        emails = [student.email for student in self.students] + ["nobody@example.com"]
+        response = self.client.post(url, {"emails": emails}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data,
+            {"changed": 2, "student_count": 3, "unknown": ["nobody@example.com"]},
+        )
+        self.assertEqual(self.course.students.count(), 3)
+
+        response = self.client.delete(url, {"emails": emails[:2]}, format="json")
+        self.assertEqual(response.data["changed"], 2)
+        self.assertEqual(self.get_student_count(), 1)
+
+    def test_bulk_enroll_from_csv(self):
+        self.client.force_authenticate(user=self.author)
+        body = "email\n" + "\n".join(student.email for student in self.students)
+
+        response = self.client.post(
+            reverse("course-enroll-bulk", args=[self.course.id]),
+            body,
+            content_type="text/csv",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["changed"], 3)
+        self.assertEqual(self.get_student_count(), 3)
+
+    def test_bulk_enroll_query_count_does_not_grow_with_the_cohort(self):
+        self.client.force_authenticate(user=self.author)
+        url = reverse("course-enroll-bulk", args=[self.course.id])
+        emails = []
+
+        def scale(size):
+            while len(emails) < size:
+                user = User.objects.create_user(
+                    email=f"cohort{len(emails)}@example.com",
+                    password="strong_password_12",
+                    full_name="Cohort",
+                )
+                emails.append(user.email)
+
+        def enroll():
+            response = self.client.post(url, {"emails": emails}, format="json")
+            self.assertEqual(response.data["changed"], len(emails))
+            self.client.delete(url, {"emails": emails}, format="json")
+
+        # Enrolling and unenrolling take 11 queries each, savepoints included.
+        self.assertQueryBudget(22, enroll, scale, sizes=(1, 20))
+
+    def test_bulk_enroll_permissions(self):
+        self.client.force_authenticate(user=self.students[0])
+        response = self.client.post(
+            reverse("course-enroll-bulk", args=[self.course.id]),
+            {"emails": [self.students[1].email]},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(self.get_student_count(), 0)
+
+    def test_courses_can_be_sorted_by_popularity(self):
+        popular = self.create_course("Popular")
+        popular.students.add(*self.students)
+        self.course.students.add(self.students[0])
+        self.create_course("Empty")
+
+        response = self.client.get(
+            reverse("course-list"), {"ordering": "-student_count"}
+        )
+        self.assertEqual(
+            [course["title"] for course in response.data["results"]],
+            ["Popular", "Course", "Empty"],
+        )
+        self.assertEqual(response.data["results"][0]["student_count"], 3)
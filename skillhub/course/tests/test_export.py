@@ -0,0 +1,138 @@
+import gzip
+import json
+import os
+import tempfile
+
+from core.testing import QueryBudgetMixin
+from course.models import Answer, Category, Course, Lesson, Module, Question, Quiz
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from review.models import Review
+
+User = get_user_model()
+
+
+class CourseExportTest(QueryBudgetMixin, APITestCase):
+    def setUp(self):
+        self.author = User.objects.create_user(
+            email="author@example.com",
+            password="strong_password_12",
+            full_name="Author",
+            role="instructor",
+        )
+        self.admin = User.objects.create_user(
+            email="admin@example.com",
+            password="strong_password_12",
+            full_name="Admin",
+            role="admin",
+        )
+        self.category = Category.objects.create(name="Test Category")
+        self.courses = [self.create_course(f"Course {i}") for i in range(3)]
+        self.client.force_authenticate(user=self.admin)
+
+    def create_course(self, title):
+        course = Course.objects.create(
+            author=self.author, title=title, category=self.category, level="beginner"
+        )
+        module = Module.objects.create(course=course, title="Module")
+        lesson = Lesson.objects.create(module=module, title="Lesson")
+        quiz = Quiz.objects.create(lesson=lesson, title="Quiz")
+        question = Question.objects.create(quiz=quiz, question_text="Question")
+        Answer.objects.create(question=question, option_text="Yes", is_correct=True)
+        Review.objects.create(
+            user=self.author, course=course, rating=5, title="Title", content="Text"
+        )
+        return course
+
+    def export(self, url, **params):
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        content = b"".join(response.streaming_content)
+        if params.get("gzip"):
+            content = gzip.decompress(content)
+        return [json.loads(line) for line in content.splitlines()]
+
+    def test_export_catalogue(self):
+        courses = self.export(reverse("course-export"))
+
+        self.assertEqual(
+            [course["id"] for course in courses], [c.id for c in self.courses]
+        )
+        lesson = courses[0]["modules"][0]["lessons"][0]
+        self.assertEqual(
+            lesson["quiz"]["questions"][0]["answers"],
+            [{"option_text": "Yes", "is_correct": True}],
+        )
+        self.assertEqual(courses[0]["reviews"][0]["rating"], 5)
+
+    def test_resume_and_gzip(self):
+        courses = self.export(
+            reverse("course-export"), after=self.courses[0].id, gzip="true"
+        )
+        self.assertEqual(
+            [course["id"] for course in courses], [c.id for c in self.courses[1:]]
+        )
+
+    def test_query_count_does_not_grow_with_the_catalogue(self):
+        def scale(size):
+            while Course.objects.count() < size:
+                self.create_course("Course")
+
+        def export():
+            self.export(reverse("course-export"))
+
+        # Courses, modules, lessons with quizzes, questions, answers, reviews.
+        self.assertQueryBudget(6, export, scale, sizes=(3, 6))
+
+    def test_export_course(self):
+        self.client.force_authenticate(user=self.author)
+        course = self.courses[1]
+
+        courses = self.export(reverse("course-export-course", args=[course.id]))
+        self.assertEqual([exported["id"] for exported in courses], [course.id])
+
+    def test_export_permissions(self):
+        other = User.objects.create_user(
+            email="other@example.com",
+            password="strong_password_12",
+            full_name="Other",
+            role="instructor",
+        )
+        self.client.force_authenticate(user=other)
+
+        response = self.client.get(reverse("course-export"))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        response = self.client.get(
+            reverse("course-export-course", args=[self.courses[0].id])
+        )
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_export_can_be_imported(self):
+        courses = self.export(reverse("course-export"))
+
+        self.client.force_authenticate(user=self.author)
+        response = self.client.post(reverse("course-import"), courses, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Course.objects.count(), 6)
+
+    def test_export_command(self):
+        with tempfile.NamedTemporaryFile(suffix=".ndjson.gz", delete=False) as file:
+            pass
+        self.addCleanup(os.remove, file.name)
+
+        call_command(
+            "export_courses",
+            after=self.courses[1].id,
+            gzip=True,
+            output=file.name,
+            stderr=open(os.devnull, "w"),
+        )
+        with gzip.open(file.name) as exported:
+            lines = exported.read().splitlines()
+        self.assertEqual(
+            [json.loads(line)["id"] for line in lines], [self.courses[2].id]
+        )
@@ -0,0 +1,236 @@
+from unittest.mock import patch
+
+from course.grading import (
+    answer_key_cache_key,
+    build_answer_key,
+    get_answer_key,
+    get_answer_key_version,
+)
+from course.models import (
+    Answer,
+    Category,
+    Course,
+    Lesson,
+    Module,
+    Question,
+    Quiz,
+    QuizAttempt,
+    QuizResponse,
+)
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+User = get_user_model()
+
+
+class QuizGradingTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.author = User.objects.create_user(
+            email="author@example.com",
+            password="strong_password_12",
+            full_name="Author",
+            role="instructor",
+        )
+        self.student = User.objects.create_user(
+            email="student@example.com",
+            password="strong_password_12",
+            full_name="Student",
+            role="student",
+        )
+        self.course = Course.objects.create(
+            author=self.author,
+            title="Course",
+            category=Category.objects.create(name="Test Category"),
+            level="beginner",
+        )
+        self.course.students.add(self.student)
+        module = Module.objects.create(course=self.course, title="Module")
+        lesson = Lesson.objects.create(module=module, title="Lesson")
+        self.quiz = Quiz.objects.create(lesson=lesson, title="Quiz")
+
+        self.single = Question.objects.create(quiz=self.quiz, question_text="Single")
+        self.right = Answer.objects.create(
+            question=self.single, option_text="Right", is_correct=True
+        )
+        self.wrong = Answer.objects.create(question=self.single, option_text="Wrong")
+
+        self.multiple = Question.objects.create(
+            quiz=self.quiz, question_text="Multiple"
+        )
+        self.first = Answer.objects.create(
+            question=self.multiple, option_text="First", is_correct=True
+        )
+        self.second = Answer.objects.create(
+            question=self.multiple, option_text="Second", is_correct=True
+        )
+        self.url = reverse("quiz-submit", args=[self.quiz.id])
+
+    def submit(self, *responses, user=None):
+        self.client.force_authenticate(user=user or self.student)
+        return self.client.post(
+            self.url,
+            {
+                "responses": [
+                    {"question": question.id, "answers": [a.id for a in answers]}
+                    for question, answers in responses
+                ]
+            },
+            format="json",
+        )
+
+    def test_submit_grades_the_attempt(self):
+        response = self.submit(
+            (self.single, [self.right]), (self.multiple, [self.first])
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["score"], 1)
+        self.assertEqual(response.data["total"], 2)
+        self.assertEqual(
+            response.data["results"],
+            [
+                {"question": self.single.id, "correct": True},
+                {"question": self.multiple.id, "correct": False},
+            ],
+        )
+
+        attempt = QuizAttempt.objects.get()
+        self.assertEqual(attempt.user, self.student)
+        self.assertEqual(
+            set(attempt.responses.values_list("answer_id", "is_correct")),
+            {(self.right.id, True), (self.first.id, False)},
+        )
+
+    def test_every_correct_answer_is_required(self):
+        response = self.submit((self.multiple, [self.first, self.second]))
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["score"], 1)
+
+        response = self.submit(
+            (self.single, [self.right, self.wrong]),
+            (self.multiple, [self.first, self.second]),
+        )
+        self.assertEqual(response.data["score"], 1)
+
+    def cached_answer_key(self, quiz_id):
+        return cache.get(answer_key_cache_key(quiz_id, get_answer_key_version(quiz_id)))
+
+    def test_grading_uses_the_cached_answer_key(self):
+        get_answer_key(self.quiz.id)
+
+        # The access check, then the attempt and its responses inside a
+        # savepoint (SAVEPOINT and RELEASE count as queries).
+        with self.assertNumQueries(5):
+            response = self.submit((self.single, [self.right]))
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_answer_changes_invalidate_the_answer_key(self):
+        get_answer_key(self.quiz.id)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.wrong.is_correct = True
+            self.wrong.save()
+        self.assertIsNone(self.cached_answer_key(self.quiz.id))
+
+        response = self.submit((self.single, [self.right]))
+        self.assertEqual(response.data["score"], 0)
+
+    def test_a_key_built_during_a_change_is_not_served(self):
+        def build(quiz_id):
+            answer_key = build_answer_key(quiz_id)
+            # The change commits after the key was read from the database.
+            with self.captureOnCommitCallbacks(execute=True):
+                self.wrong.is_correct = True
+                self.wrong.save()
+            return answer_key
+
+        with patch("course.grading.build_answer_key", side_effect=build):
+            get_answer_key(self.quiz.id)
+
+        correct, _ = get_answer_key(self.quiz.id)[self.single.id]
+        self.assertEqual(correct, {self.right.id, self.wrong.id})
+
+    def test_question_changes_invalidate_the_answer_key(self):
+        get_answer_key(self.quiz.id)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.multiple.delete()
+
+        response = self.submit((self.single, [self.right]))
+        self.assertEqual(response.data["score"], 1)
+        self.assertEqual(response.data["total"], 1)
+
+    def test_moves_invalidate_both_answer_keys(self):
+        other_quiz = Quiz.objects.create(
+            lesson=Lesson.objects.create(module=self.quiz.lesson.module, title="Other"),
+            title="Other",
+        )
+        other = Question.objects.create(quiz=other_quiz, question_text="Other")
+
+        for moved, attribute, target in (
+            (self.multiple, "quiz", other_quiz),
+            (self.wrong, "question", other),
+        ):
+            get_answer_key(self.quiz.id)
+            get_answer_key(other_quiz.id)
+            with self.captureOnCommitCallbacks(execute=True):
+                setattr(moved, attribute, target)
+                moved.save()
+            self.assertIsNone(self.cached_answer_key(self.quiz.id))
+            self.assertIsNone(self.cached_answer_key(other_quiz.id))
+
+    def test_invalid_responses(self):
+        other_quiz = Quiz.objects.create(
+            lesson=Lesson.objects.create(module=self.quiz.lesson.module, title="Other"),
+            title="Other",
+        )
+        other = Question.objects.create(quiz=other_quiz, question_text="Other")
+
+        for responses in (
+            [(other, [])],
+            [(self.single, [self.first])],
+            [(self.single, [self.right]), (self.single, [self.wrong])],
+        ):
+            response = self.submit(*responses)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(QuizAttempt.objects.exists())
+
+    def test_submit_permissions(self):
+        outsider = User.objects.create_user(
+            email="outsider@example.com",
+            password="strong_password_12",
+            full_name="Outsider",
+            role="student",
+        )
+        response = self.submit((self.single, [self.right]), user=outsider)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        response = self.submit((self.single, [self.right]), user=self.author)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        self.client.force_authenticate(user=None)
+        response = self.client.post(self.url, {"responses": []}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        self.client.force_authenticate(user=self.student)
+        response = self.client.post(
+            reverse("quiz-submit", args=[self.quiz.id + 1000]),
+            {"responses": []},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(QuizResponse.objects.count(), 1)
+
+    def test_students_do_not_see_correct_answers(self):
+        url = reverse("answer-detail", args=[self.right.id])
+
+        self.client.force_authenticate(user=self.student)
+        self.assertNotIn("is_correct", self.client.get(url).data)
+
+        self.client.force_authenticate(user=self.author)
+        self.assertTrue(self.client.get(url).data["is_correct"])
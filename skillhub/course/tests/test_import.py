@@ -0,0 +1,158 @@
+import io
+import json
+import os
+import tempfile
+
+from core.testing import QueryBudgetMixin
+from course.models import Answer, Category, Course, Lesson, Module, Question, Quiz
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+User = get_user_model()
+
+
+class CourseImportTest(QueryBudgetMixin, APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="test@example.com",
+            password="strong_password_12",
+            full_name="Test User",
+            role="instructor",
+        )
+        self.category = Category.objects.create(name="Test Category")
+        self.url = reverse("course-import")
+        self.client.force_authenticate(user=self.user)
+
+    def tree(self, title="Course"):
+        return {
+            "title": title,
+            "category": self.category.id,
+            "level": "beginner",
+            "modules": [
+                {
+                    "title": f"Module {m}",
+                    "lessons": [
+                        {
+                            "title": f"Lesson {m}.{lesson}",
+                            "quiz": {
+                                "title": "Quiz",
+                                "questions": [
+                                    {
+                                        "question_text": "Question",
+                                        "answers": [
+                                            {"option_text": "Yes", "is_correct": True},
+                                            {"option_text": "No"},
+                                        ],
+                                    }
+                                ],
+                            },
+                        }
+                        for lesson in range(2)
+                    ],
+                }
+                for m in range(2)
+            ],
+        }
+
+    def test_import_json_tree(self):
+        response = self.client.post(self.url, self.tree(), format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            response.data["created"],
+            {
+                "courses": 1,
+                "modules": 2,
+                "lessons": 4,
+                "quizzes": 4,
+                "questions": 4,
+                "answers": 8,
+            },
+        )
+        course = Course.objects.get(pk=response.data["courses"][0])
+        self.assertEqual(course.author, self.user)
+        self.assertEqual(
+            list(course.modules.values_list("title", "order")),
+            [("Module 0", 1), ("Module 1", 2)],
+        )
+        self.assertEqual(Answer.objects.filter(is_correct=True).count(), 4)
+
+    def test_import_ndjson(self):
+        body = "\n".join(json.dumps(self.tree(f"Course {i}")) for i in range(3))
+
+        response = self.client.post(self.url, body, content_type="application/x-ndjson")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Course.objects.count(), 3)
+        self.assertEqual(Lesson.objects.count(), 12)
+
+    def test_query_count_does_not_grow_with_the_tree(self):
+        def scale(size):
+            self.trees = [self.tree(f"Course {i}") for i in range(size)]
+
+        def post():
+            response = self.client.post(self.url, self.trees, format="json")
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        self.assertQueryBudget(10, post, scale)
+
+    def test_invalid_nodes_are_reported_and_nothing_is_created(self):
+        invalid = self.tree()
+        invalid["modules"][1]["lessons"][0]["quiz"]["questions"][0]["answers"] = [
+            {"is_correct": True}
+        ]
+        unknown_category = self.tree()
+        unknown_category["category"] = 0
+
+        response = self.client.post(
+            self.url, [self.tree(), invalid, unknown_category], format="json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        errors = {error["index"]: error["errors"] for error in response.data["errors"]}
+        self.assertEqual(set(errors), {1, 2})
+        self.assertIn(
+            "option_text",
+            errors[1]["modules"][1]["lessons"][0]["quiz"]["questions"][0]["answers"][0],
+        )
+        self.assertIn("category", errors[2])
+        for model in (Course, Module, Lesson, Quiz, Question, Answer):
+            self.assertFalse(model.objects.exists())
+
+    def test_invalid_ndjson_line(self):
+        response = self.client.post(
+            self.url,
+            json.dumps(self.tree()) + "\n{not json",
+            content_type="application/x-ndjson",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Course.objects.exists())
+
+    def test_students_cannot_import(self):
+        student = User.objects.create_user(
+            email="student@example.com",
+            password="strong_password_12",
+            full_name="Student",
+        )
+        self.client.force_authenticate(user=student)
+
+        response = self.client.post(self.url, self.tree(), format="json")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_import_command(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".ndjson", delete=False) as file:
+            for i in range(2):
+                file.write(json.dumps(self.tree(f"Course {i}")) + "\n")
+        self.addCleanup(os.remove, file.name)
+
+        stdout = io.StringIO()
+        call_command("import_courses", file.name, author=self.user.email, stdout=stdout)
+        self.assertIn("Imported 2 courses", stdout.getvalue())
+        self.assertEqual(Course.objects.count(), 2)
+
+        with self.assertRaises(CommandError):
+            call_command("import_courses", file.name, author="missing@example.com")
@@ -0,0 +1,144 @@
+from course.models import Category, Course, Lesson, Module
+from course.ordering import reorder
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+User = get_user_model()
+
+
+class OrderingTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="test@example.com",
+            password="strong_password_12",
+            full_name="Test User",
+            role="instructor",
+        )
+        self.category = Category.objects.create(name="Test Category")
+        self.course = Course.objects.create(
+            author=self.user, title="Course", category=self.category, level="beginner"
+        )
+        self.module = Module.objects.create(course=self.course, title="Module")
+        self.client.force_authenticate(user=self.user)
+
+    def test_positions_are_allocated_under_a_lock(self):
+        with CaptureQueriesContext(connection) as queries:
+            first = Lesson.objects.create(module=self.module, title="First")
+        self.assertTrue(any("FOR UPDATE" in query["sql"] for query in queries))
+
+        explicit = Lesson.objects.create(module=self.module, title="Explicit", order=5)
+        last = Lesson.objects.create(module=self.module, title="Last")
+
+        self.assertEqual([first.order, explicit.order, last.order], [1, 5, 6])
+        self.assertEqual(Module.objects.create(course=self.course, title="M").order, 2)
+
+    def test_duplicate_position_is_rejected(self):
+        Lesson.objects.create(module=self.module, title="First")
+
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Lesson.objects.create(module=self.module, title="Second", order=1)
+
+        response = self.client.post(
+            reverse("lesson-list"),
+            {"module": self.module.id, "title": "Second", "order": 1},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_reorder_lessons(self):
+        lessons = [
+            Lesson.objects.create(module=self.module, title=f"Lesson {i}")
+            for i in range(3)
+        ]
+        ids = [lessons[2].id, lessons[0].id, lessons[1].id]
+
+        response = self.client.post(
+            reverse("module-reorder", args=[self.module.id]),
+            {"ids": ids},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([lesson["id"] for lesson in response.data], ids)
+        self.assertEqual(
+            list(self.module.lessons.values_list("id", "order")),
+            [(ids[0], 1), (ids[1], 2), (ids[2], 3)],
+        )
+
+    def test_reorder_modules(self):
+        second = Module.objects.create(course=self.course, title="Second")
+
+        response = self.client.post(
+            reverse("course-reorder", args=[self.course.id]),
+            {"ids": [second.id, self.module.id]},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            list(self.course.modules.values_list("id", flat=True)),
+            [second.id, self.module.id],
+        )
+
+    def test_reorder_validates_under_a_lock(self):
+        lessons = [
+            Lesson.objects.create(module=self.module, title=f"Lesson {i}")
+            for i in range(2)
+        ]
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(
+                reverse("module-reorder", args=[self.module.id]),
+                {"ids": [lessons[1].id, lessons[0].id]},
+                format="json",
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        sql = [query["sql"] for query in queries]
+        lock = next(i for i, query in enumerate(sql) if "FOR UPDATE" in query)
+        validate = next(
+            i
+            for i, query in enumerate(sql)
+            if query.startswith('SELECT "course_lesson"')
+        )
+        self.assertLess(lock, validate)
+
+    def test_reorder_keeps_the_position_of_unlisted_children(self):
+        lessons = [
+            Lesson.objects.create(module=self.module, title=f"Lesson {i}")
+            for i in range(3)
+        ]
+
+        reorder(self.module.lessons.all(), [lessons[1].id, lessons[0].id])
+        self.assertEqual(
+            list(self.module.lessons.values_list("id", "order")),
+            [(lessons[1].id, 1), (lessons[0].id, 2), (lessons[2].id, 3)],
+        )
+
+    def test_reorder_requires_every_child(self):
+        lessons = [
+            Lesson.objects.create(module=self.module, title=f"Lesson {i}")
+            for i in range(2)
+        ]
+        url = reverse("module-reorder", args=[self.module.id])
+
+        for ids in ([lessons[0].id], [lessons[0].id, lessons[0].id], [0, 1]):
+            response = self.client.post(url, {"ids": ids}, format="json")
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_reorder_of_other_author_is_forbidden(self):
+        other = User.objects.create_user(
+            email="other@example.com",
+            password="strong_password_12",
+            full_name="Other",
+            role="instructor",
+        )
+        self.client.force_authenticate(user=other)
+
+        response = self.client.post(
+            reverse("course-reorder", args=[self.course.id]),
+            {"ids": [self.module.id]},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
@@ -0,0 +1,71 @@
+from course.models import Category, Course
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+User = get_user_model()
+
+
+class CourseKeysetPaginationTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="test@example.com",
+            password="strong_password_12",
+            full_name="Test User",
+        )
+        self.category = Category.objects.create(name="Test Category")
+        Course.objects.bulk_create(
+            Course(
+                author=self.user,
+                title=f"Course {i}",
+                category=self.category,
+                level="beginner",
+            )
+            for i in range(25)
+        )
+        # Courses sharing a timestamp must still be paginated without gaps.
+        Course.objects.filter(title__in=["Course 3", "Course 4", "Course 5"]).update(
+            created_at=timezone.now()
+        )
+        self.expected = list(
+            Course.objects.order_by("-created_at", "-id").values_list("id", flat=True)
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def walk(self, url, key):
+        ids = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertLessEqual(len(response.data["results"]), 10)
+            ids.extend(item["id"] for item in response.data["results"])
+            last = response
+            url = response.data[key]
+        return ids, last
+
+    def test_walk_forward(self):
+        ids, _ = self.walk(reverse("course-list") + "?page_size=10", "next")
+        self.assertEqual(ids, self.expected)
+
+    def test_walk_backward(self):
+        _, last = self.walk(reverse("course-list") + "?page_size=10", "next")
+        pages = []
+        url = last.data["previous"]
+        while url:
+            response = self.client.get(url)
+            pages.insert(0, [item["id"] for item in response.data["results"]])
+            url = response.data["previous"]
+        ids = [pk for page in pages for pk in page]
+        self.assertEqual(ids, self.expected[:20])
+
+    def test_default_page_size(self):
+        response = self.client.get(reverse("course-list"))
+        self.assertEqual(len(response.data["results"]), 20)
+        self.assertIsNotNone(response.data["next"])
+        self.assertIsNone(response.data["previous"])
+
+    def test_invalid_cursor(self):
+        response = self.client.get(reverse("course-list") + "?cursor=invalid")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,90 @@
+from core.ownership import filter_owned, get_owner_id
+from course.models import Answer, Category, Course, Lesson, Module, Question, Quiz
+from django.contrib.auth import get_user_model
+from django.test import RequestFactory
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+User = get_user_model()
+
+
+class OwnershipTest(APITestCase):
+    def setUp(self):
+        self.author = User.objects.create_user(
+            email="author@example.com",
+            password="strong_password_12",
+            full_name="Author",
+            role="instructor",
+        )
+        self.other = User.objects.create_user(
+            email="other@example.com",
+            password="strong_password_12",
+            full_name="Other",
+            role="instructor",
+        )
+        self.category = Category.objects.create(name="Test Category")
+        self.course = self.create_tree(self.author)
+        self.other_course = self.create_tree(self.other)
+
+    def create_tree(self, author):
+        course = Course.objects.create(
+            author=author, title="Course", category=self.category, level="beginner"
+        )
+        module = Module.objects.create(course=course, title="Module")
+        lesson = Lesson.objects.create(module=module, title="Lesson")
+        quiz = Quiz.objects.create(lesson=lesson, title="Quiz")
+        question = Question.objects.create(quiz=quiz, question_text="Question")
+        Answer.objects.create(question=question, option_text="Answer")
+        return course
+
+    def test_owner_id_is_resolved_in_one_query(self):
+        answer = Answer.objects.get(question__quiz__lesson__module__course=self.course)
+        request = RequestFactory().get("/")
+
+        with self.assertNumQueries(1):
+            self.assertEqual(get_owner_id(answer, request), self.author.id)
+            self.assertEqual(get_owner_id(answer, request), self.author.id)
+        with self.assertNumQueries(0):
+            self.assertEqual(get_owner_id(self.course), self.author.id)
+
+    def test_patch_answer_as_author(self):
+        answer = Answer.objects.get(question__quiz__lesson__module__course=self.course)
+        self.client.force_authenticate(user=self.author)
+
+        # Load the answer, resolve its owner, update it, and find the course
+        # whose cached responses and the quiz whose answer key are invalidated.
+        with self.assertNumQueries(5):
+            response = self.client.patch(
+                reverse("answer-detail", args=[answer.id]),
+                {"option_text": "Changed"},
+                format="json",
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_patch_answer_of_other_author_is_forbidden(self):
+        answer = Answer.objects.get(question__quiz__lesson__module__course=self.course)
+        self.client.force_authenticate(user=self.other)
+
+        response = self.client.patch(
+            reverse("answer-detail", args=[answer.id]),
+            {"option_text": "Changed"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_filter_owned(self):
+        self.assertEqual(
+            list(filter_owned(Quiz.objects.all(), self.author)),
+            list(Quiz.objects.filter(lesson__module__course=self.course)),
+        )
+
+    def test_mine_query_param(self):
+        self.client.force_authenticate(user=self.author)
+
+        response = self.client.get(reverse("lesson-list"), {"mine": "true"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), 1)
+
+        response = self.client.get(reverse("lesson-list"))
+        self.assertEqual(len(response.data["results"]), 2)
@@ -0,0 +1,184 @@
+from course.models import Category, Course, CourseProgress, Lesson, Module
+from course.progress import to_int
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+User = get_user_model()
+
+
+class LessonProgressTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.author = User.objects.create_user(
+            email="author@example.com",
+            password="strong_password_12",
+            full_name="Author",
+            role="instructor",
+        )
+        self.student = User.objects.create_user(
+            email="student@example.com",
+            password="strong_password_12",
+            full_name="Student",
+            role="student",
+        )
+        self.course = Course.objects.create(
+            author=self.author,
+            title="Course",
+            category=Category.objects.create(name="Test Category"),
+            level="beginner",
+        )
+        self.course.students.add(self.student)
+        first = Module.objects.create(course=self.course, title="First")
+        second = Module.objects.create(course=self.course, title="Second")
+        self.lessons = [
+            Lesson.objects.create(module=first, title="One"),
+            Lesson.objects.create(module=first, title="Two"),
+            Lesson.objects.create(module=second, title="Three"),
+            Lesson.objects.create(module=second, title="Four"),
+        ]
+        self.client.force_authenticate(user=self.student)
+
+    def complete(self, lesson, method="post"):
+        url = reverse("lesson-complete", args=[getattr(lesson, "id", lesson)])
+        return getattr(self.client, method)(url)
+
+    def get_bits(self, user=None):
+        progress = CourseProgress.objects.get(
+            user=user or self.student, course=self.course
+        )
+        return to_int(progress.completed)
+
+    def test_progress_slots_are_allocated_per_course(self):
+        self.assertEqual(
+            [lesson.progress_slot for lesson in self.lessons], [1, 2, 3, 4]
+        )
+
+    def test_complete_lesson(self):
+        response = self.complete(self.lessons[2])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data,
+            {
+                "course": self.course.id,
+                "completed_lessons": 1,
+                "total_lessons": 4,
+                "percent": 25.0,
+            },
+        )
+        self.assertEqual(self.get_bits(), 1 << 3)
+
+        self.complete(self.lessons[2])
+        response = self.complete(self.lessons[0])
+        self.assertEqual(response.data["percent"], 50.0)
+        self.assertEqual(CourseProgress.objects.count(), 1)
+
+        response = self.complete(self.lessons[2], method="delete")
+        self.assertEqual(response.data["completed_lessons"], 1)
+        self.assertEqual(self.get_bits(), 1 << 1)
+
+    def test_complete_requires_enrollment(self):
+        self.client.force_authenticate(user=self.author)
+        response = self.complete(self.lessons[0])
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        lesson_id = self.lessons[0].id
+        self.lessons[0].delete()
+        response = self.complete(lesson_id)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_profile_shows_progress(self):
+        url = reverse("profile")
+        self.client.get(url)
+        self.complete(self.lessons[0])
+
+        response = self.client.get(url, {"compact": "true"})
+        self.assertEqual(
+            response.data["progress"],
+            [
+                {
+                    "course": self.course.id,
+                    "completed_lessons": 1,
+                    "total_lessons": 4,
+                    "percent": 25.0,
+                }
+            ],
+        )
+
+    def test_deleted_lesson_is_cleared_from_progress(self):
+        for lesson in self.lessons:
+            self.complete(lesson)
+
+        self.lessons[3].delete()
+        self.assertEqual(self.get_bits(), 0b1110)
+
+        # The slot of the deleted lesson is reused, and starts uncompleted.
+        lesson = Lesson.objects.create(module=self.lessons[3].module, title="Five")
+        self.assertEqual(lesson.progress_slot, 4)
+        response = self.complete(self.lessons[0], method="delete")
+        self.assertEqual(response.data["completed_lessons"], 2)
+
+    def test_course_report(self):
+        other = User.objects.create_user(
+            email="other@example.com",
+            password="strong_password_12",
+            full_name="Other",
+            role="student",
+        )
+        self.course.students.add(other)
+        for lesson in self.lessons:
+            self.complete(lesson)
+        self.complete(self.lessons[0], method="delete")
+
+        self.client.force_authenticate(user=self.author)
+        # The course, its lessons, the students count and the bitmaps scan.
+        with self.assertNumQueries(4):
+            response = self.client.get(
+                reverse("course-progress", args=[self.course.id])
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["students"], 2)
+        self.assertEqual(response.data["started"], 1)
+        self.assertEqual(response.data["finished"], 0)
+        self.assertEqual(response.data["average_percent"], 37.5)
+        self.assertEqual(
+            [lesson["completed"] for lesson in response.data["lessons"]],
+            [0, 1, 1, 1],
+        )
+
+        self.client.force_authenticate(user=self.student)
+        response = self.client.get(reverse("course-progress", args=[self.course.id]))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_moving_content_to_another_course_reallocates_slots(self):
+        other = Course.objects.create(
+            author=self.author,
+            title="Other",
+            category=self.course.category,
+            level="beginner",
+        )
+        target = Module.objects.create(course=other, title="Target")
+        Lesson.objects.create(module=target, title="Existing")
+        self.complete(self.lessons[0])
+        self.complete(self.lessons[2])
+
+        self.client.force_authenticate(user=self.author)
+        response = self.client.patch(
+            reverse("lesson-detail", args=[self.lessons[0].id]),
+            {"module": target.id, "order": 2},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.lessons[0].refresh_from_db()
+        self.assertEqual(self.lessons[0].progress_slot, 2)
+        self.assertEqual(self.get_bits(), 1 << 3)
+
+        module = self.lessons[2].module
+        module.course = other
+        module.save()
+        self.assertEqual(
+            sorted(module.lessons.values_list("progress_slot", flat=True)), [3, 4]
+        )
+        self.assertEqual(self.get_bits(), 0)
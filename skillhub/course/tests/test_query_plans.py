@@ -0,0 +1,85 @@
+from core.testing import QueryBudgetMixin
+from course.models import Answer, Category, Course, Lesson, Module, Question, Quiz
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from review.models import Review
+
+User = get_user_model()
+
+
+class CourseQueryBudgetTest(QueryBudgetMixin, APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="test@example.com",
+            password="strong_password_12",
+            full_name="Test User",
+            role="instructor",
+        )
+        self.category = Category.objects.create(name="Test Category")
+        self.client.force_authenticate(user=self.user)
+
+    def scale(self, size):
+        while Course.objects.count() < size:
+            course = Course.objects.create(
+                author=self.user,
+                title="Test Course",
+                category=self.category,
+                level="beginner",
+            )
+            Review.objects.create(
+                user=self.user,
+                course=course,
+                rating=4,
+                title="Review",
+                content="Review",
+            )
+            Course.objects.apply_rating(course.id, 4)
+            for _ in range(2):
+                module = Module.objects.create(course=course, title="Test Module")
+                for _ in range(2):
+                    lesson = Lesson.objects.create(module=module, title="Test Lesson")
+                    quiz = Quiz.objects.create(lesson=lesson, title="Test Quiz")
+                    question = Question.objects.create(
+                        quiz=quiz, question_text="Test Question"
+                    )
+                    Answer.objects.create(
+                        question=question, option_text="Test Answer", is_correct=True
+                    )
+
+    def get(self, url):
+        def request():
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            return response
+
+        return request
+
+    # The course, module and lesson budgets include the ETag validators query.
+
+    def test_course_list_budget(self):
+        self.assertQueryBudget(4, self.get(reverse("course-list")), self.scale)
+
+    def test_course_detail_budget(self):
+        self.scale(1)
+        course = Course.objects.get()
+        self.assertQueryBudget(
+            4, self.get(reverse("course-detail", args=[course.id])), self.scale
+        )
+
+    def test_module_list_budget(self):
+        self.assertQueryBudget(3, self.get(reverse("module-list")), self.scale)
+
+    def test_lesson_list_budget(self):
+        self.assertQueryBudget(2, self.get(reverse("lesson-list")), self.scale)
+
+    def test_quiz_list_budget(self):
+        self.assertQueryBudget(3, self.get(reverse("quiz-list")), self.scale)
+
+    def test_nested_tree_and_avg_rate(self):
+        self.scale(1)
+        response = self.client.get(reverse("course-list"))
+        self.assertEqual(response.data["results"][0]["avg_rate"], 4)
+        self.assertEqual(len(response.data["results"][0]["modules"]), 2)
+        self.assertEqual(len(response.data["results"][0]["modules"][0]["lessons"]), 2)
@@ -0,0 +1,108 @@
+from course.models import Category, Course, Lesson, Module
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+User = get_user_model()
+
+
+class CatalogueSearchTest(APITestCase):
+    def setUp(self):
+        self.author = User.objects.create_user(
+            email="author@example.com",
+            password="strong_password_12",
+            full_name="Author",
+            role="instructor",
+        )
+        self.programming = Category.objects.create(name="Programming")
+        self.cooking = Category.objects.create(name="Cooking")
+        self.python = self.create_course(
+            "Python for beginners",
+            "Learn the basics of programming with Python.",
+            self.programming,
+        )
+        self.advanced = self.create_course(
+            "Advanced databases",
+            "Indexes, query plans and Python drivers.",
+            self.programming,
+            level="advanced",
+        )
+        self.baking = self.create_course(
+            "Baking bread", "Sourdough & yeast.", self.cooking
+        )
+        module = Module.objects.create(course=self.baking, title="Basics")
+        self.lesson = Lesson.objects.create(
+            module=module,
+            title="Kneading",
+            content="Knead the dough until it is smooth, then let the bread rise.",
+        )
+        self.url = reverse("course-search")
+
+    def create_course(self, title, description, category, level="beginner"):
+        return Course.objects.create(
+            author=self.author,
+            title=title,
+            description=description,
+            category=category,
+            level=level,
+        )
+
+    def search(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_results_are_ranked(self):
+        results = self.search(q="python")
+
+        # A title match (weight A) ranks above a description match.
+        self.assertEqual(
+            [course["id"] for course in results["courses"]],
+            [self.python.id, self.advanced.id],
+        )
+        self.assertEqual(results["lessons"], [])
+        self.assertIn("<mark>Python</mark>", results["courses"][1]["snippet"])
+
+    def test_stemming_and_lessons(self):
+        results = self.search(q="kneaded breads")
+
+        self.assertEqual(results["courses"], [])
+        lesson = results["lessons"][0]
+        self.assertEqual(lesson["id"], self.lesson.id)
+        self.assertEqual(lesson["course"], self.baking.id)
+        self.assertEqual(lesson["course_title"], "Baking bread")
+        self.assertIn("<mark>Knead</mark>", lesson["snippet"])
+
+    def test_filters(self):
+        results = self.search(q="python", level="advanced")
+        self.assertEqual(
+            [course["id"] for course in results["courses"]], [self.advanced.id]
+        )
+
+        results = self.search(q="bread", category=self.programming.id)
+        self.assertEqual(results, {"courses": [], "lessons": []})
+
+    def test_snippets_are_escaped(self):
+        results = self.search(q="sourdough")
+        self.assertEqual(
+            results["courses"][0]["snippet"],
+            "<mark>Sourdough</mark> &amp; yeast",
+        )
+
+    def test_search_vector_follows_updates(self):
+        self.python.title = "Rust for beginners"
+        self.python.save()
+
+        results = self.search(q="rust")
+        self.assertEqual(
+            [course["id"] for course in results["courses"]], [self.python.id]
+        )
+
+    def test_query_is_required(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_search_runs_in_two_queries(self):
+        with self.assertNumQueries(2):
+            self.search(q="python or bread")
@@ -1,6 +1,7 @@
 from course.models import Answer, Category, Course, Lesson, Module, Question, Quiz
 from django.contrib.auth import get_user_model
 from django.urls import reverse
+from notification.models import FanOutJob
 from rest_framework import status
 from rest_framework.test import APITestCase
 
@@ -88,7 +89,7 @@ class Base(APITestCase):
         response = self.client.post(url, self.course_data, format="json")
         response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
+        self.assertEqual(len(response.data["results"]), 1)
 
     def test_create_module(self):
         self.client.force_authenticate(user=self.user)
@@ -129,6 +130,9 @@ class Base(APITestCase):
         self.assertEqual(Lesson.objects.last().title, "Test Lesson")
         self.assertEqual(Lesson.objects.last().content, "Test content")
         self.assertEqual(Lesson.objects.last().module, module)
+        self.assertEqual(
+            FanOutJob.objects.get(id=response.data["fan_out_job"]).course, course
+        )
 
     def test_create_quiz(self):
         course = Course.objects.create(
@@ -1,22 +1,57 @@
-from core.permissions import IsAdminOrReadOnly, IsAuthorOrReadOnly
+from core.cache import CachedResponseMixin
+from core.conditional import ConditionalGetMixin
+from core.ownership import OwnedFilterBackend, get_owner_id
+from core.parsers import CSVParser, NDJSONParser
+from core.permissions import IsAdmin, IsAdminOrReadOnly, IsAuthorOrReadOnly
+from core.query_plans import QueryPlanMixin
+from course.cache import course_tag, get_course_ids, invalidate_courses
+from course.enrollment import change_enrollments, get_user_ids
+from course.exporter import export_queryset, iter_export
+from course.filters import CourseFilterBackend
+from course.grading import create_attempt, get_answer_key, validate_responses
+from course.importer import CourseTreeImporter
 from course.models import Answer, Category, Course, Lesson, Module, Question, Quiz
+from course.ordering import reorder
+from course.progress import get_course_report, get_percent, mark_lesson
+from course.search import search_catalogue
 from course.serializers import (
     AnswerSerializer,
+    BulkEnrollmentSerializer,
     CategorySerializer,
+    CourseExportSerializer,
+    CourseProgressSerializer,
     CourseSerializer,
+    CourseTreeSerializer,
+    EnrollmentSerializer,
     LessonSerializer,
     ModuleSerializer,
     QuestionSerializer,
+    QuizAttemptSerializer,
     QuizSerializer,
+    QuizSubmissionSerializer,
+    ReorderSerializer,
+    SearchParamsSerializer,
+    SearchResultsSerializer,
 )
+from django.db import transaction
+from django.db.models import Exists, OuterRef, Q
+from django.http import StreamingHttpResponse
+from django.shortcuts import get_object_or_404
 from drf_spectacular.utils import extend_schema
-from notification.models import Notification
-from notification.tasks import send_notification_email
-from rest_framework import viewsets
+from notification.models import FanOutJob
+from notification.tasks import fan_out_notifications
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound, PermissionDenied, ValidationError
+from rest_framework.filters import OrderingFilter
+from rest_framework.parsers import JSONParser
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from user.cache import invalidate_profiles
 
 
 @extend_schema(tags=["Category"])
-class CategoryViewSet(viewsets.ModelViewSet):
+class CategoryViewSet(CachedResponseMixin, viewsets.ModelViewSet):
     """
     Endpoint for managing categories.
 
@@ -30,23 +65,64 @@ class CategoryViewSet(viewsets.ModelViewSet):
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
     permission_classes = [IsAdminOrReadOnly]
+    cache_list_tag = "categories"
+
+    def get_cache_tags(self, items):
+        return ["categories"]
 
 
 @extend_schema(tags=["Course"])
-class CourseViewSet(viewsets.ModelViewSet):
+class CourseViewSet(
+    CachedResponseMixin, ConditionalGetMixin, QueryPlanMixin, viewsets.ModelViewSet
+):
     """
     Endpoint for managing courses.
 
     - GET /courses/: Retrieve a list of all courses.
+      Use `?mine=true` to list only the current user's courses.
     - POST /courses/: Create a new course.
     - GET /courses/{id}/: Retrieve a specific course by ID.
     - PUT/PATCH /courses/{id}/: Update a specific course by ID.
     - DELETE /courses/{id}/: Delete a specific course by ID.
+    - POST /courses/{id}/reorder/: Set the order of all the course's modules.
+    - POST /courses/import/: Create whole course trees from JSON (one tree or a
+      list) or NDJSON (one tree per line).
+    - GET /courses/search/?q=...: Full-text search of the courses and
+      lessons, ranked, with highlighted snippets. Filter with `category` and
+      `level`.
+    - POST /courses/{id}/enroll/: Enroll the current user (DELETE to unenroll).
+    - POST /courses/{id}/enroll/bulk/: Enroll a cohort given as a JSON list of
+      `emails` or a CSV of emails, one per line (DELETE to unenroll it). For
+      the course's author or an admin.
+    - GET /courses/{id}/progress/: The progress of the course's students (its
+      author or an admin).
+    - GET /courses/export/: Stream every course tree as NDJSON (admins only).
+    - GET /courses/{id}/export/: Stream a course tree as NDJSON (its author or
+      an admin). Both exports accept `?after=<id>` to resume after the last
+      exported course and `?gzip=true` to compress the stream.
+
+    Filter the list with `?category=`, `?level=`, `?author=`, `?min_rating=`,
+    `?created_after=` and `?created_before=`, and sort it with
+    `?ordering=-rating_avg` (best rated first) or `?ordering=-student_count`
+    (most popular first). `min_rating` requires the rating ordering and the
+    `created_*` filters the default one.
+
+    GET responses carry `ETag` and `Last-Modified` headers computed from the
+    course's `updated_at`; send them back as `If-None-Match` or
+    `If-Modified-Since` to get a 304 while the course is unchanged.
     """
 
     queryset = Course.objects.all()
+    ordering = ("-created_at", "-id")
+    ordering_fields = ["created_at", "student_count", "rating_avg"]
     serializer_class = CourseSerializer
     permission_classes = [IsAuthorOrReadOnly]
+    filter_backends = [OwnedFilterBackend, CourseFilterBackend, OrderingFilter]
+    cache_list_tag = "courses"
+    validator_field = "updated_at"
+
+    def get_cache_tags(self, items):
+        return [course_tag(item["id"]) for item in items]
 
     def perform_create(self, serializer):
         """
@@ -55,79 +131,457 @@ class CourseViewSet(viewsets.ModelViewSet):
 
         serializer.save(author=self.request.user)
 
+    @extend_schema(request=CourseTreeSerializer(many=True))
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path="import",
+        url_name="import",
+        parser_classes=[JSONParser, NDJSONParser],
+        serializer_class=CourseTreeSerializer,
+    )
+    def import_courses(self, request):
+        """
+        Import course trees authored by the current user in one transaction.
+
+        Returns:
+            Response: The created objects counts and course IDs, or a 400 with
+            the errors of every invalid tree (nothing is created then).
+        """
+
+        trees = request.data
+        if isinstance(trees, dict):
+            trees = [trees]
+
+        result = CourseTreeImporter(request.user).run(trees)
+        if result.errors:
+            return Response(
+                {"errors": result.errors}, status=status.HTTP_400_BAD_REQUEST
+            )
+        return Response(
+            {"created": result.counts, "courses": result.course_ids},
+            status=status.HTTP_201_CREATED,
+        )
+
+    @extend_schema(responses={(200, "application/x-ndjson"): CourseExportSerializer})
+    @action(
+        detail=False,
+        methods=["get"],
+        url_path="export",
+        url_name="export",
+        permission_classes=[IsAdmin],
+    )
+    def export_catalogue(self, request):
+        """
+        Stream the whole catalogue as NDJSON.
+        """
+
+        return self.get_export_response(request)
+
+    @extend_schema(responses={(200, "application/x-ndjson"): CourseExportSerializer})
+    @action(
+        detail=True,
+        methods=["get"],
+        url_path="export",
+        url_name="export-course",
+        permission_classes=[IsAuthenticated],
+    )
+    def export_course(self, request, pk=None):
+        """
+        Stream a single course tree as NDJSON.
+        """
+
+        course = get_object_or_404(Course.objects.only("id", "author_id"), pk=pk)
+        if not IsAdmin().has_permission(request, self) and (
+            get_owner_id(course, request) != request.user.id
+        ):
+            raise PermissionDenied()
+        return self.get_export_response(request, [course.id], f"course-{course.id}")
+
+    @extend_schema(
+        parameters=[SearchParamsSerializer], responses=SearchResultsSerializer
+    )
+    @action(detail=False, methods=["get"])
+    def search(self, request):
+        """
+        Search the catalogue through the `search_vector` GIN indexes.
+        """
+
+        params = SearchParamsSerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        results = search_catalogue(
+            params.validated_data["q"],
+            category=params.validated_data.get("category"),
+            level=params.validated_data.get("level"),
+            limit=params.validated_data["limit"],
+        )
+        return Response(SearchResultsSerializer(results).data)
+
+    @extend_schema(request=None, responses=EnrollmentSerializer)
+    @action(
+        detail=True,
+        methods=["post", "delete"],
+        permission_classes=[IsAuthenticated],
+        serializer_class=EnrollmentSerializer,
+    )
+    def enroll(self, request, pk=None):
+        """
+        Enroll the current user in the course, or unenroll them.
+        """
+
+        course = get_object_or_404(Course.objects.only("id"), pk=pk)
+        if request.method == "POST":
+            course.students.add(request.user)
+        else:
+            course.students.remove(request.user)
+
+        student_count = (
+            Course.objects.filter(pk=course.id)
+            .values_list("student_count", flat=True)
+            .get()
+        )
+        data = {"enrolled": request.method == "POST", "student_count": student_count}
+        return Response(EnrollmentSerializer(data).data)
+
+    @extend_schema(request=BulkEnrollmentSerializer)
+    @action(
+        detail=True,
+        methods=["post", "delete"],
+        url_path="enroll/bulk",
+        url_name="enroll-bulk",
+        permission_classes=[IsAuthenticated],
+        parser_classes=[JSONParser, CSVParser],
+        serializer_class=BulkEnrollmentSerializer,
+    )
+    def bulk_enroll(self, request, pk=None):
+        """
+        Enroll (or unenroll) a cohort of students by email.
+
+        Returns:
+            Response: The number of changed enrollments, the new student count
+            and the emails without a user.
+        """
+
+        course = get_object_or_404(Course.objects.only("id", "author_id"), pk=pk)
+        if not IsAdmin().has_permission(request, self) and (
+            get_owner_id(course, request) != request.user.id
+        ):
+            raise PermissionDenied()
+
+        data = request.data
+        if request.content_type.startswith(CSVParser.media_type):
+            data = {
+                "emails": [
+                    row[0].strip() for row in data if row[0].strip().lower() != "email"
+                ]
+            }
+        serializer = BulkEnrollmentSerializer(data=data)
+        serializer.is_valid(raise_exception=True)
+
+        user_ids, unknown = get_user_ids(serializer.validated_data["emails"])
+        changed, student_count = change_enrollments(
+            course.id, user_ids.values(), enroll=request.method == "POST"
+        )
+        return Response(
+            {"changed": changed, "student_count": student_count, "unknown": unknown}
+        )
+
+    @action(detail=True, methods=["get"], permission_classes=[IsAuthenticated])
+    def progress(self, request, pk=None):
+        """
+        Report how far the course's students got, from one scan of their bitmaps.
+        """
+
+        course = get_object_or_404(Course.objects.only("id", "author_id"), pk=pk)
+        if not IsAdmin().has_permission(request, self) and (
+            get_owner_id(course, request) != request.user.id
+        ):
+            raise PermissionDenied()
+        return Response(get_course_report(course))
+
+    def get_export_response(self, request, course_ids=None, filename="courses"):
+        """
+        Build the streaming response of an export.
+        """
+
+        after = request.query_params.get("after")
+        if after is not None and not after.isdigit():
+            raise ValidationError({"after": "A course ID is required."})
+        compress = request.query_params.get("gzip", "").lower() in ("1", "true", "yes")
+
+        queryset = export_queryset(course_ids, after=after and int(after))
+        filename += ".ndjson.gz" if compress else ".ndjson"
+        response = StreamingHttpResponse(
+            iter_export(queryset, compress=compress),
+            content_type="application/gzip" if compress else "application/x-ndjson",
+        )
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
+
+    @extend_schema(request=ReorderSerializer, responses=ModuleSerializer(many=True))
+    @action(detail=True, methods=["post"], serializer_class=ReorderSerializer)
+    def reorder(self, request, pk=None):
+        """
+        Rewrite the positions of all the course's modules in one UPDATE.
+        """
+
+        course = self.get_object()
+        modules = course.modules.all()
+
+        with transaction.atomic():
+            # Locked like `next_order`: no module is added while validating.
+            Course.objects.select_for_update().values_list("pk").get(pk=course.pk)
+            serializer = ReorderSerializer(
+                data=request.data, context={"children": modules}
+            )
+            serializer.is_valid(raise_exception=True)
+            reorder(modules, serializer.validated_data["ids"])
+            Course.objects.touch([course.id])
+            invalidate_courses([course.id], "modules")
+
+        modules = modules.prefetch_related("lessons")
+        return Response(ModuleSerializer(modules, many=True).data)
+
 
 @extend_schema(tags=["Module"])
-class ModuleViewSet(viewsets.ModelViewSet):
+class ModuleViewSet(
+    CachedResponseMixin, ConditionalGetMixin, QueryPlanMixin, viewsets.ModelViewSet
+):
     """
     Endpoint for managing modules.
 
     - GET /modules/: Retrieve a list of all modules.
+      Use `?mine=true` to list only the current user's modules.
     - POST /modules/: Create a new module.
     - GET /modules/{id}/: Retrieve a specific module by ID.
     - PUT/PATCH /modules/{id}/: Update a specific module by ID.
     - DELETE /modules/{id}/: Delete a specific module by ID.
+    - POST /modules/{id}/reorder/: Set the order of all the module's lessons.
+
+    GET responses carry `ETag` and `Last-Modified` headers computed from the
+    course's `updated_at`; send them back as `If-None-Match` or
+    `If-Modified-Since` to get a 304 while the course is unchanged.
     """
 
     queryset = Module.objects.all()
+    ordering = ("order", "id")
     serializer_class = ModuleSerializer
     permission_classes = [IsAuthorOrReadOnly]
+    filter_backends = [OwnedFilterBackend]
+    cache_list_tag = "modules"
+    validator_field = "course__updated_at"
+
+    def get_cache_tags(self, items):
+        return [course_tag(item["course"]) for item in items]
+
+    @extend_schema(request=ReorderSerializer, responses=LessonSerializer(many=True))
+    @action(detail=True, methods=["post"], serializer_class=ReorderSerializer)
+    def reorder(self, request, pk=None):
+        """
+        Rewrite the positions of all the module's lessons in one UPDATE.
+        """
+
+        module = self.get_object()
+        lessons = module.lessons.all()
+
+        with transaction.atomic():
+            # Locked like `next_order`: no lesson is added while validating.
+            Module.objects.select_for_update().values_list("pk").get(pk=module.pk)
+            serializer = ReorderSerializer(
+                data=request.data, context={"children": lessons}
+            )
+            serializer.is_valid(raise_exception=True)
+            reorder(lessons, serializer.validated_data["ids"])
+            Course.objects.touch([module.course_id])
+            invalidate_courses([module.course_id], "lessons")
+
+        return Response(LessonSerializer(lessons.all(), many=True).data)
 
 
 @extend_schema(tags=["Lesson"])
-class LessonViewSet(viewsets.ModelViewSet):
+class LessonViewSet(
+    CachedResponseMixin, ConditionalGetMixin, QueryPlanMixin, viewsets.ModelViewSet
+):
     """
     Endpoint for managing lessons.
 
     - GET /lessons/: Retrieve a list of all lessons.
+      Use `?mine=true` to list only the current user's lessons.
     - POST /lessons/: Create a new lesson.
     - GET /lessons/{id}/: Retrieve a specific lesson by ID.
     - PUT/PATCH /lessons/{id}/: Update a specific lesson by ID.
     - DELETE /lessons/{id}/: Delete a specific lesson by ID.
+    - POST /lessons/{id}/complete/: Mark the lesson as completed by the
+      current student (DELETE to unmark it) and get their course progress.
+
+    GET responses carry `ETag` and `Last-Modified` headers computed from the
+    course's `updated_at`; send them back as `If-None-Match` or
+    `If-Modified-Since` to get a 304 while the course is unchanged.
     """
 
     queryset = Lesson.objects.all()
+    ordering = ("order", "id")
     serializer_class = LessonSerializer
     permission_classes = [IsAuthorOrReadOnly]
+    filter_backends = [OwnedFilterBackend]
+    cache_list_tag = "lessons"
+    validator_field = "module__course__updated_at"
 
-    def perform_create(self, serializer):
+    def get_cache_tags(self, items):
+        module_ids = {item["module"] for item in items}
+        if not module_ids:
+            return []
+        return map(course_tag, get_course_ids(Module, module_ids))
+
+    def create(self, request, *args, **kwargs):
         """
-        Override the perform_create method to set the author field in the serializer and send a notification email.
+        Expand the create method to return the ID of the notification fan-out job.
+        """
+
+        response = super().create(request, *args, **kwargs)
+        response.data["fan_out_job"] = self.fan_out_job.id
+        return response
+
+    def perform_create(self, serializer):
         """
+        Override the perform_create method to notify the course's students.
 
-        lesson = serializer.save()
+        The notifications are created by a single background fan-out job, so the
+        request takes the same time regardless of the number of students. Its
+        progress is available at /notification/fan-out-jobs/{id}/.
+        """
 
-        students = lesson.module.course.students.all()
-        for student in students:
-            notification = Notification.objects.create(
-                user=student,
-                message=f"New lesson {lesson.title} added to course {lesson.module.course.title}",
+        with transaction.atomic():
+            lesson = serializer.save()
+            course = lesson.module.course
+            self.fan_out_job = FanOutJob.objects.create(
+                course=course,
+                created_by=self.request.user,
+                message=f"New lesson {lesson.title} added to course {course.title}",
             )
-            send_notification_email.delay(notification.id)
+
+        job_id = self.fan_out_job.id
+        transaction.on_commit(lambda: fan_out_notifications.delay(job_id))
+
+    @extend_schema(request=None, responses=CourseProgressSerializer)
+    @action(
+        detail=True,
+        methods=["post", "delete"],
+        permission_classes=[IsAuthenticated],
+        serializer_class=CourseProgressSerializer,
+    )
+    def complete(self, request, pk=None):
+        """
+        Set the lesson's bit in the student's progress bitmap of the course.
+        """
+
+        enrolled = Course.students.through.objects.filter(
+            course=OuterRef("module__course"), user=request.user
+        )
+        lesson = (
+            Lesson.objects.filter(pk=pk)
+            .annotate(enrolled=Exists(enrolled))
+            .values("module__course", "progress_slot", "enrolled")
+            .first()
+        )
+        if lesson is None:
+            raise NotFound()
+        if not lesson["enrolled"]:
+            raise PermissionDenied("Enroll in the course to track your progress.")
+
+        course_id = lesson["module__course"]
+        completed = mark_lesson(
+            request.user,
+            course_id,
+            lesson["progress_slot"],
+            completed=request.method == "POST",
+        )
+        invalidate_profiles([request.user.id])
+
+        total = Lesson.objects.filter(module__course=course_id).count()
+        data = {
+            "course": course_id,
+            "completed_lessons": completed,
+            "total_lessons": total,
+            "percent": get_percent(completed, total),
+        }
+        return Response(CourseProgressSerializer(data).data)
 
 
 @extend_schema(tags=["Quiz"])
-class QuizViewSet(viewsets.ModelViewSet):
+class QuizViewSet(QueryPlanMixin, viewsets.ModelViewSet):
     """
     Endpoint for managing quizzes.
 
     - GET /quizzes/: Retrieve a list of all quizzes.
+      Use `?mine=true` to list only the current user's quizzes.
     - POST /quizzes/: Create a new quiz.
     - GET /quizzes/{id}/: Retrieve a specific quiz by ID.
     - PUT/PATCH /quizzes/{id}/: Update a specific quiz by ID.
     - DELETE /quizzes/{id}/: Delete a specific quiz by ID.
+    - POST /quizzes/{id}/submit/: Submit answers and get the graded attempt.
     """
 
     queryset = Quiz.objects.all()
     serializer_class = QuizSerializer
     permission_classes = [IsAuthorOrReadOnly]
+    filter_backends = [OwnedFilterBackend]
+
+    @extend_schema(
+        request=QuizSubmissionSerializer, responses={201: QuizAttemptSerializer}
+    )
+    @action(
+        detail=True,
+        methods=["post"],
+        permission_classes=[IsAuthenticated],
+        serializer_class=QuizSubmissionSerializer,
+    )
+    def submit(self, request, pk=None):
+        """
+        Grade the submitted answers and store them as an attempt.
+
+        Only the students of the quiz's course, its author and admins may
+        submit. The access check is the only query on top of the inserts:
+        the answers are graded against the cached answer key.
+        """
+
+        serializer = QuizSubmissionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        responses = serializer.validated_data["responses"]
+
+        user = request.user
+        courses = Course.objects.filter(modules__lessons__quiz=OuterRef("pk"))
+        if user.role != "admin":
+            courses = courses.filter(Q(students=user) | Q(author=user))
+        allowed = (
+            Quiz.objects.filter(pk=pk)
+            .annotate(allowed=Exists(courses))
+            .values_list("allowed", flat=True)
+            .first()
+        )
+        if allowed is None:
+            raise NotFound()
+        if not allowed:
+            raise PermissionDenied("Enroll in the course to submit its quizzes.")
+
+        answer_key = get_answer_key(pk)
+        errors = validate_responses(answer_key, responses)
+        if errors:
+            raise ValidationError({"responses": errors})
+
+        attempt = create_attempt(pk, user, responses, answer_key)
+        return Response(
+            QuizAttemptSerializer(attempt).data, status=status.HTTP_201_CREATED
+        )
 
 
 @extend_schema(tags=["Question"])
-class QuestionViewSet(viewsets.ModelViewSet):
+class QuestionViewSet(QueryPlanMixin, viewsets.ModelViewSet):
     """
     Endpoint for managing questions.
 
     - GET /questions/: Retrieve a list of all questions.
+      Use `?mine=true` to list only the current user's questions.
     - POST /questions/: Create a new question.
     - GET /questions/{id}/: Retrieve a specific question by ID.
     - PUT/PATCH /questions/{id}/: Update a specific question by ID.
@@ -137,14 +591,16 @@ class QuestionViewSet(viewsets.ModelViewSet):
     queryset = Question.objects.all()
     serializer_class = QuestionSerializer
     permission_classes = [IsAuthorOrReadOnly]
+    filter_backends = [OwnedFilterBackend]
 
 
 @extend_schema(tags=["Answer"])
-class AnswerViewSet(viewsets.ModelViewSet):
+class AnswerViewSet(QueryPlanMixin, viewsets.ModelViewSet):
     """
     Endpoint for managing answers.
 
     - GET /answers/: Retrieve a list of all answers.
+      Use `?mine=true` to list only the current user's answers.
     - POST /answers/: Create a new answer.
     - GET /answers/{id}/: Retrieve a specific answer by ID.
     - PUT/PATCH /answers/{id}/: Update a specific answer by ID.
@@ -154,3 +610,4 @@ class AnswerViewSet(viewsets.ModelViewSet):
     queryset = Answer.objects.all()
     serializer_class = AnswerSerializer
     permission_classes = [IsAuthorOrReadOnly]
+    filter_backends = [OwnedFilterBackend]
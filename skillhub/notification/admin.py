@@ -1,5 +1,5 @@
 from django.contrib import admin
-from notification.models import Notification
+from notification.models import FanOutJob, Notification
 from notification.tasks import send_notification_email
 
 
@@ -27,3 +27,27 @@ class NotificationAdmin(admin.ModelAdmin):
 
         if not change:
             send_notification_email.delay(obj.id)
+
+
+@admin.register(FanOutJob)
+class FanOutJobAdmin(admin.ModelAdmin):
+    """
+    Custom admin class for monitoring notification fan-out jobs.
+
+    Display the job's ID, course, status, total, processed, created_at
+    Filter by status and created_at.
+    """
+
+    list_display = ("id", "course", "status", "total", "processed", "created_at")
+    list_filter = ("status", "created_at")
+    list_select_related = ("course",)
+    readonly_fields = (
+        "course",
+        "message",
+        "created_by",
+        "status",
+        "total",
+        "processed",
+        "created_at",
+        "finished_at",
+    )
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.3 on 2026-10-18 19:28
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("notification", "0001_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="notification",
+            index=models.Index(
+                fields=["user", "-created_at", "-id"],
+                name="notification_user_created_idx",
+            ),
+        ),
+    ]
@@ -19,5 +19,59 @@ class Notification(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     sent = models.BooleanField(default=False)
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["user", "-created_at", "-id"],
+                name="notification_user_created_idx",
+            ),
+        ]
+
     def __str__(self):
         return f"Notification for {self.user.email}: {self.message[:30]}"
+
+
+class FanOutJob(models.Model):
+    """
+    A background job that notifies every student of a course.
+
+    - `course`: The course whose students are notified.
+    - `message`: The message of the notifications.
+    - `created_by`: The user who triggered the job.
+    - `status`: The status of the job (pending, running, done, failed).
+    - `total`: The number of students to notify.
+    - `processed`: The number of students notified so far.
+    - `created_at`: The date and time when the job was created.
+    - `finished_at`: The date and time when the job finished.
+    """
+
+    class Status(models.TextChoices):
+        PENDING = "pending", "Pending"
+        RUNNING = "running", "Running"
+        DONE = "done", "Done"
+        FAILED = "failed", "Failed"
+
+    course = models.ForeignKey(
+        "course.Course", on_delete=models.CASCADE, related_name="fan_out_jobs"
+    )
+    message = models.CharField(max_length=255)
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name="fan_out_jobs",
+    )
+    status = models.CharField(
+        max_length=20, choices=Status.choices, default=Status.PENDING
+    )
+    total = models.PositiveIntegerField(default=0)
+    processed = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        verbose_name = "Fan-out Job"
+        verbose_name_plural = "Fan-out Jobs"
+
+    def __str__(self):
+        return f"Fan-out job #{self.pk} for course {self.course_id} ({self.status})"
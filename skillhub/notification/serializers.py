@@ -1,4 +1,4 @@
-from notification.models import Notification
+from notification.models import FanOutJob, Notification
 from rest_framework import serializers
 
 
@@ -16,3 +16,45 @@ class NotificationSerializer(serializers.ModelSerializer):
     class Meta:
         model = Notification
         fields = ["id", "user", "message", "created_at", "sent"]
+
+
+class FanOutJobSerializer(serializers.ModelSerializer):
+    """
+    Fan-out job serializer for tracking the progress of notification fan-outs.
+
+    - `id`: The ID of the job.
+    - `course`: The course whose students are notified.
+    - `message`: The message of the notifications.
+    - `status`: The status of the job.
+    - `total`: The number of students to notify.
+    - `processed`: The number of students notified so far.
+    - `progress`: The share of processed students in percent.
+    - `created_at`: The date and time when the job was created.
+    - `finished_at`: The date and time when the job finished.
+    """
+
+    progress = serializers.SerializerMethodField()
+
+    class Meta:
+        model = FanOutJob
+        fields = [
+            "id",
+            "course",
+            "message",
+            "status",
+            "total",
+            "processed",
+            "progress",
+            "created_at",
+            "finished_at",
+        ]
+        read_only_fields = fields
+
+    def get_progress(self, obj):
+        """
+        Return the share of processed students in percent.
+        """
+
+        if obj.status == FanOutJob.Status.DONE:
+            return 100
+        return round(obj.processed * 100 / obj.total, 1) if obj.total else 0
@@ -1,14 +1,28 @@
 from celery import shared_task
+from celery.signals import worker_process_shutdown
 from celery.utils.log import get_task_logger
 from core.email_utils import EmailService
+from course.models import Course
+from django.conf import settings
 from django.core.exceptions import ObjectDoesNotExist
-from notification.models import Notification
+from django.db.models import F
+from django.utils import timezone
+from notification.models import FanOutJob, Notification
 
 logger = get_task_logger(__name__)
 
 email_service = EmailService()
 
 
+@worker_process_shutdown.connect
+def close_email_connection(**kwargs):
+    """
+    Close the worker process's persistent SMTP connection on shutdown.
+    """
+
+    email_service.close()
+
+
 @shared_task
 def send_notification_email(notification_id):
     """
@@ -48,3 +62,116 @@ def send_notification_email(notification_id):
         logger.error(f"Notification with id {notification_id} does not exist")
     except Exception as e:
         logger.error(f"Error sending notification email: {e}")
+
+
+@shared_task
+def send_notification_emails(notification_ids):
+    """
+    Send the notification emails of a batch of notifications.
+
+    All emails are sent over the worker's persistent SMTP connection and every
+    delivered notification is marked as sent with a single UPDATE.
+
+    Args:
+        notification_ids: The IDs of the notifications to send.
+
+    Returns:
+        int: The number of delivered emails.
+    """
+
+    logger.info(
+        f"Sending notification emails for {len(notification_ids)} notifications"
+    )
+
+    notifications = Notification.objects.filter(
+        id__in=notification_ids, sent=False
+    ).select_related("user")
+    messages = {
+        email_service.build_message(
+            subject="notification.title",
+            message=notification.message,
+            to_email=notification.user.email,
+        ): notification.id
+        for notification in notifications
+    }
+
+    delivered = email_service.send_messages(list(messages))
+    Notification.objects.filter(id__in=[messages[m] for m in delivered]).update(
+        sent=True
+    )
+
+    logger.info(
+        f"Sent {len(delivered)} of {len(messages)} notification emails successfully"
+    )
+    return len(delivered)
+
+
+@shared_task
+def fan_out_notifications(job_id):
+    """
+    Create a notification for every student of the job's course and queue the emails.
+
+    Students are read in keyset-paginated chunks of
+    `NOTIFICATION_FAN_OUT_CHUNK_SIZE` IDs, every chunk is written with one
+    `bulk_create` and its emails are queued in batches of
+    `NOTIFICATION_EMAIL_BATCH_SIZE` notifications per task. The job's
+    `processed` counter is advanced after every chunk.
+
+    Emails are sent by `send_notification_emails`.
+
+    Args:
+        job_id: The ID of the fan-out job to run.
+
+    Returns:
+        None
+    """
+
+    try:
+        job = FanOutJob.objects.get(id=job_id)
+    except ObjectDoesNotExist:
+        logger.error(f"Fan-out job with id {job_id} does not exist")
+        return
+
+    enrollments = Course.students.through.objects.filter(course_id=job.course_id)
+    FanOutJob.objects.filter(id=job_id).update(
+        status=FanOutJob.Status.RUNNING, total=enrollments.count()
+    )
+    logger.info(f"Running fan-out job with id {job_id}")
+
+    chunk_size = settings.NOTIFICATION_FAN_OUT_CHUNK_SIZE
+    last_user_id = 0
+    try:
+        while True:
+            user_ids = list(
+                enrollments.filter(user_id__gt=last_user_id)
+                .order_by("user_id")
+                .values_list("user_id", flat=True)[:chunk_size]
+            )
+            if not user_ids:
+                break
+
+            notifications = Notification.objects.bulk_create(
+                Notification(user_id=user_id, message=job.message)
+                for user_id in user_ids
+            )
+            batch_size = settings.NOTIFICATION_EMAIL_BATCH_SIZE
+            for start in range(0, len(notifications), batch_size):
+                send_notification_emails.delay(
+                    [n.id for n in notifications[start : start + batch_size]]
+                )
+
+            FanOutJob.objects.filter(id=job_id).update(
+                processed=F("processed") + len(user_ids)
+            )
+            last_user_id = user_ids[-1]
+    except Exception as e:
+        logger.error(f"Error running fan-out job with id {job_id}: {e}")
+        FanOutJob.objects.filter(id=job_id).update(
+            status=FanOutJob.Status.FAILED, finished_at=timezone.now()
+        )
+        raise
+
+    FanOutJob.objects.filter(id=job_id).update(
+        status=FanOutJob.Status.DONE, finished_at=timezone.now()
+    )
+    logger.info(f"Fan-out job with id {job_id} finished")
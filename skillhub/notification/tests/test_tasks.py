@@ -0,0 +1,130 @@
+import smtplib
+from unittest.mock import patch
+
+from core import email_utils
+from course.models import Category, Course
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.test import TestCase, override_settings
+from notification.models import FanOutJob, Notification
+from notification.tasks import (
+    email_service,
+    fan_out_notifications,
+    send_notification_emails,
+)
+
+User = get_user_model()
+
+
+@override_settings(NOTIFICATION_FAN_OUT_CHUNK_SIZE=2, NOTIFICATION_EMAIL_BATCH_SIZE=2)
+class FanOutNotificationsTest(TestCase):
+    def setUp(self):
+        self.author = User.objects.create_user(
+            email="author@example.com",
+            password="strong_password_12",
+            full_name="Author",
+            role="instructor",
+        )
+        self.course = Course.objects.create(
+            author=self.author,
+            title="Test Course",
+            category=Category.objects.create(name="Test Category"),
+            level="beginner",
+        )
+        self.students = [
+            User.objects.create_user(
+                email=f"student{i}@example.com",
+                password="strong_password_12",
+                full_name=f"Student {i}",
+            )
+            for i in range(5)
+        ]
+        self.course.students.add(*self.students)
+        self.job = FanOutJob.objects.create(
+            course=self.course, created_by=self.author, message="New lesson"
+        )
+
+    @patch("notification.tasks.send_notification_emails.delay")
+    def test_fan_out_notifications(self, mocked_task):
+        fan_out_notifications(self.job.id)
+
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.status, FanOutJob.Status.DONE)
+        self.assertEqual(self.job.total, 5)
+        self.assertEqual(self.job.processed, 5)
+        self.assertIsNotNone(self.job.finished_at)
+
+        notifications = Notification.objects.filter(message="New lesson")
+        self.assertEqual(
+            set(notifications.values_list("user_id", flat=True)),
+            {student.id for student in self.students},
+        )
+
+        self.assertEqual(mocked_task.call_count, 3)
+        queued = [pk for call in mocked_task.call_args_list for pk in call[0][0]]
+        self.assertEqual(
+            sorted(queued), sorted(notifications.values_list("id", flat=True))
+        )
+
+    @patch("notification.tasks.send_notification_emails.delay")
+    def test_fan_out_query_count_is_per_chunk(self, mocked_task):
+        # Setup: load the job, count the students, mark it running.
+        # Per chunk: select IDs, bulk insert, update progress.
+        # Finish: the final empty select and the status update.
+        with self.assertNumQueries(3 + 3 * 3 + 2):
+            fan_out_notifications(self.job.id)
+
+
+class SendNotificationEmailsTest(TestCase):
+    def setUp(self):
+        self.users = [
+            User.objects.create_user(
+                email=f"user{i}@example.com",
+                password="strong_password_12",
+                full_name=f"User {i}",
+            )
+            for i in range(3)
+        ]
+        self.notifications = Notification.objects.bulk_create(
+            Notification(user=user, message="Hello") for user in self.users
+        )
+        email_service.close()
+
+    def test_send_notification_emails(self):
+        ids = [notification.id for notification in self.notifications]
+
+        # Load the notifications, then one UPDATE for all delivered rows.
+        with self.assertNumQueries(2):
+            delivered = send_notification_emails(ids)
+
+        self.assertEqual(delivered, 3)
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertEqual(
+            {message.to[0] for message in mail.outbox},
+            {user.email for user in self.users},
+        )
+        self.assertEqual(Notification.objects.filter(sent=True).count(), 3)
+
+    def test_connection_is_reused(self):
+        ids = [notification.id for notification in self.notifications]
+
+        with patch(
+            "core.email_utils.get_connection", wraps=email_utils.get_connection
+        ) as mocked_connection:
+            send_notification_emails(ids[:2])
+            send_notification_emails(ids[2:])
+
+        mocked_connection.assert_called_once()
+
+    def test_reconnect_after_disconnect(self):
+        connection = email_service.get_connection()
+        with patch.object(
+            connection,
+            "send_messages",
+            side_effect=smtplib.SMTPServerDisconnected("gone"),
+        ):
+            delivered = send_notification_emails([self.notifications[0].id])
+
+        self.assertEqual(delivered, 1)
+        self.assertIsNot(email_service.get_connection(), connection)
+        self.assertTrue(Notification.objects.get(id=self.notifications[0].id).sent)
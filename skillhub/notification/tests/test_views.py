@@ -1,8 +1,9 @@
 from unittest.mock import patch
 
+from course.models import Category, Course
 from django.contrib.auth import get_user_model
 from django.urls import reverse
-from notification.models import Notification
+from notification.models import FanOutJob, Notification
 from rest_framework import status
 from rest_framework.test import APITestCase
 
@@ -48,9 +49,68 @@ class NotificationListTest(BaseTest):
         self.client.post(self.url, self.notification_data, format="json")
         response = self.client.get(self.url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
-        self.assertEqual(response.data[0]["user"], self.user.id)
-        self.assertEqual(response.data[0]["message"], "This is a test notification")
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertEqual(response.data["results"][0]["user"], self.user.id)
+        self.assertEqual(
+            response.data["results"][0]["message"], "This is a test notification"
+        )
         notification = Notification.objects.get(user=self.user)
         self.assertEqual(notification.user, self.user)
         self.assertEqual(notification.message, "This is a test notification")
+
+
+class FanOutJobTest(BaseTest):
+    def test_get_fan_out_job_progress(self):
+        course = Course.objects.create(
+            author=self.user,
+            title="Test Course",
+            category=Category.objects.create(name="Test Category"),
+            level="beginner",
+        )
+        job = FanOutJob.objects.create(
+            course=course,
+            created_by=self.user,
+            message="New lesson",
+            status=FanOutJob.Status.RUNNING,
+            total=200,
+            processed=50,
+        )
+
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(reverse("fan-out-job-detail", args=[job.id]))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["status"], "running")
+        self.assertEqual(response.data["progress"], 25)
+
+    def test_fan_out_jobs_of_other_users_are_hidden(self):
+        other = User.objects.create_user(
+            email="other@example.com",
+            password="strong_password_12",
+            full_name="Other",
+            role="instructor",
+        )
+        course = Course.objects.create(
+            author=other,
+            title="Test Course",
+            category=Category.objects.create(name="Test Category"),
+            level="beginner",
+        )
+        job = FanOutJob.objects.create(
+            course=course, created_by=other, message="New lesson"
+        )
+
+        self.client.force_authenticate(user=other)
+        self.assertEqual(
+            self.client.get(reverse("fan-out-job-detail", args=[job.id])).status_code,
+            status.HTTP_200_OK,
+        )
+        stranger = User.objects.create_user(
+            email="stranger@example.com",
+            password="strong_password_12",
+            full_name="Stranger",
+        )
+        self.client.force_authenticate(user=stranger)
+        self.assertEqual(
+            self.client.get(reverse("fan-out-job-detail", args=[job.id])).status_code,
+            status.HTTP_404_NOT_FOUND,
+        )
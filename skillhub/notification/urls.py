@@ -1,9 +1,10 @@
-from notification.views import NotificationViewSet
+from notification.views import FanOutJobViewSet, NotificationViewSet
 from rest_framework.routers import DefaultRouter
 
 router = DefaultRouter()
 
 router.register(r"notifications", NotificationViewSet, basename="notification")
+router.register(r"fan-out-jobs", FanOutJobViewSet, basename="fan-out-job")
 
 urlpatterns = [
     *router.urls,
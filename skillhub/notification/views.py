@@ -1,9 +1,10 @@
 from core.permissions import IsAdminOrReadOnly
 from drf_spectacular.utils import extend_schema
-from notification.models import Notification
-from notification.serializers import NotificationSerializer
+from notification.models import FanOutJob, Notification
+from notification.serializers import FanOutJobSerializer, NotificationSerializer
 from notification.tasks import send_notification_email
 from rest_framework import viewsets
+from rest_framework.permissions import IsAuthenticated
 
 
 @extend_schema(tags=["Notification"])
@@ -20,6 +21,7 @@ class NotificationViewSet(viewsets.ModelViewSet):
 
     serializer_class = NotificationSerializer
     permission_classes = [IsAdminOrReadOnly]
+    ordering = ("-created_at", "-id")
 
     def get_queryset(self):
         """
@@ -27,7 +29,7 @@ class NotificationViewSet(viewsets.ModelViewSet):
         """
 
         return Notification.objects.filter(user=self.request.user).order_by(
-            "-created_at"
+            *self.ordering
         )
 
     def perform_create(self, serializer):
@@ -40,3 +42,29 @@ class NotificationViewSet(viewsets.ModelViewSet):
         serializer.save(user_id=user_id if user_id else self.request.user.id)
 
         send_notification_email.delay(serializer.instance.id)
+
+
+@extend_schema(tags=["Notification"])
+class FanOutJobViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    Endpoint for tracking notification fan-out jobs.
+
+    - GET /fan-out-jobs/: Retrieve a list of the user's fan-out jobs.
+    - GET /fan-out-jobs/{id}/: Retrieve the progress of a specific fan-out job.
+    """
+
+    serializer_class = FanOutJobSerializer
+    permission_classes = [IsAuthenticated]
+    ordering = ("-created_at", "-id")
+
+    def get_queryset(self):
+        """
+        Customize the queryset to the jobs started by the authenticated user.
+
+        Admins can see every job.
+        """
+
+        queryset = FanOutJob.objects.all()
+        if self.request.user.role != "admin":
+            queryset = queryset.filter(created_by=self.request.user)
+        return queryset
@@ -1,4 +1,6 @@
+from course.models import Course
 from django.contrib import admin
+from django.db import transaction
 from review.models import Review
 
 
@@ -11,9 +13,44 @@ class ReviewAdmin(admin.ModelAdmin):
     Filter by course, user, and rating.
     Search by course title, user email, review title
     Ordering by the creation date.
+    Keep the course's rating summary up to date on every change.
     """
 
     list_display = ("id", "course", "user", "rating", "title", "content")
     list_filter = ("course", "user", "rating")
     search_fields = ("course__title", "user__email", "title")
     ordering = ("-created_at",)
+    list_select_related = ("course", "user")
+
+    @transaction.atomic
+    def save_model(self, request, obj, form, change):
+        """
+        Expand the save_model method to update the course's rating summary.
+        """
+
+        if change:
+            old = Review.objects.lock_rating(obj.pk)
+            Course.objects.apply_rating(*old, delta=-1)
+
+        super().save_model(request, obj, form, change)
+
+        Course.objects.apply_rating(obj.course_id, obj.rating)
+
+    @transaction.atomic
+    def delete_model(self, request, obj):
+        """
+        Expand the delete_model method to update the course's rating summary.
+        """
+
+        Course.objects.apply_rating(*Review.objects.lock_rating(obj.pk), delta=-1)
+        super().delete_model(request, obj)
+
+    @transaction.atomic
+    def delete_queryset(self, request, queryset):
+        """
+        Expand the bulk delete action to rebuild the affected rating summaries.
+        """
+
+        course_ids = list(queryset.values_list("course_id", flat=True).distinct())
+        super().delete_queryset(request, queryset)
+        Course.objects.rebuild_ratings(course_ids)
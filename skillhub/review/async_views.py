@@ -0,0 +1,18 @@
+from core.async_views import AsyncReadView
+from rest_framework.permissions import IsAuthenticated
+from review.models import Review
+from review.serializers import ReviewSerializer
+
+
+class AsyncReviewView(AsyncReadView):
+    """
+    Async read-only endpoint for the reviews, for authenticated users.
+
+    - GET /catalogue/reviews/: The review list, newest first.
+    - GET /catalogue/reviews/{id}/: A specific review by ID.
+    """
+
+    queryset = Review.objects.all()
+    serializer_class = ReviewSerializer
+    permission_classes = [IsAuthenticated]
+    ordering = ("-created_at", "-id")
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.3 on 2026-10-18 19:28
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("course", "0004_course_course_created_id_idx_and_more"),
+        ("review", "0001_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="review",
+            index=models.Index(
+                fields=["-created_at", "-id"], name="review_created_id_idx"
+            ),
+        ),
+    ]
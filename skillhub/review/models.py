@@ -3,6 +3,32 @@ from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
 
 
+class ReviewManager(models.Manager):
+    """
+    Manager for the Review model.
+    """
+
+    def lock_rating(self, review_id):
+        """
+        Lock a review's row until the end of the transaction and return its
+        stored course ID and rating.
+
+        Must be called inside a transaction, before moving the rating in the
+        course's rating summary: a loaded review may be stale, and a
+        concurrent update committed since it was read would otherwise be
+        moved out of the summary with the rating it replaced.
+
+        Raises:
+            Review.DoesNotExist: If the review was deleted.
+        """
+
+        return (
+            self.select_for_update()
+            .values_list("course_id", "rating")
+            .get(pk=review_id)
+        )
+
+
 class Review(models.Model):
     """
     Review model for course reviews.
@@ -28,10 +54,15 @@ class Review(models.Model):
         "course.Course", on_delete=models.CASCADE, related_name="reviews"
     )
 
+    objects = ReviewManager()
+
     class Meta:
         verbose_name = "Review"
         verbose_name_plural = "Reviews"
         ordering = ("-created_at",)
+        indexes = [
+            models.Index(fields=["-created_at", "-id"], name="review_created_id_idx"),
+        ]
 
     def __str__(self):
         return f"{self.title} (f{self.rating}/5)"
@@ -0,0 +1,13 @@
+from course.cache import invalidate_courses
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from review.models import Review
+
+
+@receiver([post_save, post_delete], sender=Review)
+def invalidate_reviewed_course(sender, instance, **kwargs):
+    """
+    Invalidate the cached responses of a course when its rating changes.
+    """
+
+    invalidate_courses([instance.course_id])
@@ -1,9 +1,19 @@
+from io import StringIO
+from unittest.mock import patch
+
 from course.models import Category, Course
+from django.contrib import admin
 from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+from review.admin import ReviewAdmin
 from review.models import Review
+from review.views import ReviewViewSet
 
 User = get_user_model()
 
@@ -71,12 +81,14 @@ class ReviewListTest(BaseTest):
         response = self.client.get(self.url)
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
-        self.assertEqual(response.data[0]["rating"], 5)
-        self.assertEqual(response.data[0]["title"], "Great course!")
-        self.assertEqual(response.data[0]["content"], "Great course!")
-        self.assertEqual(response.data[0]["user"], str(self.user))
-        self.assertEqual(response.data[0]["course"]["title"], self.course.title)
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertEqual(response.data["results"][0]["rating"], 5)
+        self.assertEqual(response.data["results"][0]["title"], "Great course!")
+        self.assertEqual(response.data["results"][0]["content"], "Great course!")
+        self.assertEqual(response.data["results"][0]["user"], str(self.user))
+        self.assertEqual(
+            response.data["results"][0]["course"]["title"], self.course.title
+        )
 
     def test_get_review(self):
         self.client.force_authenticate(user=self.user)
@@ -92,3 +104,137 @@ class ReviewListTest(BaseTest):
         self.assertEqual(response.data["user"], str(self.user))
         self.assertEqual(response.data["course"]["title"], self.course.title)
         self.assertEqual(response.data["course"]["id"], self.course.id)
+
+
+class AsyncReviewListTest(BaseTest):
+    def test_requires_authentication(self):
+        response = self.client.get(reverse("catalogue-review-list"))
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertIn("WWW-Authenticate", response)
+
+    def test_list_and_get_with_a_token(self):
+        self.client.force_authenticate(user=self.user)
+        review = self.client.post(self.url, self.review_data, format="json").data
+        self.client.force_authenticate(user=None)
+        token = str(RefreshToken.for_user(self.user).access_token)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+        response = self.client.get(reverse("catalogue-review-list"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [item["id"] for item in response.json()["results"]], [review["id"]]
+        )
+
+        url = reverse("catalogue-review-detail", args=[review["id"]])
+        response = self.client.get(url)
+        self.assertEqual(response.json()["course"]["title"], self.course.title)
+
+
+class CourseRatingSummaryTest(BaseTest):
+    def setUp(self):
+        super().setUp()
+        self.client.force_authenticate(user=self.user)
+
+    def test_create_review_updates_summary(self):
+        self.client.post(self.url, self.review_data, format="json")
+        self.client.post(self.url, {**self.review_data, "rating": 2}, format="json")
+
+        self.course.refresh_from_db()
+        self.assertEqual(self.course.rating_count, 2)
+        self.assertEqual(self.course.rating_sum, 7)
+        self.assertEqual(self.course.rating_avg, 3.5)
+        self.assertEqual(self.course.rating_5, 1)
+        self.assertEqual(self.course.rating_2, 1)
+
+    def test_update_review_moves_rating(self):
+        response = self.client.post(self.url, self.review_data, format="json")
+        url = reverse("review-detail", args=[response.data["id"]])
+
+        self.client.patch(url, {"rating": 3}, format="json")
+
+        self.course.refresh_from_db()
+        self.assertEqual(self.course.rating_count, 1)
+        self.assertEqual(self.course.rating_avg, 3)
+        self.assertEqual(self.course.rating_5, 0)
+        self.assertEqual(self.course.rating_3, 1)
+
+    def test_update_moves_the_stored_rating(self):
+        response = self.client.post(self.url, self.review_data, format="json")
+        url = reverse("review-detail", args=[response.data["id"]])
+        stale = Review.objects.get(pk=response.data["id"])
+        # A concurrent update committed after the review was loaded.
+        self.client.patch(url, {"rating": 4}, format="json")
+
+        with patch.object(ReviewViewSet, "get_object", return_value=stale):
+            self.client.patch(url, {"rating": 3}, format="json")
+
+        self.course.refresh_from_db()
+        self.assertEqual(self.course.rating_count, 1)
+        self.assertEqual(self.course.rating_sum, 3)
+        self.assertEqual(self.course.rating_5, 0)
+        self.assertEqual(self.course.rating_4, 0)
+        self.assertEqual(self.course.rating_3, 1)
+
+    def assertLocksReview(self, queries):
+        self.assertTrue(
+            any(
+                'FROM "review_review"' in query["sql"] and "FOR UPDATE" in query["sql"]
+                for query in queries.captured_queries
+            )
+        )
+
+    def test_admin_moves_the_locked_rating(self):
+        response = self.client.post(self.url, self.review_data, format="json")
+        review = Review.objects.get(pk=response.data["id"])
+        review_admin = ReviewAdmin(Review, admin.site)
+
+        review.rating = 3
+        with CaptureQueriesContext(connection) as queries:
+            review_admin.save_model(None, review, None, change=True)
+        self.assertLocksReview(queries)
+        with CaptureQueriesContext(connection) as queries:
+            review_admin.delete_model(None, review)
+        self.assertLocksReview(queries)
+
+        self.course.refresh_from_db()
+        self.assertEqual(self.course.rating_count, 0)
+        self.assertEqual(self.course.rating_sum, 0)
+        self.assertEqual(self.course.rating_5, 0)
+        self.assertEqual(self.course.rating_3, 0)
+
+    def test_delete_review_removes_rating(self):
+        response = self.client.post(self.url, self.review_data, format="json")
+        url = reverse("review-detail", args=[response.data["id"]])
+
+        self.client.delete(url)
+
+        self.course.refresh_from_db()
+        self.assertEqual(self.course.rating_count, 0)
+        self.assertEqual(self.course.rating_sum, 0)
+        self.assertEqual(self.course.rating_avg, 0)
+
+    def test_rebuild_ratings(self):
+        Review.objects.create(
+            user=self.user, course=self.course, rating=4, title="t", content="c"
+        )
+        Review.objects.create(
+            user=self.user, course=self.course, rating=1, title="t", content="c"
+        )
+
+        call_command("rebuild_course_ratings", stdout=StringIO())
+
+        self.course.refresh_from_db()
+        self.assertEqual(self.course.rating_count, 2)
+        self.assertEqual(self.course.rating_avg, 2.5)
+        self.assertEqual(self.course.rating_4, 1)
+        self.assertEqual(self.course.rating_1, 1)
+
+    def test_course_save_keeps_summary(self):
+        self.client.post(self.url, self.review_data, format="json")
+
+        self.course.title = "Renamed"
+        self.course.save()
+
+        self.course.refresh_from_db()
+        self.assertEqual(self.course.rating_count, 1)
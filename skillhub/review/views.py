@@ -1,3 +1,7 @@
+from core.query_plans import QueryPlanMixin
+from course.models import Course
+from django.db import transaction
+from django.http import Http404
 from drf_spectacular.utils import extend_schema
 from rest_framework import viewsets
 from rest_framework.permissions import IsAuthenticated
@@ -6,7 +10,7 @@ from review.serializers import ReviewSerializer
 
 
 @extend_schema(tags=["Review"])
-class ReviewViewSet(viewsets.ModelViewSet):
+class ReviewViewSet(QueryPlanMixin, viewsets.ModelViewSet):
     """
     Endpoint for managing reviews.
 
@@ -15,14 +19,54 @@ class ReviewViewSet(viewsets.ModelViewSet):
     - GET /reviews/{id}/: Retrieve a specific review by ID.
     - PUT/PATCH /reviews/{id}/: Update a specific review by ID.
     - DELETE /reviews/{id}/: Delete a specific review by ID.
+
+    Every write keeps the course's rating summary up to date in the same
+    transaction.
     """
 
     queryset = Review.objects.all()
+    ordering = ("-created_at", "-id")
     serializer_class = ReviewSerializer
     permission_classes = [IsAuthenticated]
 
+    @transaction.atomic
     def perform_create(self, serializer):
         """
-        Override the perform_create method to set the user field in the serializer.
+        Override the perform_create method to set the user field in the serializer
+        and add the rating to the course's rating summary.
+        """
+        review = serializer.save(user=self.request.user)
+        Course.objects.apply_rating(review.course_id, review.rating)
+
+    @transaction.atomic
+    def perform_update(self, serializer):
+        """
+        Override the perform_update method to move the rating in the course's
+        rating summary when the rating or the course changes.
+        """
+        old_course_id, old_rating = self.lock_rating(serializer.instance)
+
+        review = serializer.save()
+
+        if (old_course_id, old_rating) != (review.course_id, review.rating):
+            Course.objects.apply_rating(old_course_id, old_rating, delta=-1)
+            Course.objects.apply_rating(review.course_id, review.rating)
+
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        """
+        Override the perform_destroy method to remove the rating from the
+        course's rating summary.
+        """
+        course_id, rating = self.lock_rating(instance)
+        Course.objects.apply_rating(course_id, rating, delta=-1)
+        instance.delete()
+
+    def lock_rating(self, review):
+        """
+        Lock the review's row and return its stored course ID and rating.
         """
-        serializer.save(user=self.request.user)
+        try:
+            return Review.objects.lock_rating(review.pk)
+        except Review.DoesNotExist:
+            raise Http404
@@ -11,10 +11,11 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
 import os
+import sys
 from datetime import timedelta
 from pathlib import Path
 
-from decouple import Config, RepositoryEnv
+from decouple import Config, Csv, RepositoryEnv
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -45,7 +46,9 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     # apps
+    "core.apps.CoreConfig",
     "api.apps.ApiConfig",
     "user.apps.UserConfig",
     "course.apps.CourseConfig",
@@ -59,6 +62,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "core.metrics.MetricsMiddleware",
+    "core.db_router.ReplicaRoutingMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -91,6 +96,23 @@ WSGI_APPLICATION = "skillhub.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# Type of this process, which sizes its connection pool: "web" or "worker"
+# (set by the Celery services).
+PROCESS_TYPE = os.environ.get("SKILLHUB_PROCESS_TYPE", "web")
+
+# Whether the processes keep their connections in a psycopg pool. Without a
+# pool, a connection is kept for DB_CONN_MAX_AGE seconds instead.
+DB_POOL = config("DB_POOL", default=True, cast=bool)
+
+# Number of connections per process of each type: a pool keeps `min_size`
+# connections open and opens up to `max_size`. A sync web worker or a Celery
+# worker process uses one connection at a time; an ASGI worker one per
+# concurrent request reading the database.
+DB_POOL_SIZES = {
+    "web": {"min_size": 2, "max_size": 10},
+    "worker": {"min_size": 1, "max_size": 2},
+}
+
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.postgresql",
@@ -99,9 +121,62 @@ DATABASES = {
         "PASSWORD": config.get("DB_PASSWORD"),
         "HOST": config.get("DB_HOST"),
         "PORT": config.get("DB_PORT"),
+        # Checks a connection before reusing it, also when taken from a pool.
+        "CONN_HEALTH_CHECKS": True,
+        "CONN_MAX_AGE": (
+            0 if DB_POOL else config("DB_CONN_MAX_AGE", default=60, cast=int)
+        ),
+        "OPTIONS": {
+            "pool": (
+                {
+                    **DB_POOL_SIZES[PROCESS_TYPE],
+                    "name": PROCESS_TYPE,
+                    # Seconds a request waits for a free connection.
+                    "timeout": 10,
+                    # Seconds after which a connection above `min_size` is
+                    # closed when idle, and any connection is replaced.
+                    "max_idle": 300,
+                    "max_lifetime": 1800,
+                }
+                if DB_POOL
+                else False
+            ),
+        },
     }
 }
 
+# Read replicas of "default", as comma-separated `host[:port][/name]` (the
+# user and password are the primary's). Replicas are never migrated: locally,
+# a copy of the database works, e.g. `createdb -T skillhub skillhub_replica`
+# with DB_REPLICAS=localhost/skillhub_replica.
+for index, replica in enumerate(config("DB_REPLICAS", default="", cast=Csv()), 1):
+    address, _, name = replica.partition("/")
+    host, _, port = address.partition(":")
+    DATABASES[f"replica_{index}"] = {
+        **DATABASES["default"],
+        "HOST": host,
+        "PORT": port or DATABASES["default"]["PORT"],
+        "NAME": name or DATABASES["default"]["NAME"],
+        "OPTIONS": {**DATABASES["default"]["OPTIONS"]},
+        # The tests read the primary's test database through the replicas.
+        "TEST": {"MIRROR": "default"},
+    }
+
+# Aliases the reads of safe requests are spread over (see `core.db_router`).
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != "default"]
+DATABASE_ROUTERS = ["core.db_router.ReplicaRouter"]
+
+# Seconds a user reads from the primary after a write, to read their writes.
+DB_REPLICA_STICKY_SECONDS = 10
+
+# Views whose reads always go to the primary, as dotted paths of a view
+# class, e.g. "course.views.CourseViewSet", or of a viewset action, e.g.
+# "course.views.CourseViewSet.progress".
+DB_REPLICA_PINNED_VIEWS = []
+
+# Seconds between two publications of a process's pool statistics.
+DB_POOL_STATS_INTERVAL = 10
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -153,6 +228,8 @@ REST_FRAMEWORK = {
         "rest_framework.permissions.IsAuthenticated",
     ],
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    "DEFAULT_PAGINATION_CLASS": "core.pagination.KeysetCursorPagination",
+    "PAGE_SIZE": 20,
 }
 
 SIMPLE_JWT = {
@@ -177,6 +254,13 @@ LOGGING = {
         },
         "mongo": {
             "class": "core.mongo_logger.MongoHandler",
+            "capacity": 10000,
+            "batch_size": 500,
+            "flush_interval": 1.0,
+            "overflow": "drop_newest",
+            "spool_dir": os.path.join(BASE_DIR, "logs", "mongo_spool"),
+            "retry_interval": 30.0,
+            "server_selection_timeout": 2000,
         },
     },
     "root": {
@@ -192,11 +276,53 @@ MEDIA_URL = "/media/"
 MEDIA_ROOT = os.path.join(BASE_DIR, "media")
 
 
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": config("REDIS_CACHE_URL", default="redis://localhost:6379/1"),
+    }
+}
+
+# The tests clear the cache: they run on a local one, without Redis.
+if sys.argv[1:2] == ["test"]:
+    CACHES["default"] = {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+
+# Lifetime in seconds of a cached anonymous catalogue response.
+RESPONSE_CACHE_TIMEOUT = 300
+
+
 CELERY_BROKER_URL = "redis://localhost:6379/0"
 CELERY_RESULT_BACKEND = "redis://localhost:6379/0"
 CELERY_ACCEPT_CONTENT = ["json"]
 CELERY_TASK_SERIALIZER = "json"
 
+# Number of course trees written per bulk_create batch by the course importer.
+COURSE_IMPORT_BATCH_SIZE = 100
+
+# Number of courses read per server-side cursor fetch by the course exporter.
+COURSE_EXPORT_CHUNK_SIZE = 100
+
+# Number of enrollments inserted per bulk_create batch by a bulk enrollment.
+COURSE_ENROLL_BATCH_SIZE = 1000
+
+# Lifetime in seconds of a cached quiz answer key (replaced on every change).
+QUIZ_ANSWER_KEY_TIMEOUT = 60 * 10
+
+# Lifetime in seconds of a cached GET /profile/ response.
+PROFILE_CACHE_TIMEOUT = 300
+
+# Share of the requests measured by `core.metrics.MetricsMiddleware` (0 to 1).
+REQUEST_METRICS_SAMPLE_RATE = config(
+    "REQUEST_METRICS_SAMPLE_RATE", default=0.0, cast=float
+)
+# Seconds between two flushes of a process's request metrics to the cache.
+REQUEST_METRICS_FLUSH_INTERVAL = 10
+
+# Number of students loaded and notified per step of a fan-out job.
+NOTIFICATION_FAN_OUT_CHUNK_SIZE = 1000
+# Number of notification emails sent per Celery task.
+NOTIFICATION_EMAIL_BATCH_SIZE = 100
+
 
 EMAIL_HOST = config("EMAIL_HOST")
 EMAIL_PORT = config("EMAIL_PORT", cast=int)
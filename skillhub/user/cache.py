@@ -0,0 +1,82 @@
+from core.cache import (
+    get_invalidations,
+    get_tag_versions,
+    invalidate_tags,
+    tags_are_current,
+)
+from core.db_router import use_primary
+from course.cache import course_tag
+from django.conf import settings
+from django.core.cache import cache
+
+PROFILE_MODES = ("full", "compact")
+
+
+def profile_cache_key(user_id, mode):
+    """
+    Return the cache key of the profile response of a user in a mode.
+    """
+
+    return f"profile:{user_id}:{mode}"
+
+
+def user_tag(user_id):
+    """
+    Return the cache tag of the profile of a user.
+    """
+
+    return f"user:{user_id}"
+
+
+def get_cached_profile(user_id, mode, build):
+    """
+    Return the cached profile data of a user, building and caching it on a miss.
+
+    The profile renders the user, their enrolled courses (and, in full mode,
+    their modules, lessons and the progress over them), so it is cached
+    under the `user:<id>` tag and the `course:<id>` tags of those courses and
+    rebuilt once any of them is invalidated, like the catalogue responses.
+    The user's tag version is read before building, and the profile is not
+    cached if any tag was bumped while it was built (see
+    `core.cache.get_invalidations`).
+
+    Args:
+        user_id (int): The ID of the user.
+        mode (str): One of `PROFILE_MODES`.
+        build (callable): Returns the profile data when it is not cached.
+
+    Returns:
+        dict: The profile data.
+    """
+
+    key = profile_cache_key(user_id, mode)
+    entry = cache.get(key)
+    if entry is not None and tags_are_current(entry["tags"]):
+        return entry["data"]
+
+    invalidations = get_invalidations()
+    versions = get_tag_versions([user_tag(user_id)])
+    # Read from the primary: a lagging replica would cache a stale profile.
+    with use_primary():
+        data = build()
+    versions.update(
+        get_tag_versions(
+            course_tag(course["id"]) for course in data["enrolled_courses"]
+        )
+    )
+    if get_invalidations() == invalidations:
+        cache.set(
+            key,
+            {"tags": versions, "data": data},
+            settings.PROFILE_CACHE_TIMEOUT,
+        )
+    return data
+
+
+def invalidate_profiles(user_ids):
+    """
+    Invalidate the cached profiles of the given users in every mode, once the
+    transaction commits.
+    """
+
+    invalidate_tags(user_tag(user_id) for user_id in user_ids)
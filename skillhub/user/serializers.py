@@ -1,5 +1,11 @@
-from course.serializers import CourseSerializer
+from course.progress import get_progress
+from course.serializers import (
+    CourseProgressSerializer,
+    CourseSerializer,
+    CourseSummarySerializer,
+)
 from django.contrib.auth.password_validation import validate_password
+from drf_spectacular.utils import extend_schema_field
 from rest_framework import serializers
 
 from .models import User
@@ -47,13 +53,39 @@ class UserSerializer(serializers.ModelSerializer):
     - `full_name`: The full name of the user.
     - `role`: The role of the user (e.g., "STUDENT", "INSTRUCTOR", "ADMIN").
     - `enrolled_courses`: The courses enrolled by the user.
+    - `progress`: The user's progress in each enrolled course.
     """
 
     enrolled_courses = CourseSerializer(many=True, read_only=True)
+    progress = serializers.SerializerMethodField()
 
     class Meta:
         model = User
-        fields = ("id", "email", "full_name", "role", "enrolled_courses")
+        fields = ("id", "email", "full_name", "role", "enrolled_courses", "progress")
+
+    @extend_schema_field(CourseProgressSerializer(many=True))
+    def get_progress(self, obj):
+        """
+        Return the progress in the enrolled courses with two queries.
+        """
+
+        course_ids = [course.id for course in obj.enrolled_courses.all()]
+        progress = get_progress(obj, course_ids)
+        return CourseProgressSerializer(
+            [{"course": course_id, **progress[course_id]} for course_id in course_ids],
+            many=True,
+        ).data
+
+
+class CompactUserSerializer(UserSerializer):
+    """
+    Serializer for get user details with a summary of the enrolled courses.
+
+    Same fields as `UserSerializer`, but `enrolled_courses` leaves out the
+    modules and lessons of each course.
+    """
+
+    enrolled_courses = CourseSummarySerializer(many=True, read_only=True)
 
 
 class ChangePasswordSerializer(serializers.Serializer):
@@ -0,0 +1,36 @@
+from course.models import Course
+from django.contrib.auth import get_user_model
+from django.db.models.signals import m2m_changed, post_save, pre_delete
+from django.dispatch import receiver
+from user.cache import invalidate_profiles
+
+
+@receiver(post_save, sender=get_user_model())
+def invalidate_profile_on_user_save(sender, instance, **kwargs):
+    invalidate_profiles([instance.pk])
+
+
+@receiver(m2m_changed, sender=Course.students.through)
+def invalidate_profiles_on_enrollment(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    """
+    Drop the cached profiles of the students whose enrollments changed.
+
+    `instance` is the user when the relation is changed from
+    `user.enrolled_courses`, and the course when it is changed from
+    `course.students`.
+    """
+
+    if reverse:
+        if action in ("post_add", "post_remove", "post_clear"):
+            invalidate_profiles([instance.pk])
+    elif action in ("post_add", "post_remove"):
+        invalidate_profiles(pk_set)
+    elif action == "pre_clear":
+        invalidate_profiles(instance.students.values_list("pk", flat=True))
+
+
+@receiver(pre_delete, sender=Course)
+def invalidate_profiles_on_course_delete(sender, instance, **kwargs):
+    invalidate_profiles(instance.students.values_list("pk", flat=True))
@@ -42,5 +42,6 @@ class UserSerializerTest(TestCase):
             "full_name": "Test User",
             "role": "student",
             "enrolled_courses": [],
+            "progress": [],
         }
         self.assertEqual(serializer.data, expected_data)
@@ -1,7 +1,10 @@
+from course.models import Category, Course, Lesson, Module
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase
+from user.cache import get_cached_profile
 
 User = get_user_model()
 
@@ -89,6 +92,113 @@ class UserGetProfileTest(APITestCase):
         self.assertEqual(response.data["role"], "student")
 
 
+class UserProfileCoursesTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            email="test@example.com",
+            password="strong_password_12",
+            full_name="TestUser",
+        )
+        self.author = User.objects.create_user(
+            email="author@example.com",
+            password="strong_password_12",
+            full_name="Author",
+            role="instructor",
+        )
+        self.category = Category.objects.create(name="Test Category")
+        for i in range(3):
+            course = Course.objects.create(
+                author=self.author,
+                title=f"Course {i}",
+                category=self.category,
+                level="beginner",
+            )
+            module = Module.objects.create(course=course, title="Module")
+            Lesson.objects.create(module=module, title="Lesson")
+            course.students.add(self.user)
+        self.url = reverse("profile")
+        self.client.force_authenticate(user=self.user)
+
+    def test_compact_profile(self):
+        # The user, the enrolled courses joined with their authors, and the
+        # lesson counts and progress bitmaps of the courses.
+        with self.assertNumQueries(4):
+            response = self.client.get(self.url, {"compact": "true"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["enrolled_courses"]), 3)
+        self.assertEqual(
+            set(response.data["enrolled_courses"][0]),
+            {"id", "title", "author", "category", "level", "avg_rate", "student_count"},
+        )
+
+    def test_full_profile_is_prefetched(self):
+        with self.assertNumQueries(6):
+            response = self.client.get(self.url)
+        self.assertEqual(len(response.data["enrolled_courses"][0]["modules"]), 1)
+
+    def test_profile_is_cached_until_enrollment_changes(self):
+        self.client.get(self.url, {"compact": "true"})
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, {"compact": "true"})
+        self.assertEqual(len(response.data["enrolled_courses"]), 3)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Course.objects.first().students.remove(self.user)
+        response = self.client.get(self.url, {"compact": "true"})
+        self.assertEqual(len(response.data["enrolled_courses"]), 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.enrolled_courses.clear()
+        response = self.client.get(self.url, {"compact": "true"})
+        self.assertEqual(response.data["enrolled_courses"], [])
+
+    def test_profile_is_cached_until_a_course_changes(self):
+        self.client.get(self.url)
+        with self.assertNumQueries(0):
+            self.client.get(self.url)
+
+        module = Module.objects.first()
+        with self.captureOnCommitCallbacks(execute=True):
+            Lesson.objects.create(module=module, title="New Lesson")
+        response = self.client.get(self.url)
+        [course] = [
+            course
+            for course in response.data["enrolled_courses"]
+            if course["id"] == module.course_id
+        ]
+        self.assertEqual(len(course["modules"][0]["lessons"]), 2)
+        [progress] = [
+            progress
+            for progress in response.data["progress"]
+            if progress["course"] == module.course_id
+        ]
+        self.assertEqual(progress["total_lessons"], 2)
+
+    def test_change_during_a_build_is_not_cached_stale(self):
+        def build():
+            data = {"full_name": self.user.full_name, "enrolled_courses": []}
+            with self.captureOnCommitCallbacks(execute=True):
+                self.user.full_name = "Renamed"
+                self.user.save()
+            return data
+
+        get_cached_profile(self.user.id, "compact", build)
+
+        response = self.client.get(self.url, {"compact": "true"})
+        self.assertEqual(response.data["full_name"], "Renamed")
+
+    def test_profile_courses_is_paginated(self):
+        response = self.client.get(reverse("profile_courses"), {"page_size": 2})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [course["title"] for course in response.data["results"]],
+            ["Course 2", "Course 1"],
+        )
+        self.assertIsNotNone(response.data["next"])
+        self.assertIn("modules", response.data["results"][0])
+
+
 class UserUpdateTest(APITestCase):
     def setUp(self):
         self.user = User.objects.create_user(
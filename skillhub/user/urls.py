@@ -1,6 +1,6 @@
 from django.urls import path
 from user.views.auth import CookieTokenRefreshView, LoginView, LogoutView, RegisterView
-from user.views.profile import ChangePasswordView, ProfileView
+from user.views.profile import ChangePasswordView, ProfileCoursesView, ProfileView
 
 urlpatterns = [
     path("register/", RegisterView.as_view(), name="register"),
@@ -8,5 +8,6 @@ urlpatterns = [
     path("logout/", LogoutView.as_view(), name="logout"),
     path("token/refresh/", CookieTokenRefreshView.as_view(), name="token_refresh"),
     path("profile/", ProfileView.as_view(), name="profile"),
+    path("profile/courses/", ProfileCoursesView.as_view(), name="profile_courses"),
     path("change-password/", ChangePasswordView.as_view(), name="change_password"),
 ]
@@ -61,7 +61,7 @@ class RegisterView(APIView):
             logger.info(f"User {user.email} registered successfully")
             return response
 
-        logger.warning(f"Login failed for email: {request.data.email}")
+        logger.warning(f"Login failed for email: {request.data.get('email')}")
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
@@ -98,7 +98,7 @@ class LoginView(TokenObtainPairView):
                 max_age=int(api_settings.REFRESH_TOKEN_LIFETIME.total_seconds()),
                 samesite="Lax",
             )
-        logger.info(f"User {request.data.email} logged in successfully")
+        logger.info(f"User {request.data.get('email')} logged in successfully")
         return response
 
 
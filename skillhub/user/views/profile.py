@@ -1,11 +1,18 @@
 import logging
 
+from core.query_plans import plan_queryset
+from course.serializers import CourseSerializer
 from django.contrib.auth import get_user_model
-from drf_spectacular.utils import extend_schema
+from drf_spectacular.utils import OpenApiParameter, extend_schema
 from rest_framework import generics, status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
-from user.serializers import ChangePasswordSerializer, UserSerializer
+from user.cache import get_cached_profile
+from user.serializers import (
+    ChangePasswordSerializer,
+    CompactUserSerializer,
+    UserSerializer,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -16,20 +23,65 @@ class ProfileView(generics.RetrieveUpdateAPIView):
     Endpoint for retrieve and update users.
 
     - GET /profile/: Retrieve the authenticated user's profile.
+      Use `?compact=true` to get only a summary of each enrolled course.
     - PUT/PATCH /profile/: Update the authenticated user's profile.
+
+    The GET response is cached per user and mode; the cache is dropped when
+    the user or their enrollments change (see `user.signals`) or when one of
+    their courses is invalidated, and otherwise expires after
+    `PROFILE_CACHE_TIMEOUT` seconds.
     """
 
     serializer_class = UserSerializer
     permission_classes = [IsAuthenticated]
 
+    def is_compact(self):
+        value = self.request.query_params.get("compact", "")
+        return value.lower() in ("1", "true", "yes")
+
+    def get_serializer_class(self):
+        if self.request.method == "GET" and self.is_compact():
+            return CompactUserSerializer
+        return UserSerializer
+
     def get_object(self):
         """
         Get the object to be updated.
 
         Returns:
-            User: The authenticated user.
+            User: The authenticated user, with the enrolled courses prefetched.
         """
-        return self.request.user
+        queryset = get_user_model().objects.filter(pk=self.request.user.pk)
+        return plan_queryset(queryset, self.get_serializer()).get()
+
+    @extend_schema(
+        parameters=[OpenApiParameter("compact", bool, description="Summaries only.")]
+    )
+    def get(self, request, *args, **kwargs):
+        mode = "compact" if self.is_compact() else "full"
+        data = get_cached_profile(
+            request.user.pk,
+            mode,
+            lambda: self.get_serializer(self.get_object()).data,
+        )
+        return Response(data)
+
+
+@extend_schema(tags=["Profile"])
+class ProfileCoursesView(generics.ListAPIView):
+    """
+    Endpoint for the courses the authenticated user is enrolled in.
+
+    - GET /profile/courses/: Retrieve a page of enrolled courses with modules.
+    """
+
+    serializer_class = CourseSerializer
+    permission_classes = [IsAuthenticated]
+    ordering = ("-created_at", "-id")
+
+    def get_queryset(self):
+        queryset = self.request.user.enrolled_courses.all()
+        return plan_queryset(queryset, self.get_serializer())
 
 
 @extend_schema(tags=["Profile"])